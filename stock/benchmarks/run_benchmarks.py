@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ VStock 벤치마크
+합성 데이터(create_sample_data.generate_sample_stock_data)로 주요 계산 경로 시간 측정
+결과는 history.jsonl에 누적하고 thresholds.json 기준으로 성능 저하 판정
+
+사용법:
+    python stock/benchmarks/run_benchmarks.py                  # quick 프로필
+    python stock/benchmarks/run_benchmarks.py --profile nightly
+    python stock/benchmarks/run_benchmarks.py --cases indicators crash_score --no-save
+
+종료 코드: 0 정상, 1 성능 저하 감지 (--no-fail이면 항상 0)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent.parent
+
+for path in [REPO_ROOT / "stock" / "src", REPO_ROOT / "stock_analyzer", REPO_ROOT / "stocks" / "anayzer_us"]:
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from create_sample_data import generate_sample_stock_data
+
+RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_HISTORY = RESULTS_DIR / "history.jsonl"
+DEFAULT_THRESHOLDS = BENCH_DIR / "thresholds.json"
+
+# 봉 수 × 종목 수 격자 (max_rows를 넘는 조합은 건너뜀)
+PROFILES = {
+    'quick': {'bars': [1000, 10000], 'symbols': [1, 10], 'max_rows': 100_000,
+              'repeats': 3, 'time_budget': 5.0},
+    'nightly': {'bars': [1000, 10000, 100000], 'symbols': [1, 10, 100, 1000], 'max_rows': 1_000_000,
+                'repeats': 5, 'time_budget': 30.0}
+}
+
+# 일봉 인덱스가 datetime64[ns] 범위(1677~2262년)를 넘는 크기는 시간봉 인덱스 사용
+MAX_DAILY_BARS = 50_000
+
+
+@contextlib.contextmanager
+def quiet():
+    """측정 대상의 print 출력 숨기기"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class SyntheticData:
+    def __init__(self, cache_dir=None):
+        """종목별 합성 OHLCV (고정 시드, 디스크 캐시)"""
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.frames = {}
+
+    @staticmethod
+    def symbols(count):
+        return [f"SYN{i:04d}" for i in range(count)]
+
+    def bars(self, symbol, bars):
+        key = (symbol, bars)
+        if key in self.frames:
+            return self.frames[key]
+
+        path = self.cache_dir / f"{symbol}_{bars}.pkl" if self.cache_dir else None
+        if path is not None and path.exists():
+            data = pd.read_pickle(path)
+        else:
+            days = bars * 7 // 5 + 10  # 주말 제거분
+            seed = zlib.crc32(symbol.encode('utf-8'))
+            data = generate_sample_stock_data(symbol, days=days, seed=seed).tail(bars).copy()
+            freq = 'B' if bars <= MAX_DAILY_BARS else 'h'
+            data.index = pd.date_range(end=pd.Timestamp('2025-01-03'), periods=len(data), freq=freq, name='Date')
+            if path is not None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                data.to_pickle(path)
+
+        self.frames[key] = data
+        return data
+
+    def universe(self, bars, count):
+        return {symbol: self.bars(symbol, bars) for symbol in self.symbols(count)}
+
+
+# ---------- 측정 대상 ----------
+# setup(data, bars, count, workdir) → (run, reset) : reset은 매 측정 전에 호출 (시간 제외)
+
+def setup_indicators(data, bars, count, workdir):
+    from technical_analysis import TechnicalAnalysis
+    from indicator_cache import IndicatorCache
+
+    frames = data.universe(bars, count)
+    analysis = TechnicalAnalysis(cache=IndicatorCache())
+
+    def run():
+        for symbol, frame in frames.items():
+            analysis.calculate_all_indicators(frame, symbol)
+
+    return run, analysis.cache.invalidate  # 캐시 적중이 아닌 계산 시간 측정
+
+
+def _write_csv_universe(data, bars, count, folder):
+    folder.mkdir(parents=True, exist_ok=True)
+    for symbol, frame in data.universe(bars, count).items():
+        path = folder / f"{symbol}.csv"
+        if not path.exists():
+            frame.to_csv(path)
+    return folder
+
+
+def setup_load_csv(data, bars, count, workdir):
+    from data_loader import DataLoader
+
+    folder = _write_csv_universe(data, bars, count, workdir / f"csv_{bars}x{count}")
+    symbols = data.symbols(count)
+
+    def run():
+        with quiet():
+            loader = DataLoader(folder, use_price_store=False, use_disk_cache=False)
+            for symbol in symbols:
+                loader.load_stock_data(symbol)
+
+    return run, None
+
+
+def setup_load_store(data, bars, count, workdir):
+    from data_loader import DataLoader
+
+    folder = _write_csv_universe(data, bars, count, workdir / f"csv_{bars}x{count}")
+    symbols = data.symbols(count)
+    with quiet():
+        loader = DataLoader(folder, use_price_store=True, use_disk_cache=False)
+        for symbol in symbols:
+            loader.load_stock_data(symbol)  # 첫 로드에서 저장소로 가져오기
+
+    def run():
+        with quiet():
+            loader = DataLoader(folder, use_price_store=True, use_disk_cache=False)
+            for symbol in symbols:
+                loader.load_stock_data(symbol)
+
+    return run, None
+
+
+def setup_normalize(data, bars, count, workdir):
+    from data_loader import DataLoader
+
+    with quiet():
+        loader = DataLoader(workdir, use_price_store=False, use_disk_cache=False)
+
+    # CSV를 날짜 파싱 없이 읽은 것과 같은 형태 (소문자 컬럼, 문자열 날짜)
+    raw_frames = []
+    for frame in data.universe(bars, count).values():
+        raw = frame.reset_index()
+        raw['Date'] = raw['Date'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        raw.columns = [col.lower() for col in raw.columns]
+        raw_frames.append(raw)
+
+    copies = []
+
+    def reset():
+        copies[:] = [raw.copy() for raw in raw_frames]
+
+    def run():
+        with quiet():
+            for raw in copies:
+                loader.normalize_dataframe(raw)
+
+    return run, reset
+
+
+def setup_portfolio_metrics(data, bars, count, workdir):
+    from portfolio_manager import PortfolioManager
+
+    with working_directory(workdir), quiet():
+        manager = PortfolioManager()
+
+    frames = data.universe(bars, count)
+    price_data = pd.DataFrame({symbol: frame['Close'] for symbol, frame in frames.items()})
+    manager.holdings = {
+        symbol: {'quantity': 10.0, 'avg_price': float(frame['Close'].iloc[0]),
+                 'total_cost': 10.0 * float(frame['Close'].iloc[0])}
+        for symbol, frame in frames.items()
+    }
+
+    def run():
+        if manager.calculate_portfolio_metrics(price_data) is None:
+            raise RuntimeError("calculate_portfolio_metrics 결과 없음")
+
+    return run, None
+
+
+def setup_portfolio_rolling(data, bars, count, workdir):
+    from portfolio_manager import PortfolioManager
+
+    with working_directory(workdir), quiet():
+        manager = PortfolioManager()
+
+    # 회귀 확인: 창 안에 50만 있으면 창 밖 고점(100) 기준 낙폭이 잡히면 안 됨
+    check = pd.Series([100, 100, 100, 50, 50, 50, 50, 50.0], index=pd.date_range('2024-01-02', periods=8))
+    expected = [0.0, 0.0, 0.0, 50.0, 50.0, 0.0, 0.0, 0.0]
+    got = manager.calculate_rolling_metrics(check, window=3)['max_drawdown'].tolist()
+    if not np.allclose(got, expected):
+        raise RuntimeError(f"이동 최대 낙폭 오류: {got} (기대값 {expected})")
+
+    frames = data.universe(bars, count)
+    series = [frame['Close'] for frame in frames.values()]
+
+    def run():
+        for close in series:
+            manager.calculate_rolling_metrics(close, window=63)
+
+    return run, None
+
+
+def setup_analyze_stocks(data, bars, count, workdir):
+    with quiet():
+        from us_stock_downloader import USStockDownloader
+        downloader = USStockDownloader(str(workdir / "us_data"))
+        combined = pd.concat([
+            downloader.process_stock_data(symbol, frame, save_file=False)
+            for symbol, frame in data.universe(bars, count).items()
+        ], ignore_index=True)
+
+    def run():
+        with quiet():
+            downloader.analyze_stocks(combined)
+
+    return run, None
+
+
+def setup_crash_score(data, bars, count, workdir):
+    from vstock_crash_score import calculate_crash_score
+
+    frames = data.universe(bars, count)
+
+    def run():
+        for symbol, frame in frames.items():
+            calculate_crash_score(frame, symbol)
+
+    return run, None
+
+
+def setup_crash_radar(data, bars, count, workdir):
+    from vstock_crash_score import crash_radar
+
+    frames = data.universe(bars, count)
+
+    def run():
+        crash_radar(frames)
+
+    return run, None
+
+
+def setup_crash_backtest(data, bars, count, workdir):
+    from vstock_crash_score import crash_level_backtest
+
+    frames = data.universe(bars, count)
+
+    def run():
+        crash_level_backtest(frames)
+
+    return run, None
+
+
+def setup_monte_carlo(data, bars, count, workdir):
+    from vstock_monte_carlo import monte_carlo_analysis
+
+    frames = data.universe(bars, count)
+
+    def run():
+        for frame in frames.values():
+            monte_carlo_analysis(frame['Close'].to_numpy(), 10000, [('표준', 0.85)], seed=0)
+
+    return run, None
+
+
+def setup_strategy_sim(data, bars, count, workdir):
+    from vstock_strategy_sim import compare_strategies
+
+    frames = data.universe(bars, count)
+
+    def run():
+        for frame in frames.values():
+            compare_strategies(frame['Close'], horizon=min(252, len(frame) // 2))
+
+    return run, None
+
+
+def setup_candlestick_chart(data, bars, count, workdir):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from candlestick_chart import CandlestickChart
+
+    style = {
+        'background_color': '#f8fafc', 'grid_color': '#e2e8f0', 'text_color': '#2d3748',
+        'positive_color': '#16a34a', 'negative_color': '#dc2626', 'volume_color': '#64748b',
+        'ma_colors': ['#3b82f6', '#f59e0b', '#8b5cf6', '#ef4444']
+    }
+    chart = CandlestickChart(style)
+    canvas = FigureCanvasAgg(chart.fig)
+    chart.connect(canvas)
+    frames = data.universe(bars, count)
+
+    def run():
+        # 종목 전환마다 데이터 교체 + 전체 다시 그리기
+        for symbol, frame in frames.items():
+            chart.set_data(symbol, frame)
+            canvas.draw()
+
+    return run, None
+
+
+CASES = {
+    'indicators': setup_indicators,
+    'load_stock_data/csv': setup_load_csv,
+    'load_stock_data/store': setup_load_store,
+    'normalize_dataframe': setup_normalize,
+    'portfolio_metrics': setup_portfolio_metrics,
+    'portfolio_rolling': setup_portfolio_rolling,
+    'analyze_stocks': setup_analyze_stocks,
+    'crash_score': setup_crash_score,
+    'crash_radar': setup_crash_radar,
+    'crash_backtest': setup_crash_backtest,
+    'monte_carlo': setup_monte_carlo,
+    'strategy_sim': setup_strategy_sim,
+    'candlestick_chart': setup_candlestick_chart
+}
+
+
+# ---------- 측정 / 기록 ----------
+
+def measure(run, reset=None, repeats=5, time_budget=30.0):
+    """반복 측정 (최소 1회, 누적 시간이 예산을 넘으면 중단)"""
+    timings = []
+    started = time.perf_counter()
+    for _ in range(repeats):
+        if reset is not None:
+            reset()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() - started > time_budget:
+            break
+
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'runs': len(timings)
+    }
+
+
+def case_key(name, bars, count):
+    return f"{name}[{bars}x{count}]"
+
+
+def grid(profile):
+    """(봉 수, 종목 수) 조합 - 총 행 수가 max_rows 이하인 것만"""
+    for bars in profile['bars']:
+        for count in profile['symbols']:
+            if bars * count <= profile['max_rows']:
+                yield bars, count
+
+
+def run_suite(profile, case_names, workdir, data):
+    """선택한 측정 대상을 격자 전체에 대해 실행"""
+    results, skipped = {}, {}
+
+    for name in case_names:
+        setup = CASES[name]
+        for bars, count in grid(profile):
+            key = case_key(name, bars, count)
+            try:
+                run, reset = setup(data, bars, count, workdir)
+                results[key] = measure(run, reset, profile['repeats'], profile['time_budget'])
+                print(f"  {key:<45} {results[key]['median'] * 1000:>10.1f} ms  (n={results[key]['runs']})")
+            except ImportError as e:
+                skipped[name] = f"의존성 없음: {e}"
+                print(f"  ⚠️ {name} 건너뜀 - {skipped[name]}")
+                break
+            except Exception as e:
+                skipped[key] = f"{type(e).__name__}: {e}"
+                print(f"  ❌ {key} 실패 - {skipped[key]}")
+                traceback.print_exc(limit=3)
+
+    return results, skipped
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def load_history(path):
+    history = []
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        history.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+    return history
+
+
+def load_thresholds(path):
+    thresholds = {'default_max_ratio': 1.3, 'min_seconds': 0.005, 'baseline_runs': 5, 'cases': {}}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            thresholds.update(json.load(f))
+    return thresholds
+
+
+def find_regressions(results, history, thresholds, host, profile_name):
+    """
+    같은 호스트/프로필의 최근 기록 중앙값과 비교
+
+    Returns:
+        list: [(키, 현재 초, 기준 초, 비율, 허용 비율)]
+    """
+    previous = [entry for entry in history
+                if entry.get('host') == host and entry.get('profile') == profile_name]
+    previous = previous[-thresholds['baseline_runs']:]
+
+    regressions = []
+    for key, result in results.items():
+        baseline_values = [entry['results'][key]['median'] for entry in previous if key in entry.get('results', {})]
+        if not baseline_values:
+            continue
+
+        baseline = statistics.median(baseline_values)
+        name = key.split('[')[0]
+        allowed = thresholds['cases'].get(name, thresholds['default_max_ratio'])
+        ratio = result['median'] / baseline if baseline > 0 else 1.0
+
+        if ratio > allowed and result['median'] >= thresholds['min_seconds']:
+            regressions.append((key, result['median'], baseline, ratio, allowed))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VStock 벤치마크")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--cases', nargs='*', choices=sorted(CASES), help='측정 대상 (기본: 전체)')
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument('--thresholds', type=Path, default=DEFAULT_THRESHOLDS)
+    parser.add_argument('--no-save', action='store_true', help='기록 파일에 추가하지 않음')
+    parser.add_argument('--no-fail', action='store_true', help='성능 저하가 있어도 종료 코드 0')
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    case_names = args.cases or list(CASES)
+    host = platform.node()
+
+    print(f"⏱️ VStock 벤치마크 ({args.profile}) - {len(case_names)}개 대상")
+    data = SyntheticData(RESULTS_DIR / "data_cache")
+
+    with tempfile.TemporaryDirectory(prefix="vstock_bench_") as tmp:
+        results, skipped = run_suite(profile, case_names, Path(tmp), data)
+
+    history = load_history(args.history)
+    thresholds = load_thresholds(args.thresholds)
+    regressions = find_regressions(results, history, thresholds, host, args.profile)
+
+    entry = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'host': host,
+        'profile': args.profile,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'results': results,
+        'skipped': skipped,
+        'regressions': [key for key, *_ in regressions]
+    }
+
+    if not args.no_save:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"💾 기록 저장: {args.history}")
+
+    if regressions:
+        print(f"\n🚨 성능 저하 {len(regressions)}건:")
+        for key, current, baseline, ratio, allowed in regressions:
+            print(f"  {key}: {baseline * 1000:.1f} → {current * 1000:.1f} ms (x{ratio:.2f}, 허용 x{allowed:.2f})")
+        return 0 if args.no_fail else 1
+
+    print("\n✅ 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
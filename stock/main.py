@@ -30,6 +30,7 @@ try:
     from src.portfolio_manager import PortfolioManager
     from src.chart_widget import ChartWidget
     from src.gui_components import ModernComponents
+    from src.tk_jobs import TkJobExecutor
 except ImportError:
     print("⚠️ 필요한 모듈을 찾을 수 없습니다. 모든 파일이 있는지 확인해주세요.")
 
@@ -440,6 +441,7 @@ class VStockAdvanced:
             self.technical_analysis = TechnicalAnalysis()
             self.portfolio_manager = PortfolioManager()
             self.chart_widget = ChartWidget()
+            self.jobs = TkJobExecutor(self.root)
             self.status_label.config(text="모든 컴포넌트 로드 완료")
         except Exception as e:
             self.status_label.config(text=f"컴포넌트 로드 실패: {e}")
@@ -451,23 +453,43 @@ class VStockAdvanced:
         self.on_analyze_symbol()
         
     def on_analyze_symbol(self, event=None):
-        """종목 분석 실행"""
+        """종목 분석 실행 (로드/지표 계산은 작업 스레드, 화면 갱신은 Tk 스레드)"""
         symbol = self.current_symbol.get().strip().upper()
         if not symbol:
             messagebox.showwarning("경고", "종목 코드를 입력해주세요.")
             return
             
         self.status_label.config(text=f"{symbol} 분석 중...")
-        self.root.update()
         
+        # 이전 분석이 진행 중이면 취소 - 마지막으로 요청한 종목만 화면에 반영
+        self.jobs.submit(
+            'analyze', self.prepare_analysis, symbol,
+            on_success=self.show_analysis,
+            on_error=lambda e: self.on_analysis_failed(symbol, e),
+            with_token=True
+        )
+        
+    def prepare_analysis(self, token, symbol):
+        """작업 스레드: 데이터 로드 + 지표 계산 (Tk 위젯 접근 금지)"""
+        data = self.data_loader.load_stock_data(symbol)
+        token.check()
+        
+        if data is not None and not data.empty:
+            # 공유 지표 캐시에 미리 계산 → 화면 갱신 시 캐시 적중
+            self.technical_analysis.calculate_all_indicators(data, symbol)
+            token.check()
+            
+        return symbol, data
+        
+    def show_analysis(self, result):
+        """Tk 스레드: 분석 결과 화면 반영"""
+        symbol, data = result
+        if data is None or data.empty:
+            messagebox.showerror("오류", f"{symbol} 데이터를 찾을 수 없습니다.")
+            self.status_label.config(text="분석 실패")
+            return
+            
         try:
-            # 데이터 로드
-            data = self.data_loader.load_stock_data(symbol)
-            if data is None or data.empty:
-                messagebox.showerror("오류", f"{symbol} 데이터를 찾을 수 없습니다.")
-                self.status_label.config(text="분석 실패")
-                return
-                
             self.current_data = data
             
             # 차트 업데이트
@@ -475,14 +497,19 @@ class VStockAdvanced:
             
             # 정보 업데이트
             self.update_stock_info(symbol, data)
-            self.update_technical_indicators(data)
+            self.update_technical_indicators(data, symbol)
             
-            self.status_label.config(text=f"{symbol} 분석 완료")
+            stats = self.technical_analysis.cache.get_stats()
+            self.status_label.config(text=f"{symbol} 분석 완료 (지표 캐시 적중률 {stats['hit_rate']:.0%})")
             
         except Exception as e:
-            messagebox.showerror("오류", f"분석 중 오류 발생: {e}")
-            self.status_label.config(text="분석 실패")
-            print(f"분석 오류: {e}")
+            self.on_analysis_failed(symbol, e)
+            
+    def on_analysis_failed(self, symbol, error):
+        """분석 실패 처리"""
+        messagebox.showerror("오류", f"{symbol} 분석 중 오류 발생: {error}")
+        self.status_label.config(text="분석 실패")
+        print(f"분석 오류: {error}")
             
     def update_charts(self, symbol, data):
         """차트 업데이트"""
@@ -493,7 +520,7 @@ class VStockAdvanced:
             )
             
             # 기술적 분석 차트 업데이트
-            indicators = self.technical_analysis.calculate_all_indicators(data)
+            indicators = self.technical_analysis.calculate_all_indicators(data, symbol)
             self.chart_widget.create_technical_chart(
                 self.technical_chart_frame, symbol, data, indicators
             )
@@ -531,10 +558,10 @@ class VStockAdvanced:
         except Exception as e:
             print(f"종목 정보 업데이트 오류: {e}")
             
-    def update_technical_indicators(self, data):
+    def update_technical_indicators(self, data, symbol=None):
         """기술적 지표 업데이트"""
         try:
-            indicators = self.technical_analysis.calculate_all_indicators(data)
+            indicators = self.technical_analysis.calculate_all_indicators(data, symbol)
             
             if indicators is None:
                 return
@@ -642,6 +669,9 @@ class VStockAdvanced:
         except Exception as e:
             print(f"애플리케이션 실행 오류: {e}")
             messagebox.showerror("오류", f"애플리케이션 오류: {e}")
+        finally:
+            if hasattr(self, 'jobs'):
+                self.jobs.shutdown()
 
 def main():
     """메인 함수"""
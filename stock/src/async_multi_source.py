@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡ 비동기 다중 소스 다운로더
+aiohttp 제공자별 연결 풀 + 제공자별 속도 제한 + 소스 경쟁(race) 모드
+"""
+
+import asyncio
+import time
+
+try:
+    from .multi_source_downloader import (
+        DEFAULT_BASE_URLS, build_alpha_vantage_request, build_polygon_request, build_iex_request,
+        parse_alpha_vantage, parse_polygon, parse_iex
+    )
+except ImportError:
+    from multi_source_downloader import (
+        DEFAULT_BASE_URLS, build_alpha_vantage_request, build_polygon_request, build_iex_request,
+        parse_alpha_vantage, parse_polygon, parse_iex
+    )
+
+# aiohttp 임포트 시도
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    print("⚠️ aiohttp 없음. 'pip install aiohttp'로 설치 권장")
+
+# 제공자별 초당 요청 수 (무료 요금제 기준)
+DEFAULT_RATE_LIMITS = {
+    'yfinance': 4.0,
+    'alpha_vantage': 5 / 60,
+    'polygon': 5 / 60,
+    'iex': 50.0
+}
+
+SOURCE_ORDER = ['yfinance', 'alpha_vantage', 'polygon', 'iex']
+
+
+class AsyncTokenBucket:
+    def __init__(self, rate, capacity=None):
+        """asyncio용 토큰 버킷"""
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, int(rate + 0.999)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """토큰이 생길 때까지 대기"""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncMultiSourceDownloader:
+    def __init__(self, api_keys=None, base_urls=None, rate_limits=None,
+                 connections_per_provider=8, timeout=30):
+        """
+        비동기 다중 소스 다운로더
+
+        Args:
+            api_keys (dict): 제공자별 API 키 (MultiSourceDownloader.api_keys와 같은 형식)
+            base_urls (dict): 제공자별 주소 (재생 서버 등으로 교체 가능)
+            rate_limits (dict): 제공자별 초당 요청 수
+            connections_per_provider (int): 제공자별 연결 풀 크기
+            timeout (float): 요청 제한 시간 (초)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp 설치 필요: pip install aiohttp")
+
+        self.api_keys = dict(api_keys or {})
+        self.base_urls = dict(DEFAULT_BASE_URLS)
+        self.base_urls.update(base_urls or {})
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS)
+        self.rate_limits.update(rate_limits or {})
+        self.connections_per_provider = connections_per_provider
+        self.timeout = timeout
+
+        self.sessions = {}
+        self.limiters = {name: AsyncTokenBucket(rate) for name, rate in self.rate_limits.items()}
+        self.stats = {name: {'requests': 0, 'success': 0, 'failed': 0, 'cancelled': 0, 'seconds': 0.0}
+                      for name in SOURCE_ORDER}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def get_session(self, provider):
+        """제공자별 공유 세션 (연결 풀 재사용)"""
+        session = self.sessions.get(provider)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connections_per_provider)
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self.sessions[provider] = session
+        return session
+
+    async def close(self):
+        """모든 세션 종료"""
+        for session in self.sessions.values():
+            if not session.closed:
+                await session.close()
+        self.sessions.clear()
+
+    def available_sources(self):
+        """사용 가능한 소스 (API 키가 있는 제공자 + yfinance)"""
+        sources = []
+        for name in SOURCE_ORDER:
+            if name == 'yfinance':
+                try:
+                    import yfinance  # noqa: F401
+                    sources.append(name)
+                except ImportError:
+                    pass
+            elif self.api_keys.get(name):
+                sources.append(name)
+        return sources
+
+    async def _get_json(self, provider, url, params):
+        await self.limiters[provider].acquire()
+        async with self.get_session(provider).get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    # ---------- 제공자별 다운로드 ----------
+
+    async def download_yfinance(self, symbol, period="3y"):
+        """yfinance (동기 라이브러리 → 스레드에서 실행)"""
+        import yfinance as yf
+
+        await self.limiters['yfinance'].acquire()
+        data = await asyncio.to_thread(lambda: yf.Ticker(symbol).history(period=period))
+        if data is None or data.empty:
+            return None
+
+        return {
+            'data': data,
+            'info': {'symbol': symbol},
+            'source': 'Yahoo Finance (yfinance)'
+        }
+
+    async def download_alpha_vantage(self, symbol, outputsize="full"):
+        url, params = build_alpha_vantage_request(
+            self.base_urls['alpha_vantage'], symbol, self.api_keys.get('alpha_vantage'), outputsize
+        )
+        return parse_alpha_vantage(await self._get_json('alpha_vantage', url, params), symbol)
+
+    async def download_polygon(self, symbol, start_date=None, end_date=None):
+        url, params = build_polygon_request(
+            self.base_urls['polygon'], symbol, self.api_keys.get('polygon'), start_date, end_date
+        )
+        return parse_polygon(await self._get_json('polygon', url, params), symbol)
+
+    async def download_iex_cloud(self, symbol, range_period="3y"):
+        url, params = build_iex_request(
+            self.base_urls['iex'], symbol, self.api_keys.get('iex'), range_period
+        )
+        return parse_iex(await self._get_json('iex', url, params), symbol)
+
+    async def fetch(self, source, symbol):
+        """소스 하나로 다운로드 (실패시 None, 취소는 그대로 전파)"""
+        downloaders = {
+            'yfinance': self.download_yfinance,
+            'alpha_vantage': self.download_alpha_vantage,
+            'polygon': self.download_polygon,
+            'iex': self.download_iex_cloud
+        }
+        stats = self.stats[source]
+        stats['requests'] += 1
+        start = time.perf_counter()
+
+        try:
+            result = await downloaders[source](symbol)
+            stats['success' if result else 'failed'] += 1
+            return result
+        except asyncio.CancelledError:
+            stats['cancelled'] += 1
+            raise
+        except Exception as e:
+            stats['failed'] += 1
+            print(f"❌ {source} 오류 ({symbol}): {e}")
+            return None
+        finally:
+            stats['seconds'] += time.perf_counter() - start
+
+    # ---------- 조합 전략 ----------
+
+    async def download_with_fallback(self, symbol, prefer_source='yfinance'):
+        """선호 소스부터 순차 시도 (연결 풀 재사용)"""
+        sources = self.available_sources()
+        if prefer_source in sources:
+            sources.remove(prefer_source)
+            sources.insert(0, prefer_source)
+
+        for source in sources:
+            result = await self.fetch(source, symbol)
+            if result:
+                return result
+
+        print(f"❌ 모든 소스에서 {symbol} 다운로드 실패")
+        return None
+
+    async def download_race(self, symbol, prefer_source='yfinance', backup_source=None):
+        """
+        선호 소스와 백업 소스를 동시에 요청하고 먼저 성공한 결과 사용 (나머지는 취소)
+
+        둘 다 실패하면 남은 소스를 순차 시도
+        (yfinance는 스레드에서 돌기 때문에 취소해도 결과만 버려짐)
+        """
+        sources = self.available_sources()
+        if prefer_source not in sources:
+            return await self.download_with_fallback(symbol, prefer_source)
+
+        if backup_source is None:
+            backup_source = next((s for s in sources if s != prefer_source), None)
+
+        racers = [prefer_source] + ([backup_source] if backup_source in sources else [])
+        pending = {asyncio.create_task(self.fetch(source, symbol)): source for source in racers}
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.pop(task)
+                    result = task.result()
+                    if result:
+                        return result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        for source in sources:
+            if source in racers:
+                continue
+            result = await self.fetch(source, symbol)
+            if result:
+                return result
+
+        print(f"❌ 모든 소스에서 {symbol} 다운로드 실패")
+        return None
+
+    async def download_many(self, symbols, mode='race', prefer_source='yfinance', concurrency=16):
+        """
+        여러 종목 동시 다운로드
+
+        Args:
+            mode (str): 'race' (소스 경쟁) 또는 'fallback' (순차 폴백)
+
+        Returns:
+            dict: {종목: 결과 또는 None}
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        strategy = self.download_race if mode == 'race' else self.download_with_fallback
+
+        async def one(symbol):
+            async with semaphore:
+                return symbol, await strategy(symbol, prefer_source)
+
+        results = await asyncio.gather(*(one(symbol) for symbol in symbols))
+        return dict(results)
+
+    def get_stats(self):
+        """소스별 요청/성공/실패/취소 통계"""
+        return {name: dict(values) for name, values in self.stats.items()}
+
+
+def download_many_sync(symbols, api_keys=None, base_urls=None, mode='race',
+                       prefer_source='yfinance', concurrency=16, **kwargs):
+    """동기 코드에서 호출하는 진입점"""
+    async def runner():
+        async with AsyncMultiSourceDownloader(api_keys, base_urls, **kwargs) as downloader:
+            return await downloader.download_many(symbols, mode, prefer_source, concurrency)
+
+    return asyncio.run(runner())
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다종목 일괄 기술적 분석 모듈
+(날짜 × 종목) 패널 전체에 대해 모든 지표를 공유 NumPy 연산으로 한 번에 계산
+"""
+
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+import warnings
+warnings.filterwarnings('ignore')
+
+# OHLCV 필드 순서 (3차원 배열의 첫 번째 축)
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _rolling_mean(values, window):
+    """누적합 기반 이동평균 (윈도우 안에 NaN이 있으면 NaN, pandas rolling과 동일)"""
+    n = values.shape[0]
+    result = np.full(values.shape, np.nan)
+    if n < window:
+        return result
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    zero = np.zeros((1,) + values.shape[1:])
+    csum = np.concatenate([zero, np.cumsum(filled, axis=0)])
+    ccount = np.concatenate([zero, np.cumsum(valid, axis=0)])
+
+    window_sum = csum[window:] - csum[:-window]
+    window_count = ccount[window:] - ccount[:-window]
+
+    result[window - 1:] = np.where(window_count == window, window_sum / window, np.nan)
+    return result
+
+
+def _rolling_reduce(values, window, func):
+    """슬라이딩 윈도우 축약 (min/max/std 등, 윈도우 안에 NaN이 있으면 NaN)"""
+    result = np.full(values.shape, np.nan)
+    if values.shape[0] < window:
+        return result
+
+    # (n - window + 1, 종목, window) 형태의 뷰 - 복사 없음
+    windows = sliding_window_view(values, window, axis=0)
+    result[window - 1:] = func(windows)
+    return result
+
+
+def _rolling_std(values, window):
+    """표본 표준편차 이동값 (ddof=1)"""
+    return _rolling_reduce(values, window, lambda w: np.std(w, axis=-1, ddof=1))
+
+
+def _rolling_min(values, window):
+    """이동 최솟값"""
+    return _rolling_reduce(values, window, lambda w: np.min(w, axis=-1))
+
+
+def _rolling_max(values, window):
+    """이동 최댓값"""
+    return _rolling_reduce(values, window, lambda w: np.max(w, axis=-1))
+
+
+def _rolling_mad(values, window):
+    """평균 절대 편차 이동값 (CCI용)"""
+    def mad(w):
+        return np.mean(np.abs(w - np.mean(w, axis=-1, keepdims=True)), axis=-1)
+    return _rolling_reduce(values, window, mad)
+
+
+def _ewm_mean(values, spans):
+    """
+    여러 span의 지수 이동평균을 한 번의 시간 루프로 계산
+    pandas ewm(span=...).mean() (adjust=True, ignore_na=False)과 같은 결과
+
+    Args:
+        values (np.ndarray): (날짜, 종목) 배열
+        spans (list): span 목록
+
+    Returns:
+        np.ndarray: (span 개수, 날짜, 종목) 배열
+    """
+    spans = np.asarray(spans, dtype=float)
+    decay = (1.0 - 2.0 / (spans + 1.0))[:, None]  # (span, 1)
+
+    n_dates, n_symbols = values.shape
+    result = np.full((len(spans), n_dates, n_symbols), np.nan)
+
+    numerator = np.zeros((len(spans), n_symbols))
+    denominator = np.zeros((len(spans), n_symbols))
+
+    for t in range(n_dates):
+        row = values[t]
+        valid = ~np.isnan(row)
+
+        # 결측값에서도 가중치는 감쇠 (ignore_na=False)
+        numerator *= decay
+        denominator *= decay
+        numerator += np.where(valid, row, 0.0)
+        denominator += valid
+
+        started = denominator > 0
+        result[:, t, :] = np.where(started, numerator / np.where(started, denominator, 1.0), np.nan)
+
+    return result
+
+
+def _nan_cumsum(values):
+    """NaN을 건너뛰는 누적합 (pandas cumsum과 동일하게 NaN 위치는 NaN 유지)"""
+    result = np.nancumsum(values, axis=0)
+    result[np.isnan(values)] = np.nan
+    return result
+
+
+class BatchTechnicalAnalysis:
+    def __init__(self, sma_windows=(5, 10, 20, 50, 200), ema_windows=(5, 10, 20, 50)):
+        """다종목 일괄 기술적 분석 클래스 초기화"""
+        self.sma_windows = tuple(sma_windows)
+        self.ema_windows = tuple(ema_windows)
+
+    def build_panel(self, data_dict, align='bars'):
+        """
+        종목별 데이터프레임을 (필드, 날짜, 종목) 3차원 배열로 정렬
+
+        Args:
+            data_dict (dict): {종목: OHLCV 데이터프레임}
+            align (str): 'bars' - 종목별 봉을 최신 봉 기준으로 오른쪽 정렬
+                         (휴장일이 달라도 종목별 단일 계산과 결과 동일)
+                         'date' - 전체 날짜 합집합으로 정렬 (빈 날짜는 NaN)
+
+        Returns:
+            dict: {'values': np.ndarray, 'index': ..., 'symbols': list, 'symbol_index': dict}
+        """
+        frames = {}
+        for symbol, df in data_dict.items():
+            if df is not None and not df.empty:
+                frames[symbol] = df[~df.index.duplicated(keep='last')].sort_index()
+        if not frames:
+            return None
+
+        symbols = list(frames.keys())
+
+        if align == 'date':
+            # 모든 종목 날짜의 합집합으로 정렬
+            index = frames[symbols[0]].index
+            for symbol in symbols[1:]:
+                index = index.union(frames[symbol].index)
+            n_rows = len(index)
+        else:
+            index = None
+            n_rows = max(len(df) for df in frames.values())
+
+        values = np.full((len(PANEL_FIELDS), n_rows, len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            if index is not None:
+                positions = index.get_indexer(df.index)
+            else:
+                positions = np.arange(n_rows - len(df), n_rows)
+            for f, field in enumerate(PANEL_FIELDS):
+                if field in df.columns:
+                    values[f, positions, j] = pd.to_numeric(df[field], errors='coerce').values
+
+        return {
+            'values': values,
+            'index': index if index is not None else pd.RangeIndex(-n_rows + 1, 1, name='bar'),
+            'symbols': symbols,
+            'symbol_index': None if index is not None else {s: frames[s].index for s in symbols}
+        }
+
+    def panel_from_wide(self, wide_frames):
+        """
+        필드별 와이드 데이터프레임 (날짜 × 종목)을 패널로 변환
+
+        Args:
+            wide_frames (dict): {'Open': df, 'High': df, ...} 각 df는 날짜 × 종목
+        """
+        close = wide_frames['Close']
+        index = close.index
+        symbols = list(close.columns)
+
+        values = np.full((len(PANEL_FIELDS), len(index), len(symbols)), np.nan)
+        for f, field in enumerate(PANEL_FIELDS):
+            frame = wide_frames.get(field)
+            if frame is None:
+                continue
+            values[f] = frame.reindex(index=index, columns=symbols).values.astype(float)
+
+        return {'values': values, 'index': index, 'symbols': symbols, 'symbol_index': None}
+
+    def calculate_all_indicators(self, panel):
+        """
+        패널 전체에 대해 모든 기술적 지표 계산
+
+        Args:
+            panel: build_panel / panel_from_wide 결과, 또는 {종목: 데이터프레임}
+
+        Returns:
+            dict: {'indicators': {지표명: (날짜, 종목) 배열}, 'index': ..., 'symbols': ...}
+        """
+        if isinstance(panel, dict) and 'values' not in panel:
+            panel = self.build_panel(panel)
+        if panel is None:
+            return None
+
+        try:
+            values = np.asarray(panel['values'], dtype=float)
+            open_, high, low, close, volume = values
+            indicators = {}
+
+            # 이동평균들
+            for window in self.sma_windows:
+                indicators[f'SMA_{window}'] = _rolling_mean(close, window)
+
+            # 지수 이동평균 - EMA와 MACD용 span을 한 번에 계산
+            spans = list(self.ema_windows) + [12, 26]
+            ema_stack = _ewm_mean(close, spans)
+            for k, window in enumerate(self.ema_windows):
+                indicators[f'EMA_{window}'] = ema_stack[k]
+
+            # RSI (TechnicalAnalysis.calculate_rsi와 같은 단순 이동평균 방식)
+            prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+            delta = close - prev_close
+            # 결측 종가 구간은 calculate_rsi처럼 상승/하락 0, 첫 종가 이전(패널 채움)만 NaN
+            leading = np.logical_and.accumulate(np.isnan(close), axis=0)
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+            gain[leading] = np.nan
+            loss[leading] = np.nan
+            avg_gain = _rolling_mean(gain, 14)
+            avg_loss = _rolling_mean(loss, 14)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = avg_gain / avg_loss
+                indicators['RSI'] = 100 - (100 / (1 + rs))
+
+            # MACD
+            macd_line = ema_stack[-2] - ema_stack[-1]
+            signal_line = _ewm_mean(macd_line, [9])[0]
+            indicators['MACD'] = macd_line
+            indicators['MACD_Signal'] = signal_line
+            indicators['MACD_Histogram'] = macd_line - signal_line
+
+            # 볼린저 밴드
+            bb_middle = indicators.get('SMA_20')
+            if bb_middle is None:
+                bb_middle = _rolling_mean(close, 20)
+            bb_std = _rolling_std(close, 20)
+            bb_upper = bb_middle + bb_std * 2
+            bb_lower = bb_middle - bb_std * 2
+            with np.errstate(divide='ignore', invalid='ignore'):
+                indicators['BB_Upper'] = bb_upper
+                indicators['BB_Middle'] = bb_middle
+                indicators['BB_Lower'] = bb_lower
+                indicators['BB_Width'] = bb_upper - bb_lower
+                indicators['BB_Position'] = (close - bb_lower) / (bb_upper - bb_lower)
+
+            # 스토캐스틱 / 윌리엄스 %R (14일 최고/최저 공유)
+            lowest_low = _rolling_min(low, 14)
+            highest_high = _rolling_max(high, 14)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+                indicators['Williams_R'] = -100 * ((highest_high - close) / (highest_high - lowest_low))
+            stoch_k = _rolling_mean(k_percent, 3)
+            indicators['Stoch_K'] = stoch_k
+            indicators['Stoch_D'] = _rolling_mean(stoch_k, 3)
+
+            # ATR (pandas max(axis=1)처럼 NaN은 건너뜀)
+            true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+            indicators['ATR'] = _rolling_mean(true_range, 14)
+
+            # CCI
+            typical_price = (high + low + close) / 3
+            sma_tp = _rolling_mean(typical_price, 20)
+            mad = _rolling_mad(typical_price, 20)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                indicators['CCI'] = (typical_price - sma_tp) / (0.015 * mad)
+
+            # 거래량 지표들
+            volume_sma = _rolling_mean(volume, 20)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                indicators['Volume_SMA'] = volume_sma
+                indicators['Relative_Volume'] = volume / volume_sma
+            indicators['OBV'] = _nan_cumsum(np.sign(delta) * volume)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                indicators['VWAP'] = _nan_cumsum(typical_price * volume) / _nan_cumsum(volume)
+
+            # 지지/저항선
+            pivot = typical_price
+            indicators['Pivot'] = pivot
+            indicators['Resistance1'] = 2 * pivot - low
+            indicators['Resistance2'] = pivot + (high - low)
+            indicators['Support1'] = 2 * pivot - high
+            indicators['Support2'] = pivot - (high - low)
+
+            return {
+                'indicators': indicators,
+                'index': panel['index'],
+                'symbols': list(panel['symbols']),
+                'symbol_index': panel.get('symbol_index')
+            }
+
+        except Exception as e:
+            print(f"일괄 기술적 지표 계산 오류: {e}")
+            return None
+
+    def to_frame(self, result):
+        """컬럼형 결과를 (지표, 종목) 멀티인덱스 컬럼의 데이터프레임으로 변환"""
+        if result is None:
+            return None
+
+        indicators = result['indicators']
+        names = list(indicators.keys())
+        symbols = result['symbols']
+
+        # (날짜, 지표 × 종목) 한 번의 결합
+        stacked = np.concatenate([indicators[name] for name in names], axis=1)
+        columns = pd.MultiIndex.from_product([names, symbols], names=['indicator', 'symbol'])
+        return pd.DataFrame(stacked, index=result['index'], columns=columns)
+
+    def extract_symbol(self, result, symbol, data=None):
+        """
+        단일 종목의 지표를 TechnicalAnalysis.calculate_all_indicators와 같은 형태로 추출
+
+        Args:
+            result (dict): calculate_all_indicators 결과
+            symbol (str): 종목 코드
+            data (pd.DataFrame): 원본 데이터 (주어지면 해당 날짜로 재정렬)
+        """
+        if result is None or symbol not in result['symbols']:
+            return None
+
+        j = result['symbols'].index(symbol)
+        symbol_index = (result.get('symbol_index') or {}).get(symbol)
+
+        if symbol_index is not None:
+            # 오른쪽 정렬된 봉에서 해당 종목 구간만 잘라냄
+            start = len(result['index']) - len(symbol_index)
+            indicators = {
+                name: pd.Series(values[start:, j], index=symbol_index)
+                for name, values in result['indicators'].items()
+            }
+        else:
+            indicators = {
+                name: pd.Series(values[:, j], index=result['index'])
+                for name, values in result['indicators'].items()
+            }
+
+        if data is not None:
+            indicators = {name: series.reindex(data.index) for name, series in indicators.items()}
+
+        return indicators
+
+    def latest_snapshot(self, result):
+        """종목별 최신 지표값 테이블 (종목 × 지표)"""
+        if result is None:
+            return None
+
+        snapshot = {}
+        for name, values in result['indicators'].items():
+            # 종목별 마지막 유효값
+            valid = ~np.isnan(values)
+            last_pos = np.where(valid.any(axis=0),
+                                values.shape[0] - 1 - np.argmax(valid[::-1], axis=0), 0)
+            latest = values[last_pos, np.arange(values.shape[1])]
+            latest[~valid.any(axis=0)] = np.nan
+            snapshot[name] = latest
+
+        return pd.DataFrame(snapshot, index=result['symbols'])
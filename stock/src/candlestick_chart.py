@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캔들스틱 차트 (재사용형)
+Figure/Canvas/툴바를 한 번만 만들고 종목·기간이 바뀌면 데이터 배열만 교체
+캔들은 PolyCollection(몸통) + LineCollection(꼬리) 하나씩으로 그리고
+십자선/호버 정보는 블리팅으로 갱신
+봉이 픽셀보다 많으면 주봉/월봉으로 집계 (확대하면 다시 일봉)
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+
+try:
+    from .chart_lod import (OHLCV_LEVELS, PriceOverlays, axis_pixel_width, choose_ohlcv_level,
+                            minmax_indices, resample_ohlcv, to_x, visible_slice)
+except ImportError:
+    from chart_lod import (OHLCV_LEVELS, PriceOverlays, axis_pixel_width, choose_ohlcv_level,
+                           minmax_indices, resample_ohlcv, to_x, visible_slice)
+
+MA_PERIODS = [5, 20, 60]
+BODY_WIDTH = 0.8  # 봉 간격 대비 몸통 폭
+LEVEL_LABELS = {'W': 'Weekly', 'M': 'Monthly'}
+
+
+def rectangle_verts(x, bottom, top, half_width):
+    """x 중심 사각형 꼭짓점 배열 (n, 4, 2)"""
+    verts = np.empty((len(x), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = x - half_width
+    verts[:, 2, 0] = verts[:, 3, 0] = x + half_width
+    verts[:, 0, 1] = verts[:, 3, 1] = bottom
+    verts[:, 1, 1] = verts[:, 2, 1] = top
+    return verts
+
+
+def wick_segments(x, lows, highs):
+    """고가-저가 선분 배열 (n, 2, 2)"""
+    segments = np.empty((len(x), 2, 2))
+    segments[:, 0, 0] = segments[:, 1, 0] = x
+    segments[:, 0, 1] = lows
+    segments[:, 1, 1] = highs
+    return segments
+
+
+class CandlestickChart:
+    def __init__(self, style_config, figsize=(12, 8)):
+        """
+        캔들스틱 + 거래량 차트
+
+        Args:
+            style_config (dict): ChartWidget.style_config 형식의 색상 설정
+        """
+        self.style = style_config
+        self.positive = to_rgba(style_config['positive_color'])
+        self.negative = to_rgba(style_config['negative_color'])
+
+        self.fig = Figure(figsize=figsize, facecolor=style_config['background_color'])
+        gs = self.fig.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.05)
+        self.ax_price = self.fig.add_subplot(gs[0])
+        self.ax_volume = self.fig.add_subplot(gs[1], sharex=self.ax_price)
+
+        # 데이터 아티스트 (한 번 만들고 배열만 교체)
+        self.wicks = LineCollection([], linewidths=1)
+        self.bodies = PolyCollection([], linewidths=0.5, alpha=0.8)
+        self.volume_bars = PolyCollection([], linewidths=0, alpha=0.6)
+        self.ax_price.add_collection(self.wicks)
+        self.ax_price.add_collection(self.bodies)
+        self.ax_volume.add_collection(self.volume_bars)
+
+        self.ma_lines = {}
+        for period, color in zip(MA_PERIODS, style_config['ma_colors']):
+            self.ma_lines[period], = self.ax_price.plot([], [], color=color, linewidth=1.5,
+                                                        alpha=0.8, label=f'MA{period}')
+
+        self._style_axes()
+
+        # 십자선/호버 (animated → 일반 draw에서 제외, 블리팅으로만 그림)
+        crosshair = dict(color=style_config['text_color'], linewidth=0.8, alpha=0.6,
+                         linestyle='--', animated=True, visible=False)
+        self.cross_v = [ax.axvline(0, **crosshair) for ax in (self.ax_price, self.ax_volume)]
+        self.cross_h = self.ax_price.axhline(0, **crosshair)
+        self.hover_text = self.ax_price.text(
+            0.99, 0.97, '', transform=self.ax_price.transAxes, ha='right', va='top',
+            fontsize=9, color=style_config['text_color'], animated=True, visible=False,
+            bbox=dict(boxstyle='round', facecolor='white', alpha=0.8, edgecolor=style_config['grid_color'])
+        )
+        self.animated_artists = self.cross_v + [self.cross_h, self.hover_text]
+
+        # 확대/이동 시 봉 단위(일/주/월) 재선택 - 공유 축은 조작된 축에서만 이벤트 발생
+        for ax in (self.ax_price, self.ax_volume):
+            ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+        self.canvas = None
+        self.toolbar = None
+        self.background = None
+
+        self.symbol = None
+        self.overlays = None
+        self.level = None
+        self.rendered_range = (np.inf, -np.inf)
+        self.daily_x = np.empty(0)
+        self.dates = pd.DatetimeIndex([])
+        self.x = np.empty(0)
+        self.ohlcv = np.empty((0, 5))
+
+    def _style_axes(self):
+        """축 스타일 (생성 시 한 번)"""
+        text_color = self.style['text_color']
+        self.title = self.ax_price.set_title('', fontsize=16, fontweight='bold', color=text_color)
+        self.ax_price.set_ylabel('Price ($)', color=text_color)
+        self.ax_volume.set_ylabel('Volume', color=text_color)
+        self.ax_volume.set_xlabel('Date', color=text_color)
+
+        for ax in (self.ax_price, self.ax_volume):
+            ax.grid(True, alpha=0.3, color=self.style['grid_color'])
+            ax.set_facecolor(self.style['background_color'])
+
+        self.ax_price.tick_params(labelbottom=False)
+        # x는 date2num 값 그대로 사용 (날짜 단위 변환기를 두면 꼭짓점마다 변환이 일어남)
+        self.ax_volume.xaxis.set_major_locator(mdates.AutoDateLocator())
+        self.ax_volume.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+        self.ax_price.legend(loc='upper left', frameon=True, fancybox=True, shadow=True)
+        self.fig.subplots_adjust(left=0.07, right=0.98, top=0.94, bottom=0.1)
+
+    # ---------- Tk 연결 ----------
+
+    def attach(self, parent_frame):
+        """Tk 프레임에 캔버스/툴바 배치 (한 번만)"""
+        self.canvas = FigureCanvasTkAgg(self.fig, parent_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        toolbar_frame = ttk.Frame(parent_frame)
+        toolbar_frame.pack(fill=tk.X)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame)
+        self.toolbar.update()
+
+        self.connect(self.canvas)
+        return self.canvas
+
+    def connect(self, canvas):
+        """블리팅/LOD용 이벤트 연결 (Tk 외 캔버스도 가능)"""
+        self.canvas = canvas
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('motion_notify_event', self._on_motion)
+        canvas.mpl_connect('axes_leave_event', self._on_leave)
+        canvas.mpl_connect('resize_event', lambda event: self._on_xlim_changed(self.ax_price))
+
+    def is_alive(self):
+        """Tk 위젯이 아직 살아 있는지"""
+        if self.canvas is None:
+            return False
+        try:
+            return bool(self.canvas.get_tk_widget().winfo_exists())
+        except (AttributeError, tk.TclError):
+            return False
+
+    # ---------- 데이터 갱신 ----------
+
+    def set_data(self, symbol, data):
+        """종목/기간 변경 - 아티스트 배열만 교체하고 다시 그림"""
+        daily = data[['Open', 'High', 'Low', 'Close', 'Volume']].astype(float)
+        if not isinstance(daily.index, pd.DatetimeIndex):
+            daily.index = pd.to_datetime(daily.index)
+
+        # 이동평균은 일봉 전체로 한 번만 계산 (같은 데이터를 다시 보여주면 재사용)
+        if self.overlays is None or not self.overlays.is_for(data):
+            self.overlays = PriceOverlays(data, MA_PERIODS)
+
+        self.symbol = symbol
+        self.daily = daily
+        self.daily_x = self.overlays.x
+        self.levels = {'D': (daily, self.daily_x)}
+        self.level = None
+        self.rendered_range = (np.inf, -np.inf)
+
+        self._hide_crosshair()
+        self._set_limits()  # set_xlim → xlim_changed → _apply_lod (level이 None이라 새로 그림)
+
+        if self.toolbar is not None:
+            self.toolbar.update()  # 확대/이동 기록 초기화 (홈 = 새 데이터 범위)
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+
+    def _level_frame(self, level):
+        """봉 단위별 (데이터, x) - 주봉/월봉은 처음 필요할 때 집계"""
+        if level not in self.levels:
+            rule = next(rule for name, rule, _ in OHLCV_LEVELS if name == level)
+            frame = resample_ohlcv(self.daily, rule)
+            self.levels[level] = (frame, to_x(frame.index))
+        return self.levels[level]
+
+    def _apply_lod(self, xlim):
+        """
+        보이는 일봉 수와 축 폭으로 봉 단위 선택 후 보이는 구간(+양쪽 한 화면)만 그림
+        이동평균선은 보이는 구간만 min-max 축약
+        """
+        if len(self.daily_x) == 0:
+            return
+        pixels = axis_pixel_width(self.ax_price)
+        window = visible_slice(self.daily_x, xlim)
+        level = choose_ohlcv_level(window.stop - window.start, pixels)
+
+        frame, level_x = self._level_frame(level)
+        visible = visible_slice(level_x, xlim)
+        visible_count = max(visible.stop - visible.start, 1)
+        low, high = min(xlim), max(xlim)
+        stale = (
+            level != self.level
+            or low < self.rendered_range[0] or high > self.rendered_range[1]
+            or len(self.x) > 4 * visible_count + 10  # 크게 확대했으면 범위를 줄여 다시 그림
+        )
+        if stale:
+            span = high - low
+            rendered = visible_slice(level_x, (low - span, high + span))
+            self.level = level
+            self.rendered_range = (
+                level_x[rendered.start] if rendered.start > 0 else -np.inf,
+                level_x[rendered.stop - 1] if rendered.stop < len(level_x) else np.inf
+            )
+            self._render(frame.iloc[rendered], level_x[rendered])
+
+        x = self.daily_x[window]
+        for period, line in self.ma_lines.items():
+            values = self.overlays.ma[period][window]  # 보이는 구간만 min-max 축약
+            idx = minmax_indices(values, pixels)
+            line.set_data(x[idx], values[idx])
+            line.set_visible(len(self.daily_x) > period)
+
+    def _render(self, frame, x):
+        """현재 봉 단위 데이터로 캔들/거래량 배열 교체"""
+        self.dates = frame.index
+        self.x = x
+        self.ohlcv = frame.to_numpy(dtype=float)
+
+        x = self.x
+        opens, highs, lows, closes, volumes = self.ohlcv.T
+        half = BODY_WIDTH / 2 * (np.median(np.diff(x)) if len(x) > 1 else 1.0)
+
+        # 캔들 (상승/하락 색상은 행 단위 RGBA 배열)
+        up = closes >= opens
+        candle_colors = np.where(up[:, None], self.positive, self.negative)
+        self.bodies.set_verts(rectangle_verts(x, np.minimum(opens, closes), np.maximum(opens, closes), half))
+        self.bodies.set_facecolor(candle_colors)
+        self.bodies.set_edgecolor(candle_colors)
+        self.wicks.set_segments(wick_segments(x, lows, highs))
+        self.wicks.set_color(candle_colors)
+
+        # 거래량 (전봉 대비 상승/하락 색상, 주봉/월봉은 합계라 y 범위도 다시 설정)
+        rising = np.diff(closes, prepend=closes[:1]) >= 0
+        self.volume_bars.set_verts(rectangle_verts(x, 0.0, volumes, half))
+        self.volume_bars.set_facecolor(np.where(rising[:, None], self.positive, self.negative))
+        max_volume = np.nanmax(volumes) if len(volumes) else 0
+        self.ax_volume.set_ylim(0, max_volume * 1.1 if max_volume > 0 else 1)
+
+        level_name = LEVEL_LABELS.get(self.level, '')
+        self.title.set_text(f'{self.symbol} - Stock Chart' + (f' ({level_name})' if level_name else ''))
+
+    def _set_limits(self):
+        if len(self.daily_x) == 0:
+            return
+        x = self.daily_x
+        pad = BODY_WIDTH * (np.median(np.diff(x)) if len(x) > 1 else 1.0)
+        self.ax_price.set_xlim(x[0] - pad, x[-1] + pad)
+
+        low, high = np.nanmin(self.daily['Low']), np.nanmax(self.daily['High'])
+        pad = (high - low) * 0.05 or abs(high) * 0.05 or 1.0
+        self.ax_price.set_ylim(low - pad, high + pad)
+
+    def _on_xlim_changed(self, ax):
+        """툴바 확대/이동 - 보이는 범위에 맞춰 봉 단위 재선택"""
+        if self.symbol is not None:
+            self._apply_lod(ax.get_xlim())
+
+    # ---------- 블리팅 ----------
+
+    def _on_draw(self, event):
+        """전체 다시 그린 뒤 배경 저장"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._blit()
+
+    def _blit(self):
+        if self.background is None:
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.animated_artists:
+            if artist.get_visible():
+                artist.axes.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    def _hide_crosshair(self):
+        for artist in self.animated_artists:
+            artist.set_visible(False)
+
+    def _on_leave(self, event):
+        self._hide_crosshair()
+        self._blit()
+
+    def _on_motion(self, event):
+        """마우스 위치의 봉에 십자선 + OHLCV 표시"""
+        if self.toolbar is not None and self.toolbar.mode:
+            return  # 확대/이동 중에는 표시하지 않음
+        if event.inaxes not in (self.ax_price, self.ax_volume) or len(self.x) == 0:
+            if self.hover_text.get_visible():
+                self._on_leave(event)
+            return
+
+        index = self.nearest_index(event.xdata)
+        x = self.x[index]
+        opens, highs, lows, closes, volumes = self.ohlcv[index]
+
+        for line in self.cross_v:
+            line.set_xdata([x, x])
+            line.set_visible(True)
+        if event.inaxes is self.ax_price:
+            self.cross_h.set_ydata([event.ydata, event.ydata])
+            self.cross_h.set_visible(True)
+        else:
+            self.cross_h.set_visible(False)
+
+        self.hover_text.set_text(
+            f"{self.dates[index]:%Y-%m-%d}  O {opens:,.2f}  H {highs:,.2f}  "
+            f"L {lows:,.2f}  C {closes:,.2f}  V {volumes:,.0f}"
+        )
+        self.hover_text.set_visible(True)
+        self._blit()
+
+    def nearest_index(self, xdata):
+        """x 좌표에서 가장 가까운 봉 위치"""
+        index = int(np.searchsorted(self.x, xdata))
+        if index >= len(self.x):
+            return len(self.x) - 1
+        if index > 0 and xdata - self.x[index - 1] < self.x[index] - xdata:
+            return index - 1
+        return index
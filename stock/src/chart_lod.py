@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+차트 LOD (Level of Detail)
+보이는 x 범위와 축 픽셀 폭에 맞춰 그릴 점 수를 줄임
+- 선: 버킷별 최소/최대값 유지 (min-max) 또는 LTTB
+- 막대: 버킷별 절대값 최대 막대
+- OHLCV: 일봉 → 주봉/월봉 집계
+- 오버레이: 이동평균/상승·하락 마스크를 전체 시계열로 한 번 계산하고 잘라서 사용
+툴바로 확대/이동하면 xlim_changed 이벤트에서 보이는 구간만 다시 계산
+"""
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+
+POINTS_PER_PIXEL = 1  # 픽셀당 버킷 수 (min-max는 버킷당 최대 2점)
+MIN_PIXELS_PER_BAR = 2  # 봉 하나에 필요한 최소 픽셀
+
+# (이름, resample 규칙, 봉 하나가 포함하는 대략적 일봉 수)
+OHLCV_LEVELS = [
+    ('D', None, 1),
+    ('W', 'W-MON', 5),
+    ('M', 'MS', 21)
+]
+
+
+def to_x(index):
+    """날짜 인덱스 → matplotlib x 좌표 (date2num 실수)"""
+    if not isinstance(index, pd.DatetimeIndex):
+        index = pd.to_datetime(index)
+    return mdates.date2num(index.values)
+
+
+def axis_pixel_width(ax):
+    """축의 화면 폭 (픽셀)"""
+    return max(int(ax.get_window_extent().width), 1)
+
+
+def visible_slice(x, xlim):
+    """정렬된 x에서 xlim 안의 구간 (선이 끊기지 않도록 양쪽 1점 포함)"""
+    lo = np.searchsorted(x, min(xlim), side='left')
+    hi = np.searchsorted(x, max(xlim), side='right')
+    return slice(max(lo - 1, 0), min(hi + 1, len(x)))
+
+
+def _buckets(values, n_buckets, fill):
+    """길이 n 배열을 (버킷 수, 버킷 크기) 행렬로 (남는 칸은 fill)"""
+    size = -(-len(values) // n_buckets)
+    padded = np.full(n_buckets * size, fill, dtype=float)
+    padded[:len(values)] = values
+    return padded.reshape(n_buckets, size), size
+
+
+def minmax_indices(y, n_buckets):
+    """
+    버킷별 최소/최대 위치 (선 모양의 극값 보존)
+
+    Returns:
+        np.ndarray: 정렬된 원본 인덱스 (첫/마지막 점 포함)
+    """
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(y)
+    lows, size = _buckets(np.where(finite, y, np.inf), n_buckets, np.inf)
+    highs, _ = _buckets(np.where(finite, y, -np.inf), n_buckets, -np.inf)
+
+    offsets = np.arange(n_buckets) * size
+    indices = np.concatenate([
+        [0, n - 1],
+        offsets + lows.argmin(axis=1),
+        offsets + highs.argmax(axis=1)
+    ])
+    return np.unique(np.clip(indices, 0, n - 1))
+
+
+def peak_indices(y, n_buckets):
+    """버킷별 절대값 최대 위치 (막대: 거래량 급증/히스토그램 극값 보존)"""
+    n = len(y)
+    if n <= n_buckets:
+        return np.arange(n)
+
+    magnitude = np.abs(np.nan_to_num(np.asarray(y, dtype=float), nan=-1.0))
+    blocks, size = _buckets(magnitude, n_buckets, -1.0)
+    indices = np.arange(n_buckets) * size + blocks.argmax(axis=1)
+    return np.unique(np.clip(indices, 0, n - 1))
+
+
+def lttb_indices(x, y, threshold):
+    """
+    LTTB (Largest-Triangle-Three-Buckets) 다운샘플링
+
+    결측 없는 선에 적합 (결측이 있으면 min-max 사용)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_start = stop if stop < next_stop else n - 1
+        avg_x = x[next_start:next_stop].mean() if next_stop > next_start else x[-1]
+        avg_y = y[next_start:next_stop].mean() if next_stop > next_start else y[-1]
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (avg_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        indices[bucket + 1] = previous
+    return indices
+
+
+def resample_ohlcv(data, rule):
+    """OHLCV 집계 (rule: 'W-MON' 주봉, 'MS' 월봉 - 구간 시작일 기준)"""
+    aggregated = data.resample(rule, closed='left', label='left').agg({
+        'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'
+    })
+    return aggregated.dropna(subset=['Close'])
+
+
+def choose_ohlcv_level(n_visible, pixels):
+    """보이는 일봉 수와 픽셀 폭으로 봉 단위 선택 ('D', 'W', 'M')"""
+    for name, _, days in OHLCV_LEVELS:
+        if n_visible / days * MIN_PIXELS_PER_BAR <= pixels:
+            return name
+    return OHLCV_LEVELS[-1][0]
+
+
+def bar_verts(x, heights, width):
+    """막대 사각형 꼭짓점 (n, 4, 2)"""
+    half = width / 2
+    verts = np.zeros((len(x), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = x - half
+    verts[:, 2, 0] = verts[:, 3, 0] = x + half
+    verts[:, 1, 1] = verts[:, 2, 1] = heights
+    return verts
+
+
+def _update_datalim(ax, x, y):
+    """빈 아티스트로 시작하므로 전체 데이터 범위를 자동 축 범위에 반영"""
+    y = np.broadcast_to(np.asarray(y, dtype=float), np.shape(x))
+    finite = np.isfinite(x) & np.isfinite(y)
+    if finite.any():
+        ax.update_datalim(np.column_stack([x[finite], y[finite]]))
+
+
+class PriceOverlays:
+    def __init__(self, data, ma_periods=(5, 20, 60, 200)):
+        """
+        전체 시계열 기준 오버레이 (한 번 계산 후 기간 변경/표시 토글은 슬라이스만)
+
+        기간을 자른 뒤 이동평균을 계산하면 앞부분이 비거나 값이 달라지므로
+        항상 전체 데이터로 계산
+
+        Args:
+            data (pd.DataFrame): OHLCV 데이터 (Close 필수)
+            ma_periods (tuple): 이동평균 기간
+        """
+        self.source = data
+        self.x = to_x(data.index)
+        close_series = data['Close'].astype(float)
+        self.close = close_series.to_numpy()
+        self.ma = {period: close_series.rolling(window=period).mean().to_numpy()
+                   for period in ma_periods}
+
+        # 색상용 불리언 마스크
+        self.up = self.close >= data['Open'].to_numpy(dtype=float) if 'Open' in data else np.ones(len(self.close), bool)
+        self.rising = np.diff(self.close, prepend=self.close[:1]) >= 0
+
+    def __len__(self):
+        return len(self.close)
+
+    def is_for(self, data):
+        """같은 데이터프레임 객체로 만든 오버레이인지"""
+        return self.source is data
+
+    def tail(self, count):
+        """마지막 count개 구간 슬라이스"""
+        return slice(max(len(self.close) - count, 0), len(self.close))
+
+    @staticmethod
+    def colors(mask, true_color, false_color):
+        """불리언 마스크 → 색상 배열"""
+        return np.where(mask, true_color, false_color)
+
+
+class LODController:
+    def __init__(self, axes, points_per_pixel=POINTS_PER_PIXEL):
+        """
+        x축을 공유하는 축들의 LOD 관리
+
+        Args:
+            axes (list): 대상 축 (sharex 관계)
+            points_per_pixel (float): 픽셀당 버킷 수
+        """
+        self.axes = list(axes)
+        self.points_per_pixel = points_per_pixel
+        self.layers = []
+        self.full_range = None
+        self._refreshing = False
+
+        # x 범위는 show_all/툴바가 정함 - 자동 범위 조정이 켜져 있으면 아티스트 교체 때마다
+        # xlim_changed가 다시 발생해 무한 반복될 수 있음
+        # 공유 축은 직접 조작된 축에서만 이벤트가 오므로 모든 축에 연결
+        for ax in self.axes:
+            ax.set_autoscalex_on(False)
+            ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def _buckets_for(self, ax):
+        return max(int(axis_pixel_width(ax) * self.points_per_pixel), 2)
+
+    def _extend_range(self, x):
+        if len(x) == 0:
+            return
+        low, high = float(x[0]), float(x[-1])
+        if self.full_range is None:
+            self.full_range = (low, high)
+        else:
+            self.full_range = (min(self.full_range[0], low), max(self.full_range[1], high))
+
+    def add_line(self, ax, x, y, method='minmax', **kwargs):
+        """선 추가 (ax.plot 인자 그대로) → Line2D"""
+        line, = ax.plot([], [], **kwargs)
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        _update_datalim(ax, x, y)
+        self.layers.append(('line', ax, line, x, y, method))
+        self._extend_range(x)
+        return line
+
+    def add_fill(self, ax, x, y1, y2, **kwargs):
+        """두 선 사이 음영 (ax.fill_between 인자 그대로)"""
+        x = np.asarray(x, dtype=float)
+        layer = {'artist': None, 'kwargs': kwargs}
+        _update_datalim(ax, x, y1)
+        _update_datalim(ax, x, y2)
+        self.layers.append(('fill', ax, layer, x, (np.asarray(y1, dtype=float), np.asarray(y2, dtype=float)), None))
+        self._extend_range(x)
+        return layer
+
+    def add_bars(self, ax, x, heights, colors, width=None, **kwargs):
+        """막대 추가 (colors: 막대별 색상 배열) → PolyCollection"""
+        x = np.asarray(x, dtype=float)
+        bars = PolyCollection([], **kwargs)
+        ax.add_collection(bars)
+        _update_datalim(ax, x, heights)
+        _update_datalim(ax, x, np.zeros(len(x)))
+        base_width = width if width is not None else (np.median(np.diff(x)) if len(x) > 1 else 1.0)
+        layer = {'artist': bars, 'colors': np.asarray(colors, dtype=object), 'width': base_width}
+        self.layers.append(('bars', ax, layer, x, np.asarray(heights, dtype=float), None))
+        self._extend_range(x)
+        return bars
+
+    def refresh(self, xlim=None):
+        """보이는 구간만 다시 다운샘플링"""
+        if self._refreshing:
+            return  # 아티스트 교체 중 자동 범위 조정으로 xlim_changed가 다시 올 수 있음
+        if xlim is None:
+            if self.full_range is None:
+                return
+            xlim = self.full_range
+
+        self._refreshing = True
+        try:
+            self._refresh_layers(xlim)
+        finally:
+            self._refreshing = False
+
+    def _refresh_layers(self, xlim):
+        for kind, ax, artist, x, y, method in self.layers:
+            window = visible_slice(x, xlim)
+            xs = x[window]
+            n_buckets = self._buckets_for(ax)
+
+            if kind == 'line':
+                ys = y[window]
+                if method == 'lttb' and np.isfinite(ys).all():
+                    idx = lttb_indices(xs, ys, 2 * n_buckets)
+                else:
+                    idx = minmax_indices(ys, n_buckets)
+                artist.set_data(xs[idx], ys[idx])
+
+            elif kind == 'fill':
+                y1, y2 = y[0][window], y[1][window]
+                idx = np.union1d(minmax_indices(y1, n_buckets), minmax_indices(y2, n_buckets))
+                if artist['artist'] is not None:
+                    artist['artist'].remove()
+                artist['artist'] = ax.fill_between(xs[idx], y1[idx], y2[idx], **artist['kwargs'])
+
+            elif kind == 'bars':
+                heights = y[window]
+                idx = peak_indices(heights, n_buckets)
+                spacing = (xs[-1] - xs[0]) / len(idx) if len(idx) > 1 else artist['width']
+                width = max(artist['width'], spacing) * 0.8
+                artist['artist'].set_verts(bar_verts(xs[idx], np.nan_to_num(heights[idx]), width))
+                artist['artist'].set_facecolor(list(artist['colors'][window][idx]))
+
+    def show_all(self):
+        """전체 범위로 x축 설정 후 다운샘플링 (자동 범위 조정 해제)"""
+        if self.full_range is None:
+            return
+        low, high = self.full_range
+        pad = (high - low) * 0.01 or 1.0
+        self.axes[0].set_xlim(low - pad, high + pad)  # → xlim_changed → refresh
+
+    def connect_canvas(self, canvas):
+        """창 크기가 바뀌면 픽셀 폭에 맞춰 다시 축약"""
+        canvas.mpl_connect('resize_event', lambda event: self.refresh(self.axes[0].get_xlim()))
+
+    def _on_xlim_changed(self, ax):
+        self.refresh(ax.get_xlim())
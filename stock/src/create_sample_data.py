@@ -9,9 +9,9 @@ import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 
-def generate_sample_stock_data(symbol, days=1095, base_price=None):
-    """샘플 주식 데이터 생성"""
-    np.random.seed(hash(symbol) % 2**32)  # 종목별 고유 시드
+def generate_sample_stock_data(symbol, days=1095, base_price=None, seed=None):
+    """샘플 주식 데이터 생성 (seed를 주면 실행마다 같은 데이터)"""
+    np.random.seed(seed if seed is not None else hash(symbol) % 2**32)  # 종목별 고유 시드
     
     # 기본 설정
     start_date = datetime.now() - timedelta(days=days)
@@ -12,18 +12,53 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import json
 import glob
+import csv
+
+try:
+    from .price_store import ColumnarPriceStore, default_store_path
+    from .frame_cache import FrameCache, source_key
+except ImportError:
+    from price_store import ColumnarPriceStore, default_store_path
+    from frame_cache import FrameCache, source_key
 
 class DataLoader:
-    def __init__(self, data_folder="D:/vscode/stock/data"):
+    # 표준 컬럼명 매핑
+    COLUMN_MAPPING = {
+        # Date 컬럼
+        'date': 'Date', 'timestamp': 'Date', 'time': 'Date', 'dt': 'Date',
+        '날짜': 'Date', '일자': 'Date',
+        
+        # OHLCV 컬럼
+        'open': 'Open', '시가': 'Open', 'opening_price': 'Open',
+        'high': 'High', '고가': 'High', 'highest_price': 'High',
+        'low': 'Low', '저가': 'Low', 'lowest_price': 'Low',
+        'close': 'Close', '종가': 'Close', 'closing_price': 'Close', 'price': 'Close',
+        'volume': 'Volume', '거래량': 'Volume', 'vol': 'Volume', 'trading_volume': 'Volume',
+        
+        # 기타
+        'adj_close': 'Adj_Close', 'adjusted_close': 'Adj_Close'
+    }
+    
+    def __init__(self, data_folder="D:/vscode/stock/data", use_price_store=True,
+                 cache_memory_mb=256, use_disk_cache=True):
         """
         데이터 로더 초기화
         
         Args:
             data_folder (str): 주식 데이터가 저장된 폴더 경로
+            use_price_store (bool): 컬럼형 저장소 사용 여부 (파일은 처음 한 번만 파싱)
+            cache_memory_mb (int): 메모리 캐시 최대 크기 (MB)
+            use_disk_cache (bool): 정규화된 데이터 디스크 캐시 사용 여부
         """
         self.data_folder = Path(data_folder)
         self.supported_formats = ['.csv', '.xlsx', '.xls', '.json', '.txt']
-        self.cache = {}  # 데이터 캐시
+        # 데이터 캐시 (메모리 LRU + 디스크, 원본 파일 변경시 무효화)
+        self.cache = FrameCache(
+            self.data_folder / "cache" if use_disk_cache else None,
+            max_memory_bytes=cache_memory_mb * 1024 * 1024
+        )
+        self.csv_schemas = {}  # (경로, 수정시각, 크기) → 감지된 CSV 스키마
+        self.price_store = ColumnarPriceStore(default_store_path(data_folder)) if use_price_store else None
         
         print(f"📂 데이터 폴더: {self.data_folder}")
         if not self.data_folder.exists():
@@ -127,7 +162,22 @@ class DataLoader:
         return list(set(possible_files))
         
     def load_csv_file(self, file_path):
-        """CSV 파일 로드"""
+        """CSV 파일 로드 - 감지된 스키마로 한 번만 파싱, 실패시 전수 시도"""
+        try:
+            schema = self.get_csv_schema(file_path)
+            if schema is not None:
+                df = self.read_csv_with_schema(file_path, schema)
+                if df is not None:
+                    return df
+                    
+            return self._load_csv_brute_force(file_path)
+            
+        except Exception as e:
+            print(f"❌ CSV 파일 로드 실패 {file_path}: {e}")
+            return None
+            
+    def _load_csv_brute_force(self, file_path):
+        """CSV 파일 로드 (인코딩 × 구분자 전수 시도)"""
         try:
             # 다양한 구분자와 인코딩 시도
             encodings = ['utf-8', 'cp949', 'euc-kr', 'latin1']
@@ -150,6 +200,123 @@ class DataLoader:
             print(f"❌ CSV 파일 로드 실패 {file_path}: {e}")
             return None
             
+    def get_csv_schema(self, file_path):
+        """파일별 감지 스키마 (경로+수정시각+크기 기준 캐시)"""
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+        
+        if key not in self.csv_schemas:
+            self.csv_schemas[key] = self.sniff_csv(file_path)
+            
+        return self.csv_schemas[key]
+        
+    def sniff_csv(self, file_path, sample_size=8192):
+        """
+        앞부분 샘플로 인코딩/구분자/헤더 감지
+        
+        Returns:
+            dict: encoding, sep, names, usecols, dtype, has_date (감지 실패시 None)
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                sample = f.read(sample_size)
+            if not sample:
+                return None
+                
+            # 인코딩 감지 (샘플 끝에서 잘린 멀티바이트 문자는 허용)
+            encoding = None
+            text = None
+            if sample.startswith(b'\xef\xbb\xbf'):
+                encoding = 'utf-8-sig'
+                text = sample[3:].decode('utf-8', errors='ignore')
+            else:
+                for candidate in ['utf-8', 'cp949', 'euc-kr', 'latin1']:
+                    for trim in range(4):
+                        try:
+                            text = sample[:len(sample) - trim].decode(candidate)
+                            encoding = candidate
+                            break
+                        except UnicodeDecodeError:
+                            continue
+                    if encoding:
+                        break
+            if encoding is None:
+                return None
+                
+            lines = text.splitlines()
+            if len(sample) == sample_size and len(lines) > 1:
+                lines = lines[:-1]  # 잘린 마지막 줄 제외
+            sample_text = "\n".join(lines[:50])
+            
+            # 구분자 감지
+            try:
+                sep = csv.Sniffer().sniff(sample_text, delimiters=",\t;|").delimiter
+            except csv.Error:
+                sep = max([',', '\t', ';', '|'], key=lambda d: lines[0].count(d))
+                
+            header = next(csv.reader([lines[0]], delimiter=sep))
+            if len(header) <= 3:  # 최소한의 컬럼 수 확인
+                return None
+                
+            # 헤더 → 표준 컬럼명
+            standards = []
+            for position, col in enumerate(header):
+                name = col.strip().replace(' ', '_')
+                standard = self.COLUMN_MAPPING.get(name.lower(), name)
+                if not name and position == 0:
+                    standard = 'Date'  # to_csv로 저장된 이름 없는 인덱스
+                standards.append(standard)
+                
+            if 'Close' not in standards or len(set(standards)) != len(standards):
+                return None
+                
+            keep = {'Date', 'Open', 'High', 'Low', 'Close', 'Volume', 'Adj_Close'}
+            usecols = [name for name in standards if name in keep]
+            
+            return {
+                'encoding': encoding,
+                'sep': sep,
+                'names': standards,
+                'usecols': usecols,
+                'dtype': {name: 'float64' for name in usecols if name != 'Date'},
+                'has_date': 'Date' in usecols
+            }
+            
+        except Exception as e:
+            print(f"⚠️ CSV 형식 감지 실패 {file_path}: {e}")
+            return None
+            
+    def read_csv_with_schema(self, file_path, schema):
+        """감지된 스키마로 타입 지정 단일 파싱 (실패시 None)"""
+        try:
+            df = pd.read_csv(
+                file_path,
+                encoding=schema['encoding'],
+                sep=schema['sep'],
+                header=0,
+                names=schema['names'],
+                usecols=schema['usecols'],
+                dtype=schema['dtype']
+            )
+        except (ValueError, UnicodeDecodeError, pd.errors.ParserError):
+            return None  # 숫자가 아닌 값 등 → 전수 시도로 넘김
+            
+        # 결측 없는 정수 거래량은 int64로 (기존 to_numeric 결과와 동일)
+        if 'Volume' in df.columns:
+            volume = df['Volume'].to_numpy()
+            if np.isfinite(volume).all() and (volume == np.round(volume)).all():
+                df['Volume'] = volume.astype(np.int64)
+                
+        if schema['has_date']:
+            try:
+                df['Date'] = pd.to_datetime(df['Date'])
+                df.set_index('Date', inplace=True)
+            except:
+                pass
+                
+        return self._finalize_dataframe(df)
+        
     def load_excel_file(self, file_path):
         """Excel 파일 로드"""
         try:
@@ -184,25 +351,8 @@ class DataLoader:
             # 컬럼명 정규화 (대소문자, 공백 처리)
             df.columns = df.columns.str.strip().str.replace(' ', '_')
             
-            # 표준 컬럼명 매핑
-            column_mapping = {
-                # Date 컬럼
-                'date': 'Date', 'timestamp': 'Date', 'time': 'Date', 'dt': 'Date',
-                '날짜': 'Date', '일자': 'Date',
-                
-                # OHLCV 컬럼
-                'open': 'Open', '시가': 'Open', 'opening_price': 'Open',
-                'high': 'High', '고가': 'High', 'highest_price': 'High',
-                'low': 'Low', '저가': 'Low', 'lowest_price': 'Low',
-                'close': 'Close', '종가': 'Close', 'closing_price': 'Close', 'price': 'Close',
-                'volume': 'Volume', '거래량': 'Volume', 'vol': 'Volume', 'trading_volume': 'Volume',
-                
-                # 기타
-                'adj_close': 'Adj_Close', 'adjusted_close': 'Adj_Close'
-            }
-            
             # 컬럼명 변환
-            df.columns = [column_mapping.get(col.lower(), col) for col in df.columns]
+            df.columns = [self.COLUMN_MAPPING.get(col.lower(), col) for col in df.columns]
             
             # Date 컬럼 처리
             date_columns = ['Date', 'date', 'timestamp', 'time']
@@ -225,6 +375,15 @@ class DataLoader:
                 if col in df.columns:
                     df[col] = pd.to_numeric(df[col], errors='coerce')
                     
+            return self._finalize_dataframe(df)
+            
+        except Exception as e:
+            print(f"❌ 데이터 정규화 실패: {e}")
+            return df
+            
+    def _finalize_dataframe(self, df):
+        """정규화 마무리 - 결측 제거, 정렬, 기본 컬럼 생성"""
+        try:
             # 결측값 처리
             df = df.dropna(subset=['Close'])  # Close 가격이 없는 행 제거
             
@@ -251,24 +410,30 @@ class DataLoader:
         """주식 데이터 로드"""
         symbol = symbol.upper()
         
-        # 캐시 확인
-        if symbol in self.cache:
-            cache_time, data = self.cache[symbol]
-            if datetime.now() - cache_time < timedelta(minutes=5):  # 5분 캐시
-                print(f"🗂️ 캐시에서 {symbol} 데이터 반환")
-                return data
-                
-        print(f"📈 {symbol} 데이터 로딩...")
-        
         # 파일 찾기
         files = self.find_stock_files(symbol)
+        latest_file = max(files, key=lambda f: f.stat().st_mtime) if files else None
+        
+        # 캐시 확인 (원본 파일/저장소가 바뀌지 않았으면 재사용)
+        cache_key = self._cache_key(symbol, latest_file)
+        data = self.cache.get(symbol, cache_key)
+        if data is not None:
+            print(f"🗂️ 캐시에서 {symbol} 데이터 반환")
+            return data
+            
+        print(f"📈 {symbol} 데이터 로딩...")
+        
+        # 컬럼형 저장소가 원본 파일보다 최신이면 파싱 없이 로드
+        data = self.load_from_store(symbol, latest_file)
+        if data is not None:
+            self.cache.put(symbol, cache_key, data)
+            return data
         
-        if not files:
+        if latest_file is None:
             print(f"❌ {symbol} 데이터 파일을 찾을 수 없습니다")
             return None
             
         # 가장 최신 파일 선택
-        latest_file = max(files, key=lambda f: f.stat().st_mtime)
         print(f"📄 파일 로드: {latest_file}")
         
         # 파일 형식에 따라 로드
@@ -285,18 +450,66 @@ class DataLoader:
             return None
             
         if data is not None and not data.empty:
-            # 캐시에 저장
-            self.cache[symbol] = (datetime.now(), data)
             print(f"✅ {symbol} 데이터 로드 완료 ({len(data)}일)")
+            
+            # 다음 로드부터는 저장소 사용
+            if self.price_store is not None and isinstance(data.index, pd.DatetimeIndex):
+                self.price_store.import_dataframe(symbol, data, latest_file.stat().st_mtime)
+                
+            # 캐시에 저장 (저장소 갱신 후 키 계산)
+            self.cache.put(symbol, self._cache_key(symbol, latest_file), data)
             return data
         else:
             print(f"❌ {symbol} 데이터 로드 실패")
             return None
             
+    def _cache_key(self, symbol, source_file):
+        """캐시 키 - 원본 파일 (경로, 수정시각, 크기) + 저장소 갱신 시각"""
+        file_key = source_key(source_file) if source_file is not None else None
+        store_version = None
+        if self.price_store is not None:
+            index = self.price_store.read_index(symbol)
+            if index and index['segments']:
+                store_version = index.get('updated')
+                
+        if file_key is None and store_version is None:
+            return None
+        return (file_key, store_version)
+        
+    def load_from_store(self, symbol, source_file=None):
+        """컬럼형 저장소에서 로드 (원본 파일이 더 최신이면 None)"""
+        if self.price_store is None or not self.price_store.has_symbol(symbol):
+            return None
+            
+        if source_file is not None and not self.price_store.is_fresh(symbol, source_file.stat().st_mtime):
+            return None
+            
+        data = self.price_store.load(symbol)
+        if data is None or data.empty:
+            return None
+            
+        print(f"🗄️ 저장소에서 {symbol} 데이터 로드 ({len(data)}일)")
+        return data
+        
+    def save_to_store(self, symbol, data, append=True):
+        """컬럼형 저장소에 저장 (append=True면 새 행만 세그먼트로 추가)"""
+        if self.price_store is None:
+            return False
+            
+        symbol = symbol.upper()
+        self.cache.invalidate(symbol)
+        
+        if append:
+            return self.price_store.append(symbol, data) >= 0
+        return self.price_store.write(symbol, data)
+            
     def get_available_symbols(self):
         """사용 가능한 종목 목록 반환"""
         symbols = set()
         
+        if self.price_store is not None:
+            symbols.update(self.price_store.get_symbols())
+        
         for ext in self.supported_formats:
             files = list(self.data_folder.glob(f"*{ext}"))
             for file in files:
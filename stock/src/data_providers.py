@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시세 데이터 제공자 인터페이스
+다운로더가 yfinance에 직접 묶이지 않도록 history / bulk_history 두 메서드로 추상화
+(재생 서버 제공자로 바꾸면 네트워크 없이 다운로드 경로를 측정할 수 있음)
+"""
+
+import json
+from urllib.error import HTTPError
+from urllib.parse import urlencode, quote
+from urllib.request import urlopen
+
+import pandas as pd
+
+try:
+    from .download_utils import bulk_download, PRICE_COLUMNS
+except ImportError:
+    from download_utils import bulk_download, PRICE_COLUMNS
+
+# yfinance 임포트 시도
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    YFINANCE_AVAILABLE = False
+
+
+def _format_date(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d') if value is not None else None
+
+
+def frame_from_payload(payload):
+    """재생 서버 응답 {'columns', 'rows'} → OHLCV 데이터프레임 (인덱스: Date)"""
+    frame = pd.DataFrame(payload.get('rows', []), columns=payload.get('columns', ['Date'] + PRICE_COLUMNS))
+    frame['Date'] = pd.to_datetime(frame['Date'])
+    return frame.set_index('Date')
+
+
+class MarketDataProvider:
+    """시세 제공자 기본 클래스"""
+
+    name = "base"
+
+    def is_available(self):
+        """사용 가능 여부"""
+        return True
+
+    def history(self, symbol, start=None, end=None, period=None):
+        """
+        종목 하나의 가격 이력
+
+        Args:
+            start/end: 기간 (start가 없으면 period 사용)
+            period (str): '3y', '1y', '6mo' 등
+
+        Returns:
+            pd.DataFrame: OHLCV (인덱스: Date), 실패시 예외
+        """
+        raise NotImplementedError
+
+    def bulk_history(self, symbols, start=None, end=None, period=None):
+        """
+        여러 종목 일괄 요청
+
+        Returns:
+            dict: {종목: 데이터프레임} (받지 못한 종목은 제외 - 호출자가 개별 요청으로 보완)
+        """
+        return {}
+
+    def describe(self):
+        """상태 표시용 설명"""
+        return self.name
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Yahoo Finance (yfinance)"""
+
+    name = "yfinance"
+
+    def is_available(self):
+        return YFINANCE_AVAILABLE
+
+    def history(self, symbol, start=None, end=None, period=None):
+        ticker = yf.Ticker(symbol)
+        if start is not None:
+            return ticker.history(start=start, end=end)
+        return ticker.history(period=period or '1y')
+
+    def bulk_history(self, symbols, start=None, end=None, period=None):
+        return bulk_download(symbols, start=start, end=end, period=period)
+
+
+class ReplayProvider(MarketDataProvider):
+    """로컬 재생 서버 (replay_server.ReplayServer) 클라이언트"""
+
+    name = "replay"
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _get(self, path, params):
+        params = {key: value for key, value in params.items() if value is not None}
+        url = f"{self.base_url}{path}"
+        if params:
+            url += "?" + urlencode(params)
+
+        try:
+            with urlopen(url, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except HTTPError as e:
+            raise RuntimeError(f"재생 서버 오류 {e.code}: {url}") from e
+
+    def history(self, symbol, start=None, end=None, period=None):
+        payload = self._get(f"/history/{quote(symbol)}", {
+            'start': _format_date(start), 'end': _format_date(end), 'period': period
+        })
+        return frame_from_payload(payload)
+
+    def bulk_history(self, symbols, start=None, end=None, period=None):
+        if not symbols:
+            return {}
+
+        payload = self._get("/bulk", {
+            'symbols': ",".join(symbols),
+            'start': _format_date(start), 'end': _format_date(end), 'period': period
+        })
+        frames = {}
+        for symbol, item in payload.get('frames', {}).items():
+            frame = frame_from_payload(item)
+            if not frame.empty:
+                frames[symbol] = frame
+        return frames
+
+    def describe(self):
+        return f"replay {self.base_url}"
+
+
+def create_provider(config=None):
+    """설정으로 제공자 선택 (data_provider_url이 있으면 재생 서버, 없으면 yfinance)"""
+    config = config or {}
+    url = config.get('data_provider_url')
+    if url:
+        return ReplayProvider(url)
+    return YFinanceProvider()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+다운로드 공용 유틸리티
+토큰 버킷 속도 제한, 백오프 재시도, 제한된 스레드 풀 일괄 실행, yfinance 다종목 일괄 요청
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+# yfinance 임포트 시도
+try:
+    import yfinance as yf
+    YFINANCE_AVAILABLE = True
+except ImportError:
+    YFINANCE_AVAILABLE = False
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        토큰 버킷 속도 제한기 (스레드 안전)
+
+        Args:
+            rate (float): 초당 허용 요청 수
+            capacity (int): 순간 최대 요청 수 (기본값: rate 올림)
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1, int(rate + 0.999)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """토큰이 있으면 즉시 사용 (없으면 False)"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1, timeout=None):
+        """토큰이 생길 때까지 대기 (timeout 초과시 False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+
+            time.sleep(wait)
+
+
+def retry_with_backoff(func, retries=3, base_delay=1.0, max_delay=30.0,
+                       retry_on_result=None, on_retry=None):
+    """
+    지수 백오프(지터 포함) 재시도
+
+    Args:
+        func: 인자 없는 호출 대상
+        retries (int): 최대 재시도 횟수 (총 시도 = retries + 1)
+        retry_on_result: 결과를 받아 True면 재시도 (예: lambda r: r is None)
+        on_retry: on_retry(시도 번호, 대기 초, 예외 또는 None) 알림
+
+    Returns:
+        마지막 시도의 결과 (마지막 시도의 예외는 그대로 전파)
+    """
+    for attempt in range(retries + 1):
+        error = None
+        try:
+            result = func()
+            if retry_on_result is None or not retry_on_result(result):
+                return result
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            error = e
+
+        if attempt >= retries:
+            return result
+
+        delay = min(max_delay, base_delay * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.0)
+        if on_retry:
+            on_retry(attempt + 1, delay, error)
+        time.sleep(delay)
+
+
+def run_concurrent_batch(items, worker, max_workers=8, on_progress=None):
+    """
+    제한된 스레드 풀로 일괄 실행 - 전체 시간이 합이 아닌 최대 지연에 가깝도록
+
+    Args:
+        items: 작업 대상 목록 (예: 종목 코드)
+        worker: worker(item) → 결과
+        max_workers (int): 동시 실행 수
+        on_progress: on_progress(item, 결과, 예외, 완료 수, 전체 수) - 작업 스레드에서 호출됨
+
+    Returns:
+        dict: {item: 결과} (예외가 난 항목은 None)
+    """
+    items = list(items)
+    results = {}
+    if not items:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        futures = {executor.submit(worker, item): item for item in items}
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            item = futures[future]
+            error = None
+            try:
+                result = future.result()
+            except Exception as e:
+                result = None
+                error = e
+
+            results[item] = result
+            if on_progress:
+                on_progress(item, result, error, done, len(items))
+
+    return results
+
+
+def group_symbols_by_start(start_dates):
+    """
+    필요한 시작일이 같은 종목끼리 묶기
+
+    Args:
+        start_dates (dict): {종목: 시작일 또는 None(전체 기간)}
+
+    Returns:
+        dict: {시작일(YYYY-MM-DD) 또는 None: [종목, ...]}
+    """
+    groups = {}
+    for symbol, start in start_dates.items():
+        key = pd.Timestamp(start).strftime('%Y-%m-%d') if start is not None else None
+        groups.setdefault(key, []).append(symbol)
+    return groups
+
+
+def split_bulk_frame(wide, symbols):
+    """
+    yf.download(group_by='ticker') 결과를 종목별 OHLCV 데이터프레임으로 분리
+
+    Returns:
+        dict: {종목: 데이터프레임} (데이터가 없는 종목은 제외)
+    """
+    frames = {}
+    if wide is None or wide.empty:
+        return frames
+
+    if not isinstance(wide.columns, pd.MultiIndex):
+        # 단일 종목 요청은 평평한 컬럼으로 올 수 있음
+        if len(symbols) == 1:
+            frame = wide[[col for col in PRICE_COLUMNS if col in wide.columns]].dropna(how='all')
+            if not frame.empty:
+                frames[symbols[0]] = frame
+        return frames
+
+    tickers_level = 0 if set(symbols) & set(wide.columns.get_level_values(0)) else 1
+
+    for symbol in symbols:
+        try:
+            frame = wide.xs(symbol, axis=1, level=tickers_level)
+        except KeyError:
+            continue
+
+        frame = frame[[col for col in PRICE_COLUMNS if col in frame.columns]].dropna(how='all')
+        if not frame.empty:
+            frame.index.name = 'Date'
+            frames[symbol] = frame.copy()
+
+    return frames
+
+
+def bulk_download(symbols, start=None, end=None, period=None, chunk_size=50, **kwargs):
+    """
+    다종목 일괄 다운로드 - 종목마다 Ticker를 만드는 대신 multi-ticker 요청 한 번
+
+    Args:
+        symbols (list): 종목 목록
+        start/end: 기간 (start가 없으면 period 사용)
+        chunk_size (int): 요청 하나에 넣을 최대 종목 수
+
+    Returns:
+        dict: {종목: OHLCV 데이터프레임} (받지 못한 종목은 제외 - 호출자가 개별 다운로드로 보완)
+    """
+    if not YFINANCE_AVAILABLE or not symbols:
+        return {}
+
+    options = {
+        'group_by': 'ticker',
+        'auto_adjust': True,   # Ticker.history 기본값과 동일
+        'actions': False,
+        'ignore_tz': False,    # Ticker.history처럼 거래소 타임존 유지
+        'threads': True,
+        'progress': False
+    }
+    options.update(kwargs)
+    if start is not None:
+        options['start'] = start
+        if end is not None:
+            options['end'] = end
+    else:
+        options['period'] = period or '1y'
+
+    frames = {}
+    symbols = list(dict.fromkeys(symbols))
+    for i in range(0, len(symbols), chunk_size):
+        chunk = symbols[i:i + chunk_size]
+        try:
+            wide = yf.download(chunk, **options)
+            frames.update(split_bulk_frame(wide, chunk))
+        except Exception as e:
+            print(f"❌ 일괄 다운로드 실패 ({len(chunk)}개 종목): {e}")
+
+    return frames
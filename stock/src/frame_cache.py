@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터프레임 2단계 캐시 모듈
+1단계: 바이트 크기로 제한된 메모리 LRU
+2단계: 정규화된 데이터프레임 피클 디스크 캐시 (원본 파일 수정시각/크기로 무효화)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+
+def source_key(file_path):
+    """원본 파일 식별 키 (경로, 수정시각, 크기)"""
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    return (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def frame_nbytes(data):
+    """데이터프레임 메모리 사용량 (바이트)"""
+    try:
+        return int(data.memory_usage(deep=True, index=True).sum())
+    except Exception:
+        return 0
+
+
+class FrameCache:
+    def __init__(self, cache_dir=None, max_memory_bytes=256 * 1024 * 1024):
+        """
+        2단계 캐시 초기화
+
+        Args:
+            cache_dir (str): 디스크 캐시 폴더 (None이면 메모리만 사용)
+            max_memory_bytes (int): 메모리 캐시 최대 크기
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_memory_bytes = max_memory_bytes
+        self.entries = OrderedDict()  # 종목 → (원본 키, 데이터, 바이트)
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+    # ---------- 메모리 ----------
+
+    def _memory_get(self, symbol, key):
+        with self.lock:
+            entry = self.entries.get(symbol)
+            if entry is None:
+                return None
+            if entry[0] != key:
+                self._memory_remove(symbol)  # 원본이 바뀜
+                return None
+            self.entries.move_to_end(symbol)
+            return entry[1]
+
+    def _memory_put(self, symbol, key, data):
+        size = frame_nbytes(data)
+        with self.lock:
+            self._memory_remove(symbol)
+            if size > self.max_memory_bytes:
+                return  # 한도보다 큰 데이터는 디스크에만 보관
+
+            self.entries[symbol] = (key, data, size)
+            self.memory_bytes += size
+
+            while self.memory_bytes > self.max_memory_bytes and self.entries:
+                _, (_, _, evicted_size) = self.entries.popitem(last=False)
+                self.memory_bytes -= evicted_size
+                self.stats['evictions'] += 1
+
+    def _memory_remove(self, symbol):
+        entry = self.entries.pop(symbol, None)
+        if entry is not None:
+            self.memory_bytes -= entry[2]
+
+    # ---------- 디스크 ----------
+
+    def _disk_path(self, symbol, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{symbol}__{digest}.pkl"
+
+    def _disk_get(self, symbol, key):
+        if self.cache_dir is None:
+            return None
+
+        path = self._disk_path(symbol, key)
+        if not path.exists():
+            return None
+
+        try:
+            return pd.read_pickle(path)
+        except Exception as e:
+            print(f"⚠️ 디스크 캐시 읽기 실패 {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def _disk_put(self, symbol, key, data):
+        if self.cache_dir is None:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(symbol, key)
+
+            # 같은 종목의 이전 버전 삭제
+            for old in self.cache_dir.glob(f"{symbol}__*.pkl"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+
+            tmp_path = path.with_name(path.name + ".tmp")
+            data.to_pickle(tmp_path)
+            tmp_path.replace(path)
+
+        except Exception as e:
+            print(f"⚠️ 디스크 캐시 저장 실패 {symbol}: {e}")
+
+    # ---------- 공개 API ----------
+
+    def get(self, symbol, key):
+        """메모리 → 디스크 순으로 조회 (원본 키가 다르면 None)"""
+        if key is None:
+            return None
+
+        data = self._memory_get(symbol, key)
+        if data is not None:
+            self.stats['memory_hits'] += 1
+            return data
+
+        data = self._disk_get(symbol, key)
+        if data is not None:
+            self.stats['disk_hits'] += 1
+            self._memory_put(symbol, key, data)
+            return data
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, symbol, key, data):
+        """두 단계 모두에 저장"""
+        if key is None or data is None:
+            return
+        self._memory_put(symbol, key, data)
+        self._disk_put(symbol, key, data)
+
+    def invalidate(self, symbol):
+        """종목 캐시 삭제 (메모리 + 디스크)"""
+        with self.lock:
+            self._memory_remove(symbol)
+        if self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob(f"{symbol}__*.pkl"):
+                path.unlink(missing_ok=True)
+
+    def clear(self, disk=False):
+        """메모리 캐시 비우기 (disk=True면 디스크 캐시도)"""
+        with self.lock:
+            self.entries.clear()
+            self.memory_bytes = 0
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink(missing_ok=True)
+
+    def __contains__(self, symbol):
+        return symbol in self.entries
+
+    def get_stats(self):
+        """캐시 통계"""
+        return {
+            **self.stats,
+            'entries': len(self.entries),
+            'memory_bytes': self.memory_bytes,
+            'max_memory_bytes': self.max_memory_bytes
+        }
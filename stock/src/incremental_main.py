@@ -19,6 +19,24 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import threading
 import queue
+import time
+
+try:
+    from .streaming_indicators import update_indicator_state
+    from .technical_analysis import TechnicalAnalysis
+    from .price_store import ColumnarPriceStore, default_store_path
+    from .download_utils import (TokenBucket, retry_with_backoff, run_concurrent_batch,
+                                 group_symbols_by_start, PRICE_COLUMNS)
+    from .data_providers import create_provider
+    from .tk_jobs import TkJobExecutor
+except ImportError:
+    from streaming_indicators import update_indicator_state
+    from technical_analysis import TechnicalAnalysis
+    from price_store import ColumnarPriceStore, default_store_path
+    from download_utils import (TokenBucket, retry_with_backoff, run_concurrent_batch,
+                                group_symbols_by_start, PRICE_COLUMNS)
+    from data_providers import create_provider
+    from tk_jobs import TkJobExecutor
 
 # yfinance 임포트 시도
 try:
@@ -35,8 +53,17 @@ class IncrementalStockDownloader:
         self.root = tk.Tk()
         self.setup_window()
         self.load_config()
+        self.price_store = None
+        if self.config.get('use_price_store', True):
+            self.price_store = ColumnarPriceStore(default_store_path(self.config['data_folder']))
+        self.provider = create_provider(self.config)  # yfinance 또는 재생 서버
         self.current_data = None
+        self.technical_analysis = TechnicalAnalysis()
+        self.ui_queue = queue.Queue()  # 작업 스레드 → Tk 스레드 이벤트
+        self.jobs = TkJobExecutor(self.root)  # 분석 요청 (새 요청이 이전 요청 취소)
+        self.batch_running = False
         self.create_widgets()
+        self.root.after(100, self.process_ui_events)
         
     def setup_window(self):
         """윈도우 설정"""
@@ -61,6 +88,12 @@ class IncrementalStockDownloader:
             "initial_download_period": "3y",  # 초기 다운로드 기간
             "file_name_format": "{symbol}_{date}.csv",  # 파일명 형식
             "date_format": "%Y%m%d",  # 날짜 형식
+            "use_price_store": True,  # 컬럼형 저장소 사용 (CSV 전체 재작성 없이 추가)
+            "batch_workers": 8,  # 일괄 업데이트 동시 다운로드 수
+            "requests_per_second": 4,  # 초당 최대 요청 수 (API 제한 방지)
+            "download_retries": 2,  # 종목별 재시도 횟수
+            "bulk_download": True,  # 시작일이 같은 종목을 한 번의 다종목 요청으로 받기
+            "data_provider_url": None,  # 재생 서버 주소 (예: http://127.0.0.1:8765, 없으면 yfinance)
             "etf_symbols": [
                 "TQQQ", "SOXL", "FNGU", "NAIL", "TECL", "LABU", 
                 "RETL", "WEBL", "DPST", "TNA", "HIBL", "BNKU",
@@ -165,11 +198,175 @@ class IncrementalStockDownloader:
             print(f"기존 데이터 로드 실패: {e}")
             return None
             
-    def download_incremental_data(self, symbol):
-        """증분 데이터 다운로드"""
-        if not YFINANCE_AVAILABLE:
-            self.log_message(f"❌ yfinance 없음 - {symbol} 다운로드 불가")
+    def get_store_path(self, symbol):
+        """저장소 종목 인덱스 파일 경로 (정보 표시용)"""
+        return self.price_store.symbol_dir(symbol) / ColumnarPriceStore.INDEX_FILE
+        
+    def load_symbol_data(self, symbol):
+        """
+        종목 데이터 로드 - 저장소 우선, 없으면 최신 CSV를 읽어 저장소로 이전
+        
+        Returns:
+            tuple: (데이터, 파일 경로) 또는 (None, None)
+        """
+        if self.price_store is not None and self.price_store.has_symbol(symbol):
+            data = self.price_store.load(symbol)
+            if data is not None and not data.empty:
+                return data, self.get_store_path(symbol)
+                
+        existing_file, _ = self.find_existing_file(symbol)
+        if not existing_file:
+            return None, None
+            
+        data = self.load_existing_data(existing_file)
+        if data is None:
+            return None, existing_file
+            
+        if self.price_store is not None and self.price_store.write(symbol, data):
+            self.log_message(f"🗄️ {symbol}: CSV → 저장소 이전 ({len(data)}일)")
+            
+        return data, existing_file
+        
+    def fetch_history(self, symbol, prefetched=None, start=None, end=None, period=None):
+        """가격 이력 받기 - 일괄 요청으로 미리 받은 데이터가 있으면 그것을 사용"""
+        if prefetched is not None:
+            data = prefetched
+            if start is not None:
+                data = data[pd.Index(data.index.date) >= start.date()]
+        else:
+            data = self.provider.history(symbol, start=start, end=end, period=period)
+                
+        return data[[col for col in PRICE_COLUMNS if col in data.columns]]
+        
+    def get_required_start(self, symbol):
+        """
+        증분 다운로드 시작일
+        
+        Returns:
+            datetime 또는 None (기존 데이터 없음 → 전체 기간)
+        """
+        if self.price_store is not None and self.price_store.has_symbol(symbol):
+            last_date = self.price_store.last_date(symbol)
+        else:
+            data, _ = self.load_symbol_data(symbol)
+            last_date = data.index.max() if data is not None and not data.empty else None
+            
+        if last_date is None:
             return None
+        return last_date + timedelta(days=1)
+        
+    def prefetch_bulk(self, symbols, limiter=None):
+        """
+        필요한 시작일별로 묶어 다종목 요청 → {종목: 새 데이터}
+        
+        이미 최신인 종목은 요청하지 않음, 받지 못한 종목은 결과에서 빠짐 (개별 다운로드로 보완)
+        """
+        today = datetime.now().date()
+        start_dates = {}
+        for symbol in symbols:
+            start = self.get_required_start(symbol)
+            if start is None or start.date() < today:
+                start_dates[symbol] = start
+                
+        groups = group_symbols_by_start(start_dates)
+        prefetched = {}
+        
+        for start, group in groups.items():
+            if limiter is not None:
+                limiter.acquire()
+            if start is None:
+                frames = self.provider.bulk_history(group, period=self.config['initial_download_period'])
+            else:
+                frames = self.provider.bulk_history(group, start=start)
+            prefetched.update(frames)
+            
+        if start_dates:
+            self.log_message(f"📦 일괄 요청 {len(groups)}회: {len(prefetched)}/{len(start_dates)}개 종목 수신")
+            
+        return prefetched
+        
+    def download_incremental_to_store(self, symbol, prefetched=None):
+        """증분 데이터 다운로드 - 저장소에 새 행만 세그먼트로 추가"""
+        try:
+            existing_data, _ = self.load_symbol_data(symbol)
+            
+            if existing_data is not None and not existing_data.empty:
+                last_data_date = existing_data.index.max()
+                start_date = last_data_date + timedelta(days=1)
+                end_date = datetime.now()
+                
+                self.log_message(f"📊 {symbol} 증분 업데이트: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
+                
+                if start_date.date() >= end_date.date():
+                    self.log_message(f"✅ {symbol}: 이미 최신 데이터임")
+                    return {
+                        'data': existing_data,
+                        'updated': False,
+                        'filename': self.get_store_path(symbol),
+                        'indicators': self.update_indicators(symbol, existing_data)
+                    }
+                    
+                new_data = self.fetch_history(symbol, prefetched, start=start_date, end=end_date)
+                
+                if new_data.empty:
+                    self.log_message(f"✅ {symbol}: 새로운 데이터 없음")
+                    return {
+                        'data': existing_data,
+                        'updated': False,
+                        'filename': self.get_store_path(symbol),
+                        'indicators': self.update_indicators(symbol, existing_data)
+                    }
+                    
+                if self.price_store.append(symbol, new_data) < 0:
+                    self.log_message(f"❌ {symbol}: 저장소 추가 실패")
+                    return None
+                    
+                combined_data = self.price_store.load(symbol)
+                self.log_message(f"✅ {symbol}: {len(new_data)}일 새 데이터 추가 → 저장소")
+                
+                return {
+                    'data': combined_data,
+                    'updated': True,
+                    'new_records': len(new_data),
+                    'filename': self.get_store_path(symbol),
+                    'indicators': self.update_indicators(symbol, combined_data)
+                }
+                
+            # 기존 데이터가 없으면 전체 다운로드
+            self.log_message(f"📊 {symbol} 초기 다운로드 ({self.config['initial_download_period']})...")
+            
+            data = self.fetch_history(symbol, prefetched, period=self.config['initial_download_period'])
+            
+            if data.empty:
+                self.log_message(f"❌ {symbol}: 데이터 없음")
+                return None
+            
+            if not self.price_store.write(symbol, data):
+                self.log_message(f"❌ {symbol}: 저장소 저장 실패")
+                return None
+                
+            self.log_message(f"✅ {symbol}: {len(data)}일 초기 데이터 저장 → 저장소")
+            
+            return {
+                'data': data,
+                'updated': True,
+                'new_records': len(data),
+                'filename': self.get_store_path(symbol),
+                'indicators': self.update_indicators(symbol, data)
+            }
+            
+        except Exception as e:
+            self.log_message(f"❌ {symbol} 다운로드 실패: {e}")
+            return None
+            
+    def download_incremental_data(self, symbol, prefetched=None):
+        """증분 데이터 다운로드 (prefetched: 일괄 요청으로 미리 받은 데이터)"""
+        if not self.provider.is_available():
+            self.log_message(f"❌ {self.provider.describe()} 사용 불가 - {symbol} 다운로드 불가")
+            return None
+            
+        if self.price_store is not None:
+            return self.download_incremental_to_store(symbol, prefetched)
             
         try:
             # 기존 파일 확인
@@ -195,19 +392,20 @@ class IncrementalStockDownloader:
                         return {
                             'data': existing_data,
                             'updated': False,
-                            'filename': existing_file
+                            'filename': existing_file,
+                            'indicators': self.update_indicators(symbol, existing_data)
                         }
                         
                     # yfinance로 증분 데이터 다운로드
-                    ticker = yf.Ticker(symbol)
-                    new_data = ticker.history(start=start_date, end=end_date)
+                    new_data = self.fetch_history(symbol, prefetched, start=start_date, end=end_date)
                     
                     if new_data.empty:
                         self.log_message(f"✅ {symbol}: 새로운 데이터 없음")
                         return {
                             'data': existing_data,
                             'updated': False,
-                            'filename': existing_file
+                            'filename': existing_file,
+                            'indicators': self.update_indicators(symbol, existing_data)
                         }
                         
                     # 데이터 컬럼 정규화
@@ -236,14 +434,14 @@ class IncrementalStockDownloader:
                         'data': combined_data,
                         'updated': True,
                         'new_records': len(new_data),
-                        'filename': new_file_path
+                        'filename': new_file_path,
+                        'indicators': self.update_indicators(symbol, combined_data)
                     }
                     
             # 기존 파일이 없으면 전체 다운로드
             self.log_message(f"📊 {symbol} 초기 다운로드 ({self.config['initial_download_period']})...")
             
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=self.config['initial_download_period'])
+            data = self.fetch_history(symbol, prefetched, period=self.config['initial_download_period'])
             
             if data.empty:
                 self.log_message(f"❌ {symbol}: 데이터 없음")
@@ -263,13 +461,30 @@ class IncrementalStockDownloader:
                 'data': data,
                 'updated': True,
                 'new_records': len(data),
-                'filename': file_path
+                'filename': file_path,
+                'indicators': self.update_indicators(symbol, data)
             }
             
         except Exception as e:
             self.log_message(f"❌ {symbol} 다운로드 실패: {e}")
             return None
             
+    def update_indicators(self, symbol, data):
+        """저장된 지표 상태에 새 봉만 반영 (전체 재계산 없음)"""
+        try:
+            data_folder = Path(self.config['data_folder'])
+            state, new_bars = update_indicator_state(data_folder, symbol, data)
+            
+            latest = state.latest()
+            if new_bars:
+                self.log_message(f"📐 {symbol}: 지표 {new_bars}봉 갱신 (RSI {latest['RSI']:.1f}, MACD {latest['MACD']:.3f})")
+                
+            return latest
+            
+        except Exception as e:
+            self.log_message(f"⚠️ {symbol} 지표 상태 갱신 실패: {e}")
+            return None
+            
     def create_widgets(self):
         """GUI 위젯 생성"""
         # 메인 프레임
@@ -392,7 +607,10 @@ class IncrementalStockDownloader:
         self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # yfinance 상태
-        yf_status = "🟢 yfinance 사용가능" if YFINANCE_AVAILABLE else "🔴 yfinance 없음"
+        if self.provider.name != "yfinance":
+            yf_status = f"🟢 {self.provider.describe()}"
+        else:
+            yf_status = "🟢 yfinance 사용가능" if YFINANCE_AVAILABLE else "🔴 yfinance 없음"
         self.yf_status_label = ttk.Label(status_frame, text=yf_status, 
                                         relief=tk.SUNKEN, anchor=tk.E)
         self.yf_status_label.pack(side=tk.RIGHT)
@@ -535,8 +753,30 @@ pip install yfinance
         # 초기 파일 목록 로드
         self.refresh_file_list()
         
+    def post_ui_event(self, func, *args):
+        """작업 스레드에서 Tk 스레드로 처리 요청"""
+        self.ui_queue.put((func, args))
+        
+    def process_ui_events(self):
+        """대기 중인 UI 이벤트 처리 (Tk 스레드에서 주기적으로 실행)"""
+        try:
+            while True:
+                func, args = self.ui_queue.get_nowait()
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(f"UI 이벤트 처리 오류: {e}")
+        except queue.Empty:
+            pass
+            
+        self.root.after(100, self.process_ui_events)
+        
     def log_message(self, message):
-        """로그 메시지 추가"""
+        """로그 메시지 추가 (작업 스레드에서 호출하면 Tk 스레드로 전달)"""
+        if threading.current_thread() is not threading.main_thread():
+            self.post_ui_event(self.log_message, message)
+            return
+            
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {message}\n"
         
@@ -556,13 +796,12 @@ pip install yfinance
             messagebox.showwarning("경고", "종목 코드를 입력하세요.")
             return
             
-        # 기존 파일에서 데이터 로드
-        existing_file, _ = self.find_existing_file(symbol)
+        # 저장소(또는 기존 파일)에서 데이터 로드
+        data, existing_file = self.load_symbol_data(symbol)
         if not existing_file:
             messagebox.showwarning("경고", f"{symbol} 데이터 파일이 없습니다.\n'🔄 업데이트' 버튼을 먼저 눌러주세요.")
             return
             
-        data = self.load_existing_data(existing_file)
         if data is None:
             messagebox.showerror("오류", f"{symbol} 파일을 읽을 수 없습니다.")
             return
@@ -585,7 +824,7 @@ pip install yfinance
                 messagebox.showinfo("정보", f"{symbol}는 이미 최신 데이터입니다.")
         
     def smart_update_and_analyze(self):
-        """스마트 업데이트 + 분석"""
+        """스마트 업데이트 + 분석 (다운로드/지표 계산은 작업 스레드)"""
         symbol = self.symbol_var.get().strip().upper()
         if not symbol:
             messagebox.showwarning("경고", "종목 코드를 입력하세요.")
@@ -593,9 +832,29 @@ pip install yfinance
             
         self.status_label.config(text=f"{symbol} 스마트 업데이트 중...")
         
-        # 증분 업데이트 실행
+        # 이전 요청이 진행 중이면 취소 - 마지막으로 요청한 종목만 화면에 반영
+        self.jobs.submit(
+            'analyze', self.prepare_smart_update, symbol,
+            on_success=self.on_smart_update_done,
+            on_error=lambda e: self.on_smart_update_failed(symbol, e),
+            with_token=True
+        )
+        
+    def prepare_smart_update(self, token, symbol):
+        """작업 스레드: 증분 업데이트 + 지표 계산 (Tk 위젯 접근 금지)"""
         result = self.download_incremental_data(symbol)
+        token.check()
+        
+        if result and 'data' in result:
+            # 공유 지표 캐시에 미리 계산 → 차트 생성 시 캐시 적중
+            self.technical_analysis.calculate_all_indicators(result['data'], symbol)
+            token.check()
+            
+        return symbol, result
         
+    def on_smart_update_done(self, outcome):
+        """Tk 스레드: 업데이트 결과 분석/표시"""
+        symbol, result = outcome
         if result and 'data' in result:
             # 바로 분석 실행
             self.analyze_stock(symbol, result['data'], result['filename'])
@@ -611,6 +870,11 @@ pip install yfinance
         else:
             self.status_label.config(text=f"{symbol} 업데이트 실패")
             
+    def on_smart_update_failed(self, symbol, error):
+        """업데이트 실패 처리"""
+        self.log_message(f"❌ {symbol} 업데이트 실패: {error}")
+        self.status_label.config(text=f"{symbol} 업데이트 실패")
+            
     def analyze_stock(self, symbol, data, file_path=None):
         """주식 분석 실행"""
         try:
@@ -639,19 +903,19 @@ pip install yfinance
         ax2 = fig.add_subplot(3, 1, 2)  # 거래량
         ax3 = fig.add_subplot(3, 1, 3)  # RSI
         
+        # 지표 (같은 데이터면 공유 캐시에서 재사용)
+        indicators = self.technical_analysis.calculate_all_indicators(data, symbol) or {}
+        
         # 가격 차트
         ax1.plot(data.index, data['Close'], 'b-', linewidth=2, label='종가')
         
         # 이동평균
-        if len(data) > 20:
-            ma20 = data['Close'].rolling(20).mean()
-            ax1.plot(data.index, ma20, 'orange', linewidth=1.5, label='MA20')
-        if len(data) > 50:
-            ma50 = data['Close'].rolling(50).mean()
-            ax1.plot(data.index, ma50, 'red', linewidth=1.5, label='MA50')
-        if len(data) > 200:
-            ma200 = data['Close'].rolling(200).mean()
-            ax1.plot(data.index, ma200, 'purple', linewidth=1.5, label='MA200')
+        if len(data) > 20 and 'SMA_20' in indicators:
+            ax1.plot(data.index, indicators['SMA_20'], 'orange', linewidth=1.5, label='MA20')
+        if len(data) > 50 and 'SMA_50' in indicators:
+            ax1.plot(data.index, indicators['SMA_50'], 'red', linewidth=1.5, label='MA50')
+        if len(data) > 200 and 'SMA_200' in indicators:
+            ax1.plot(data.index, indicators['SMA_200'], 'purple', linewidth=1.5, label='MA200')
             
         ax1.set_title(f'{symbol} - 가격 차트 ({len(data)}일 데이터)', fontsize=14, fontweight='bold')
         ax1.set_ylabel('가격 ($)')
@@ -661,9 +925,8 @@ pip install yfinance
         # 거래량
         colors = ['g' if c >= o else 'r' for c, o in zip(data['Close'], data['Open'])]
         ax2.bar(data.index, data['Volume'], color=colors, alpha=0.6)
-        if len(data) > 20:
-            vol_ma = data['Volume'].rolling(20).mean()
-            ax2.plot(data.index, vol_ma, 'purple', linewidth=1, label='거래량 MA20')
+        if len(data) > 20 and 'Volume_SMA' in indicators:
+            ax2.plot(data.index, indicators['Volume_SMA'], 'purple', linewidth=1, label='거래량 MA20')
             ax2.legend()
         ax2.set_title('거래량')
         ax2.set_ylabel('거래량')
@@ -671,16 +934,7 @@ pip install yfinance
         
         # RSI
         try:
-            close = data['Close']
-            delta = close.diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(14).mean()
-            avg_loss = loss.rolling(14).mean()
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+            rsi = indicators['RSI']
             
             ax3.plot(data.index, rsi, 'purple', linewidth=2, label='RSI(14)')
             ax3.axhline(70, color='r', linestyle='--', alpha=0.7, label='과매수(70)')
@@ -770,45 +1024,86 @@ pip install yfinance
         self.batch_update(all_symbols, "전체 종목")
         
     def batch_update(self, symbols, category_name):
-        """일괄 업데이트 실행"""
-        if not YFINANCE_AVAILABLE:
-            messagebox.showwarning("경고", "yfinance가 설치되지 않았습니다.")
+        """일괄 업데이트 실행 (제한된 동시 다운로드 + 속도 제한 + 재시도)"""
+        if not self.provider.is_available():
+            messagebox.showwarning("경고", f"{self.provider.describe()} 사용 불가 - 일괄 업데이트를 실행할 수 없습니다.")
             return
             
-        def update_thread():
-            total = len(symbols)
-            success_count = 0
-            updated_count = 0
-            
-            self.log_message(f"🚀 {category_name} 일괄 업데이트 시작 ({total}개)")
+        if self.batch_running:
+            messagebox.showinfo("정보", "일괄 업데이트가 이미 진행 중입니다.")
+            return
             
-            for i, symbol in enumerate(symbols):
-                self.status_label.config(text=f"{category_name} 업데이트 중... ({i+1}/{total}) {symbol}")
+        symbols = list(dict.fromkeys(symbols))  # 중복 제거 (순서 유지)
+        total = len(symbols)
+        limiter = TokenBucket(self.config['requests_per_second'])
+        progress = {'success': 0, 'updated': 0}
+        
+        prefetched = {}
+        
+        def update_symbol(symbol):
+            # 일괄 요청으로 받은 종목은 네트워크 없이 저장만
+            if symbol in prefetched:
+                return self.download_incremental_data(symbol, prefetched[symbol])
                 
-                result = self.download_incremental_data(symbol)
-                if result:
-                    success_count += 1
-                    if result['updated']:
-                        updated_count += 1
-                        
-                # API 제한 방지
-                if i < total - 1:
-                    time.sleep(0.3)
-                    
-            # 완료
-            self.log_message(f"🎉 {category_name} 일괄 업데이트 완료!")
-            self.log_message(f"   성공: {success_count}/{total}, 업데이트: {updated_count}")
+            def attempt():
+                limiter.acquire()
+                return self.download_incremental_data(symbol)
+                
+            def on_retry(attempt_no, delay, error):
+                self.log_message(f"🔁 {symbol} 재시도 {attempt_no}회 ({delay:.1f}초 후)")
+                
+            return retry_with_backoff(
+                attempt,
+                retries=self.config['download_retries'],
+                retry_on_result=lambda result: result is None,
+                on_retry=on_retry
+            )
             
-            self.status_label.config(text=f"{category_name} 업데이트 완료 ({updated_count}개 업데이트)")
+        def on_progress(symbol, result, error, done, total_count):
+            self.post_ui_event(self.on_batch_progress, category_name, symbol, result, error, done, total_count, progress)
             
-            # 파일 목록 새로고침
-            self.root.after(100, self.refresh_file_list)
+        def update_thread():
+            start_time = time.time()
+            if self.config.get('bulk_download', True):
+                try:
+                    prefetched.update(self.prefetch_bulk(symbols, limiter))
+                except Exception as e:
+                    self.log_message(f"⚠️ 일괄 요청 실패, 개별 다운로드로 진행: {e}")
+            run_concurrent_batch(symbols, update_symbol, self.config['batch_workers'], on_progress)
+            self.post_ui_event(self.on_batch_complete, category_name, total, progress, time.time() - start_time)
             
+        self.batch_running = True
+        self.log_message(f"🚀 {category_name} 일괄 업데이트 시작 ({total}개, 동시 {self.config['batch_workers']}개)")
+        self.status_label.config(text=f"{category_name} 업데이트 중... (0/{total})")
+        
         # 백그라운드 스레드로 실행
         thread = threading.Thread(target=update_thread)
         thread.daemon = True
         thread.start()
         
+    def on_batch_progress(self, category_name, symbol, result, error, done, total, progress):
+        """일괄 업데이트 진행 이벤트 (Tk 스레드)"""
+        if result:
+            progress['success'] += 1
+            if result['updated']:
+                progress['updated'] += 1
+        elif error:
+            self.log_message(f"❌ {symbol} 실패: {error}")
+            
+        self.status_label.config(text=f"{category_name} 업데이트 중... ({done}/{total}) {symbol}")
+        
+    def on_batch_complete(self, category_name, total, progress, elapsed):
+        """일괄 업데이트 완료 이벤트 (Tk 스레드)"""
+        self.batch_running = False
+        
+        self.log_message(f"🎉 {category_name} 일괄 업데이트 완료! ({elapsed:.1f}초)")
+        self.log_message(f"   성공: {progress['success']}/{total}, 업데이트: {progress['updated']}")
+        
+        self.status_label.config(text=f"{category_name} 업데이트 완료 ({progress['updated']}개 업데이트)")
+        
+        # 파일 목록 새로고침
+        self.refresh_file_list()
+        
     def refresh_file_list(self):
         """파일 목록 새로고침"""
         try:
@@ -820,9 +1115,18 @@ pip install yfinance
                 return
                 
             csv_files = list(data_folder.glob("*.csv"))
+            store_symbols = self.price_store.get_symbols() if self.price_store is not None else []
+            
+            # 저장소 종목 먼저 표시
+            for symbol in store_symbols:
+                info = self.price_store.get_info(symbol)
+                if info:
+                    mod_time = datetime.fromtimestamp(info['updated']).strftime("%m/%d %H:%M")
+                    self.file_listbox.insert(tk.END, f"{symbol:<8} 🗄️ {info['rows']:>5}일 {info['segments']:>2}seg {mod_time}")
             
             if not csv_files:
-                self.file_listbox.insert(tk.END, "📄 CSV 파일이 없습니다")
+                if not store_symbols:
+                    self.file_listbox.insert(tk.END, "📄 CSV 파일이 없습니다")
                 return
                 
             # 파일을 종목별로 그룹화
@@ -840,8 +1144,8 @@ pip install yfinance
                 except:
                     continue
                     
-            # 종목별로 정렬해서 표시
-            for symbol in sorted(file_groups.keys()):
+            # 종목별로 정렬해서 표시 (저장소로 이전된 종목 제외)
+            for symbol in sorted(set(file_groups.keys()) - set(store_symbols)):
                 files = file_groups[symbol]
                 # 날짜순 정렬 (최신이 먼저)
                 files.sort(key=lambda x: x[1], reverse=True)
@@ -917,6 +1221,14 @@ pip install yfinance
                         except:
                             pass
                             
+            # 저장소 세그먼트 압축
+            if self.price_store is not None:
+                for symbol in self.price_store.get_symbols():
+                    info = self.price_store.get_info(symbol)
+                    if info and info['segments'] > 1 and self.price_store.compact(symbol):
+                        deleted_count += info['segments'] - 1
+                        self.log_message(f"🗄️ {symbol}: 세그먼트 {info['segments']}개 → 1개 압축")
+                            
             if deleted_count > 0:
                 messagebox.showinfo("완료", f"{deleted_count}개의 오래된 파일을 정리했습니다.")
                 self.refresh_file_list()
@@ -943,6 +1255,8 @@ pip install yfinance
             self.root.mainloop()
         except Exception as e:
             messagebox.showerror("오류", f"애플리케이션 오류: {e}")
+        finally:
+            self.jobs.shutdown()
 
 def main():
     """메인 함수"""
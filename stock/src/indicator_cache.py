@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+지표 캐시 모듈
+(종목, 마지막 인덱스, 행 수, 내용 해시)를 키로 계산 결과를 LRU로 보관
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class IndicatorCache:
+    def __init__(self, max_entries=128):
+        """지표 캐시 초기화"""
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(data, symbol=None):
+        """데이터 지문 - (종목, 마지막 인덱스, 행 수, 내용 해시)"""
+        if data is None or data.empty:
+            return None
+
+        row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+        content_hash = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
+        columns = tuple(str(col) for col in data.columns)
+
+        return (symbol, str(data.index[-1]), len(data), columns, content_hash)
+
+    def get(self, key, namespace='indicators'):
+        """캐시 조회 (없으면 None)"""
+        if key is None:
+            return None
+
+        with self.lock:
+            entry_key = (namespace, key)
+            if entry_key in self.entries:
+                self.entries.move_to_end(entry_key)
+                self.hits += 1
+                return self.entries[entry_key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value, namespace='indicators'):
+        """캐시 저장 (용량 초과시 가장 오래 안 쓴 항목 제거)"""
+        if key is None or value is None:
+            return
+
+        with self.lock:
+            entry_key = (namespace, key)
+            self.entries[entry_key] = value
+            self.entries.move_to_end(entry_key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, data, compute, symbol=None, namespace='indicators'):
+        """캐시에 있으면 반환, 없으면 compute(data) 결과를 저장 후 반환"""
+        key = self.fingerprint(data, symbol)
+        value = self.get(key, namespace)
+        if value is not None:
+            return value
+
+        value = compute(data)
+        self.put(key, value, namespace)
+        return value
+
+    def invalidate(self, symbol=None):
+        """종목 캐시 삭제 (symbol이 None이면 전체)"""
+        with self.lock:
+            if symbol is None:
+                self.entries.clear()
+                return
+
+            for entry_key in [k for k in self.entries if k[1][0] == symbol]:
+                del self.entries[entry_key]
+
+    def get_stats(self):
+        """적중/실패 통계"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+# 프로그램 전체에서 공유하는 기본 캐시
+default_indicator_cache = IndicatorCache()
@@ -19,6 +19,11 @@ from datetime import datetime, timedelta
 import threading
 import queue
 
+try:
+    from .price_store import ColumnarPriceStore, default_store_path
+except ImportError:
+    from price_store import ColumnarPriceStore, default_store_path
+
 # yfinance 임포트 시도
 try:
     import yfinance as yf
@@ -34,6 +39,7 @@ class VStockWithDownloader:
         self.root = tk.Tk()
         self.setup_window()
         self.load_config()
+        self.price_store = ColumnarPriceStore(default_store_path(self.config['data_folder']))
         self.current_data = None
         self.download_queue = queue.Queue()
         self.create_widgets()
@@ -456,7 +462,7 @@ pip install yfinance
         thread.start()
         
     def load_stock_data(self, symbol):
-        """파일에서 주식 데이터 로드"""
+        """저장소 또는 파일에서 주식 데이터 로드"""
         try:
             data_folder = Path(self.config['data_folder'])
             
@@ -471,12 +477,18 @@ pip install yfinance
             for pattern in patterns:
                 files.extend(list(data_folder.glob(pattern)))
                 
-            if not files:
+            latest_file = max(files, key=lambda f: f.stat().st_mtime) if files else None
+            
+            # 증분 업데이트는 컬럼형 저장소에만 기록 - 저장소가 CSV보다 최신이면 저장소 사용
+            if self.price_store.has_symbol(symbol) and (
+                    latest_file is None or self.price_store.is_fresh(symbol, latest_file.stat().st_mtime)):
+                data = self.price_store.load(symbol)
+                if data is not None and not data.empty:
+                    return data
+                    
+            if latest_file is None:
                 return None
                 
-            # 최신 파일 선택
-            latest_file = max(files, key=lambda f: f.stat().st_mtime)
-            
             # 데이터 로드
             data = pd.read_csv(latest_file, index_col=0, parse_dates=True)
             
@@ -12,6 +12,129 @@ from pathlib import Path
 import requests
 import json
 
+# 제공자별 기본 주소 (테스트/재생 서버로 바꿀 수 있음)
+DEFAULT_BASE_URLS = {
+    'alpha_vantage': "https://www.alphavantage.co",
+    'polygon': "https://api.polygon.io",
+    'iex': "https://cloud.iexapis.com"
+}
+
+def build_alpha_vantage_request(base_url, symbol, api_key, outputsize="full"):
+    """Alpha Vantage 요청 (url, params)"""
+    url = f"{base_url}/query"
+    params = {
+        'function': 'TIME_SERIES_DAILY',
+        'symbol': symbol,
+        'outputsize': outputsize,
+        'apikey': api_key
+    }
+    return url, params
+
+def build_polygon_request(base_url, symbol, api_key, start_date=None, end_date=None):
+    """Polygon.io 요청 (url, params)"""
+    if not start_date:
+        start_date = (datetime.now() - timedelta(days=1095)).strftime('%Y-%m-%d')
+    if not end_date:
+        end_date = datetime.now().strftime('%Y-%m-%d')
+        
+    url = f"{base_url}/v2/aggs/ticker/{symbol}/range/1/day/{start_date}/{end_date}"
+    params = {
+        'adjusted': 'true',
+        'sort': 'asc',
+        'apikey': api_key
+    }
+    return url, params
+
+def build_iex_request(base_url, symbol, api_key, range_period="3y"):
+    """IEX Cloud 요청 (url, params)"""
+    url = f"{base_url}/stable/stock/{symbol}/chart/{range_period}"
+    params = {'token': api_key}
+    return url, params
+
+def parse_alpha_vantage(data, symbol):
+    """Alpha Vantage 응답 → 결과 딕셔너리 (데이터 없으면 None)"""
+    if 'Time Series (Daily)' not in data:
+        print(f"❌ Alpha Vantage: {symbol} 데이터 없음")
+        return None
+        
+    # 데이터 변환
+    time_series = data['Time Series (Daily)']
+    df_data = []
+    
+    for date, values in time_series.items():
+        df_data.append({
+            'Date': pd.to_datetime(date),
+            'Open': float(values['1. open']),
+            'High': float(values['2. high']),
+            'Low': float(values['3. low']),
+            'Close': float(values['4. close']),
+            'Volume': int(values['5. volume'])
+        })
+        
+    df = pd.DataFrame(df_data)
+    df.set_index('Date', inplace=True)
+    df.sort_index(inplace=True)
+    
+    return {
+        'data': df,
+        'info': data.get('Meta Data', {}),
+        'source': 'Alpha Vantage'
+    }
+
+def parse_polygon(data, symbol):
+    """Polygon.io 응답 → 결과 딕셔너리 (데이터 없으면 None)"""
+    if 'results' not in data:
+        print(f"❌ Polygon: {symbol} 데이터 없음")
+        return None
+        
+    # 데이터 변환
+    df_data = []
+    for item in data['results']:
+        df_data.append({
+            'Date': pd.to_datetime(item['t'], unit='ms'),
+            'Open': item['o'],
+            'High': item['h'],
+            'Low': item['l'],
+            'Close': item['c'],
+            'Volume': item['v']
+        })
+        
+    df = pd.DataFrame(df_data)
+    df.set_index('Date', inplace=True)
+    
+    return {
+        'data': df,
+        'info': {'symbol': symbol, 'count': data.get('resultsCount', 0)},
+        'source': 'Polygon.io'
+    }
+
+def parse_iex(data, symbol):
+    """IEX Cloud 응답 → 결과 딕셔너리 (데이터 없으면 None)"""
+    if not data:
+        print(f"❌ IEX Cloud: {symbol} 데이터 없음")
+        return None
+        
+    # 데이터 변환
+    df_data = []
+    for item in data:
+        df_data.append({
+            'Date': pd.to_datetime(item['date']),
+            'Open': item['open'],
+            'High': item['high'],
+            'Low': item['low'],
+            'Close': item['close'],
+            'Volume': item['volume']
+        })
+        
+    df = pd.DataFrame(df_data)
+    df.set_index('Date', inplace=True)
+    
+    return {
+        'data': df,
+        'info': {'symbol': symbol, 'count': len(data)},
+        'source': 'IEX Cloud'
+    }
+
 class MultiSourceDownloader:
     def __init__(self, data_folder="data"):
         """다중 소스 데이터 다운로더"""
@@ -25,6 +148,8 @@ class MultiSourceDownloader:
             'polygon': None,        # https://polygon.io/
             'iex': None            # https://iexcloud.io/
         }
+        self.base_urls = dict(DEFAULT_BASE_URLS)
+        self.session = requests.Session()  # 연결 재사용
         
     def set_api_key(self, provider, key):
         """API 키 설정"""
@@ -65,44 +190,11 @@ class MultiSourceDownloader:
             return None
             
         try:
-            url = "https://www.alphavantage.co/query"
-            params = {
-                'function': 'TIME_SERIES_DAILY',
-                'symbol': symbol,
-                'outputsize': outputsize,
-                'apikey': self.api_keys['alpha_vantage']
-            }
-            
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if 'Time Series (Daily)' not in data:
-                print(f"❌ Alpha Vantage: {symbol} 데이터 없음")
-                return None
-                
-            # 데이터 변환
-            time_series = data['Time Series (Daily)']
-            df_data = []
-            
-            for date, values in time_series.items():
-                df_data.append({
-                    'Date': pd.to_datetime(date),
-                    'Open': float(values['1. open']),
-                    'High': float(values['2. high']),
-                    'Low': float(values['3. low']),
-                    'Close': float(values['4. close']),
-                    'Volume': int(values['5. volume'])
-                })
-                
-            df = pd.DataFrame(df_data)
-            df.set_index('Date', inplace=True)
-            df.sort_index(inplace=True)
-            
-            return {
-                'data': df,
-                'info': data.get('Meta Data', {}),
-                'source': 'Alpha Vantage'
-            }
+            url, params = build_alpha_vantage_request(
+                self.base_urls['alpha_vantage'], symbol, self.api_keys['alpha_vantage'], outputsize
+            )
+            response = self.session.get(url, params=params, timeout=30)
+            return parse_alpha_vantage(response.json(), symbol)
             
         except Exception as e:
             print(f"❌ Alpha Vantage 오류: {e}")
@@ -115,45 +207,11 @@ class MultiSourceDownloader:
             return None
             
         try:
-            if not start_date:
-                start_date = (datetime.now() - timedelta(days=1095)).strftime('%Y-%m-%d')
-            if not end_date:
-                end_date = datetime.now().strftime('%Y-%m-%d')
-                
-            url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/day/{start_date}/{end_date}"
-            params = {
-                'adjusted': 'true',
-                'sort': 'asc',
-                'apikey': self.api_keys['polygon']
-            }
-            
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if 'results' not in data:
-                print(f"❌ Polygon: {symbol} 데이터 없음")
-                return None
-                
-            # 데이터 변환
-            df_data = []
-            for item in data['results']:
-                df_data.append({
-                    'Date': pd.to_datetime(item['t'], unit='ms'),
-                    'Open': item['o'],
-                    'High': item['h'],
-                    'Low': item['l'],
-                    'Close': item['c'],
-                    'Volume': item['v']
-                })
-                
-            df = pd.DataFrame(df_data)
-            df.set_index('Date', inplace=True)
-            
-            return {
-                'data': df,
-                'info': {'symbol': symbol, 'count': data.get('resultsCount', 0)},
-                'source': 'Polygon.io'
-            }
+            url, params = build_polygon_request(
+                self.base_urls['polygon'], symbol, self.api_keys['polygon'], start_date, end_date
+            )
+            response = self.session.get(url, params=params, timeout=30)
+            return parse_polygon(response.json(), symbol)
             
         except Exception as e:
             print(f"❌ Polygon 오류: {e}")
@@ -166,38 +224,11 @@ class MultiSourceDownloader:
             return None
             
         try:
-            url = f"https://cloud.iexapis.com/stable/stock/{symbol}/chart/{range_period}"
-            params = {
-                'token': self.api_keys['iex']
-            }
-            
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if not data:
-                print(f"❌ IEX Cloud: {symbol} 데이터 없음")
-                return None
-                
-            # 데이터 변환
-            df_data = []
-            for item in data:
-                df_data.append({
-                    'Date': pd.to_datetime(item['date']),
-                    'Open': item['open'],
-                    'High': item['high'],
-                    'Low': item['low'],
-                    'Close': item['close'],
-                    'Volume': item['volume']
-                })
-                
-            df = pd.DataFrame(df_data)
-            df.set_index('Date', inplace=True)
-            
-            return {
-                'data': df,
-                'info': {'symbol': symbol, 'count': len(data)},
-                'source': 'IEX Cloud'
-            }
+            url, params = build_iex_request(
+                self.base_urls['iex'], symbol, self.api_keys['iex'], range_period
+            )
+            response = self.session.get(url, params=params, timeout=30)
+            return parse_iex(response.json(), symbol)
             
         except Exception as e:
             print(f"❌ IEX Cloud 오류: {e}")
@@ -234,6 +265,27 @@ class MultiSourceDownloader:
         print(f"❌ 모든 소스에서 {symbol} 다운로드 실패")
         return None
         
+    def download_many_async(self, symbols, mode='race', prefer_source='yfinance', concurrency=16):
+        """여러 종목을 비동기로 다운로드 (aiohttp 연결 풀, race 모드는 선호+백업 소스 동시 요청)"""
+        try:
+            try:
+                from .async_multi_source import download_many_sync, AIOHTTP_AVAILABLE
+            except ImportError:
+                from async_multi_source import download_many_sync, AIOHTTP_AVAILABLE
+        except ImportError as e:
+            print(f"❌ 비동기 다운로더 사용 불가: {e}")
+            AIOHTTP_AVAILABLE = False
+            
+        # aiohttp가 없으면 순차 다운로드로 대체
+        if not AIOHTTP_AVAILABLE:
+            print("⚠️ aiohttp 사용 불가 - 순차 다운로드로 진행")
+            return {symbol: self.download_with_fallback(symbol, prefer_source) for symbol in symbols}
+            
+        return download_many_sync(
+            symbols, self.api_keys, self.base_urls, mode=mode,
+            prefer_source=prefer_source, concurrency=concurrency
+        )
+        
     def save_data(self, symbol, result):
         """데이터 저장"""
         if not result or 'data' not in result:
@@ -10,56 +10,223 @@ from datetime import datetime, timedelta
 import json
 from pathlib import Path
 
+try:
+    from .portfolio_store import SQLitePortfolioStore
+except ImportError:
+    from portfolio_store import SQLitePortfolioStore
+
 class PortfolioManager:
-    def __init__(self):
-        """포트폴리오 관리자 초기화"""
+    def __init__(self, compact_every=1000, backend="json"):
+        """
+        포트폴리오 관리자 초기화
+        
+        Args:
+            compact_every (int): 저널에 이 개수만큼 쌓이면 스냅샷으로 압축
+            backend (str): 'json' (스냅샷 + 저널) 또는 'sqlite' (config/portfolio.db)
+        """
         self.holdings = {}
         self.transactions = []
-        self.portfolio_file = Path("config/portfolio.json")
+        self.portfolio_file = Path("config/portfolio.json")  # 스냅샷
+        self.journal_file = self.portfolio_file.with_name("portfolio_journal.jsonl")  # 추가 전용 저널
+        self.compact_every = compact_every
+        self.sequence = 0  # 마지막 거래 번호 (스냅샷/저널 중복 재생 방지)
+        self.journal_entries = 0
+        self.store = None
+        if backend == "sqlite":
+            self.store = SQLitePortfolioStore(self.portfolio_file.with_suffix(".db"))
         self.load_portfolio()
         
     def load_portfolio(self):
-        """포트폴리오 데이터 로드"""
+        """포트폴리오 데이터 로드 - 스냅샷 + 이후 저널 재생 (sqlite는 DB에서)"""
+        if self.store is not None:
+            self._load_from_store()
+            return
+            
+        self._load_json()
+        
+    def _load_json(self):
+        """JSON 스냅샷 로드 후 저널 재생"""
         try:
             if self.portfolio_file.exists():
                 with open(self.portfolio_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     self.holdings = data.get('holdings', {})
                     self.transactions = data.get('transactions', [])
+                    self.sequence = data.get('sequence', len(self.transactions))
         except Exception as e:
             print(f"포트폴리오 로드 실패: {e}")
             
+        self._replay_journal()
+        
+    def _replay_journal(self):
+        """스냅샷 이후 저널 항목 적용 (쓰다 끊긴 마지막 줄은 잘라냄)"""
+        self.journal_entries = 0
+        if not self.journal_file.exists():
+            return
+            
+        try:
+            with open(self.journal_file, 'rb+') as f:
+                content = f.read()
+                if content and not content.endswith(b"\n"):
+                    content = content[:content.rfind(b"\n") + 1]
+                    f.truncate(len(content))
+                    print("저널 끝의 불완전한 기록 제거")
+                    
+            for line_no, line in enumerate(content.decode('utf-8').splitlines(), start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"저널 {line_no}행 손상 - 건너뜀")
+                    continue
+                    
+                self.journal_entries += 1
+                if entry['seq'] <= self.sequence:
+                    continue  # 이미 스냅샷에 포함됨
+                self.transactions.append(entry['transaction'])
+                self._update_holdings(entry['transaction'])
+                self.sequence = entry['seq']
+        except Exception as e:
+            print(f"저널 재생 실패: {e}")
+            
+    def _load_from_store(self):
+        """DB에서 로드 (DB가 비어 있으면 JSON 스냅샷 + 저널을 한 번 가져오기)"""
+        try:
+            if self.store.count_transactions() == 0 and (
+                    self.portfolio_file.exists() or self.journal_file.exists()):
+                self._migrate_json()
+                
+            self.holdings = self.store.load_holdings()
+            self.transactions = self.store.load_transactions()
+            self.sequence = len(self.transactions)
+        except Exception as e:
+            print(f"포트폴리오 DB 로드 실패: {e}")
+            
+    def _migrate_json(self):
+        """JSON 백엔드 상태(압축 전 저널 포함)를 DB로 옮김 - JSON 파일은 그대로 둠"""
+        self._load_json()
+        if not self.transactions and not self.holdings:
+            return
+            
+        self.store.replace_all(self.holdings, self.transactions)
+        migrated = self.store.count_transactions()
+        if migrated != len(self.transactions):
+            raise RuntimeError(f"DB 이전 거래 수 불일치: {migrated}/{len(self.transactions)}")
+        print(f"JSON 포트폴리오를 DB로 가져옴: {self.portfolio_file} (저널 {self.journal_entries}건 포함)")
+        
     def save_portfolio(self):
-        """포트폴리오 데이터 저장"""
+        """포트폴리오 스냅샷 저장 (원자적 교체) 후 저널 비우기 - sqlite는 DB 전체 교체"""
+        if self.store is not None:
+            try:
+                self.store.replace_all(self.holdings, self.transactions)
+            except Exception as e:
+                print(f"포트폴리오 DB 저장 실패: {e}")
+            return
+            
         try:
             self.portfolio_file.parent.mkdir(exist_ok=True)
             data = {
                 'holdings': self.holdings,
                 'transactions': self.transactions,
+                'sequence': self.sequence,
                 'last_updated': datetime.now().isoformat()
             }
-            with open(self.portfolio_file, 'w', encoding='utf-8') as f:
+            tmp_file = self.portfolio_file.with_name(self.portfolio_file.name + ".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            tmp_file.replace(self.portfolio_file)
+            
+            # 스냅샷에 모두 포함됐으므로 저널 정리
+            self.journal_file.unlink(missing_ok=True)
+            self.journal_entries = 0
         except Exception as e:
             print(f"포트폴리오 저장 실패: {e}")
             
-    def add_transaction(self, symbol, action, quantity, price, date=None):
-        """거래 기록 추가"""
+    def compact(self):
+        """저널을 스냅샷으로 압축"""
+        self.save_portfolio()
+        
+    def _append_journal(self, transactions):
+        """저널에 거래 추가 (파일 끝에 한 줄씩), 일정 개수마다 압축"""
+        try:
+            self.journal_file.parent.mkdir(exist_ok=True)
+            start = self.sequence - len(transactions) + 1
+            lines = [
+                json.dumps({'seq': start + i, 'transaction': transaction}, ensure_ascii=False) + "\n"
+                for i, transaction in enumerate(transactions)
+            ]
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+            self.journal_entries += len(transactions)
+        except Exception as e:
+            print(f"저널 기록 실패: {e}")
+            
+        if self.journal_entries >= self.compact_every:
+            self.compact()
+            
+    def _make_transaction(self, symbol, action, quantity, price, date=None):
+        """거래 기록 생성"""
         if date is None:
             date = datetime.now().isoformat()
+        elif not isinstance(date, str):
+            date = pd.Timestamp(date).isoformat()  # 엑셀/데이터프레임 날짜
             
-        transaction = {
-            'symbol': symbol.upper(),
-            'action': action.upper(),  # BUY, SELL
+        return {
+            'symbol': str(symbol).upper(),
+            'action': str(action).upper(),  # BUY, SELL
             'quantity': float(quantity),
             'price': float(price),
             'date': date,
             'total': float(quantity) * float(price)
         }
         
+    def add_transaction(self, symbol, action, quantity, price, date=None):
+        """거래 기록 추가"""
+        transaction = self._make_transaction(symbol, action, quantity, price, date)
+        
         self.transactions.append(transaction)
         self._update_holdings(transaction)
-        self.save_portfolio()
+        self.sequence += 1
+        self._persist([transaction])
+        
+    def add_transactions(self, rows, journal=True):
+        """
+        거래 여러 건 한 번에 추가 (저널 쓰기 1회)
+        
+        Args:
+            rows: 거래 딕셔너리(symbol, action, quantity, price, date) 목록
+            journal (bool): False면 메모리에만 반영 (호출자가 save_portfolio로 저장)
+            
+        Returns:
+            int: 추가된 거래 수
+        """
+        transactions = [
+            self._make_transaction(row['symbol'], row['action'], row['quantity'],
+                                   row['price'], row.get('date'))
+            for row in rows
+        ]
+        
+        for transaction in transactions:
+            self.transactions.append(transaction)
+            self._update_holdings(transaction)
+        self.sequence += len(transactions)
+        
+        if journal and transactions:
+            self._persist(transactions)
+        return len(transactions)
+        
+    def _persist(self, transactions):
+        """새 거래 저장 - sqlite는 거래 + 바뀐 보유 종목을 한 번에, json은 저널에 추가"""
+        if self.store is None:
+            self._append_journal(transactions)
+            return
+            
+        try:
+            changed = {t['symbol']: self.holdings[t['symbol']] for t in transactions}
+            self.store.add_transactions(transactions, changed)
+        except Exception as e:
+            print(f"포트폴리오 DB 기록 실패: {e}")
         
     def _update_holdings(self, transaction):
         """보유 종목 업데이트"""
@@ -141,7 +308,11 @@ class PortfolioManager:
         return summary
         
     def get_transaction_history(self, symbol=None, days=None):
-        """거래 내역 조회"""
+        """거래 내역 조회 (sqlite는 인덱스로 SQL 조회)"""
+        if self.store is not None:
+            start = datetime.now() - timedelta(days=days) if days else None
+            return self.store.query_transactions(symbol=symbol, start=start)
+            
         transactions = self.transactions.copy()
         
         # 심볼 필터
@@ -159,32 +330,56 @@ class PortfolioManager:
         
         return transactions
         
-    def calculate_portfolio_metrics(self, price_data=None):
-        """포트폴리오 성과 지표 계산"""
-        if not price_data:
+    def get_symbol_pnl(self, current_prices=None, start=None, end=None):
+        """종목별 매수/매도 합계와 실현/평가 손익 (SQL 집계, json은 메모리 DB 사용)"""
+        if self.store is not None:
+            return self.store.symbol_pnl(current_prices, start, end)
+            
+        store = SQLitePortfolioStore(":memory:")
+        try:
+            store.replace_all(self.holdings, self.transactions)
+            return store.symbol_pnl(current_prices, start, end)
+        finally:
+            store.close()
+        
+    def calculate_portfolio_values(self, price_data):
+        """
+        날짜별 포트폴리오 가치 - 보유수량 벡터 × 가격 행렬 (결측 가격은 0으로 처리)
+        
+        Args:
+            price_data (pd.DataFrame): 날짜 × 종목 종가 행렬
+            
+        Returns:
+            pd.Series: 날짜별 평가금액 (보유 종목이 가격 행렬에 없으면 None)
+        """
+        quantities = pd.Series({
+            symbol: holding['quantity'] for symbol, holding in self.holdings.items()
+            if holding['quantity'] > 0 and symbol in price_data.columns
+        }, dtype=float)
+        
+        if quantities.empty:
+            return None
+            
+        prices = price_data[quantities.index].to_numpy(dtype=float)
+        values = np.nan_to_num(prices, nan=0.0) @ quantities.to_numpy()
+        return pd.Series(values, index=price_data.index)
+        
+    def calculate_portfolio_metrics(self, price_data=None, rolling_window=None):
+        """
+        포트폴리오 성과 지표 계산
+        
+        Args:
+            price_data (pd.DataFrame): 날짜 × 종목 종가 행렬
+            rolling_window: 이동 지표 기간 (정수: rolling, 'expanding': 누적, None: 계산 안 함)
+        """
+        if price_data is None or price_data.empty:
             return None
             
         try:
-            # 포트폴리오 가치 시계열 계산
-            portfolio_values = []
-            dates = []
-            
-            # 각 날짜별 포트폴리오 가치 계산
-            for date in price_data.index:
-                daily_value = 0
-                for symbol, holding in self.holdings.items():
-                    if holding['quantity'] > 0 and symbol in price_data.columns:
-                        price = price_data.loc[date, symbol]
-                        if not pd.isna(price):
-                            daily_value += holding['quantity'] * price
-                            
-                portfolio_values.append(daily_value)
-                dates.append(date)
-                
-            if not portfolio_values:
+            portfolio_series = self.calculate_portfolio_values(price_data)
+            if portfolio_series is None:
                 return None
                 
-            portfolio_series = pd.Series(portfolio_values, index=dates)
             returns = portfolio_series.pct_change().dropna()
             
             # 성과 지표 계산
@@ -200,21 +395,240 @@ class PortfolioManager:
                 'trough_value': portfolio_series.min()
             }
             
+            if rolling_window is not None:
+                metrics['rolling'] = self.calculate_rolling_metrics(portfolio_series, rolling_window)
+                
             return metrics
             
         except Exception as e:
             print(f"포트폴리오 지표 계산 오류: {e}")
             return None
             
+    def calculate_rolling_metrics(self, portfolio_series, window=63):
+        """
+        이동/누적 성과 지표 (수익률, 변동성, 샤프, 낙폭)
+        
+        Args:
+            portfolio_series (pd.Series): 날짜별 평가금액
+            window: 기간 (정수) 또는 'expanding' (시작일부터 누적)
+            
+        Returns:
+            pd.DataFrame: 날짜별 rolling_return, rolling_volatility, rolling_sharpe (연환산 %),
+                          drawdown (고점 대비 %), max_drawdown (기간 내 최대 낙폭 %)
+        """
+        returns = portfolio_series.pct_change()
+        
+        if window == 'expanding':
+            mean = returns.expanding(min_periods=2).mean()
+            std = returns.expanding(min_periods=2).std()
+            peak = portfolio_series.cummax()
+        else:
+            mean = returns.rolling(window, min_periods=2).mean()
+            std = returns.rolling(window, min_periods=2).std()
+            peak = portfolio_series.rolling(window, min_periods=1).max()
+            
+        drawdown = (portfolio_series / peak - 1) * 100
+        if window == 'expanding':
+            max_drawdown = drawdown.cummin().abs()
+        else:
+            max_drawdown = self._rolling_max_drawdown(portfolio_series, window)
+            
+        annual_std = std * np.sqrt(252)
+        return pd.DataFrame({
+            'rolling_return': mean * 252 * 100,
+            'rolling_volatility': annual_std * 100,
+            'rolling_sharpe': (mean * 252 / annual_std).mask(annual_std == 0, 0.0),
+            'drawdown': drawdown,
+            'max_drawdown': max_drawdown
+        }, index=portfolio_series.index)
+            
+    def _rolling_max_drawdown(self, series, window):
+        """창마다 창 안의 고점 기준 최대 낙폭 (%) - 처음 window-1일은 시작일부터"""
+        values = series.to_numpy(dtype=float)
+        if len(values) == 0:
+            return pd.Series(dtype=float, index=series.index)
+            
+        # 앞쪽을 첫 값으로 채우면 처음 창들도 시작일부터의 낙폭과 같음
+        padded = np.concatenate([np.full(window - 1, values[0]), values])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            drawdowns = windows / np.fmax.accumulate(windows, axis=1) - 1
+        drawdowns = np.where(np.isnan(drawdowns), np.inf, drawdowns).min(axis=1)
+        return pd.Series(np.where(np.isinf(drawdowns), np.nan, np.abs(drawdowns) * 100), index=series.index)
+        
     def _calculate_max_drawdown(self, series):
         """최대 낙폭 계산"""
         try:
-            peak = series.expanding().max()
+            peak = series.cummax()
             drawdown = (series - peak) / peak
             return abs(drawdown.min()) * 100
         except:
             return 0
+
+    def build_position_matrix(self, price_data, transactions=None):
+        """
+        거래 내역을 날짜 × 종목 보유수량 행렬로 재생 (거래일 순 누적합)
+        
+        거래 시각은 그날(또는 다음) 가격 행에 반영, 가격 기간 이후 거래는 제외
+        보유량보다 많은 매도는 _update_holdings와 같이 무시
+        
+        Returns:
+            tuple: (보유수량 행렬, 거래 데이터프레임 - 'row', 'signed_quantity', 'flow' 포함)
+        """
+        transactions = self.transactions if transactions is None else transactions
+        trades = pd.DataFrame(transactions, columns=['symbol', 'action', 'quantity', 'price', 'date'])
+        trades = trades[trades['symbol'].isin(price_data.columns)]
+        
+        index = price_data.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)
+        
+        trade_dates = pd.to_datetime(trades['date'], format='ISO8601', utc=True).dt.tz_localize(None)
+        trades = trades.assign(row=index.searchsorted(trade_dates.dt.normalize().to_numpy(), side='left'))
+        trades = trades[trades['row'] < len(index)]
+        
+        sign = np.where(trades['action'].str.upper() == 'SELL', -1.0, 1.0)
+        trades = trades.assign(
+            order=np.arange(len(trades)),
+            signed_quantity=sign * trades['quantity'].astype(float)
+        ).sort_values(['row', 'order'], kind='stable')
+        
+        trades = self._drop_oversells(trades)
+        trades = trades[trades['signed_quantity'] != 0]
+        trades = trades.assign(flow=trades['signed_quantity'] * trades['price'].astype(float))
+        
+        daily = trades.groupby(['row', 'symbol'])['signed_quantity'].sum().unstack(fill_value=0.0)
+        changes = np.zeros((len(index), len(price_data.columns)))
+        column_positions = price_data.columns.get_indexer(daily.columns)
+        changes[np.ix_(daily.index.to_numpy(), column_positions)] = daily.to_numpy()
+        
+        positions = pd.DataFrame(np.cumsum(changes, axis=0), index=price_data.index, columns=price_data.columns)
+        return positions, trades
+        
+    def _drop_oversells(self, trades):
+        """보유량을 넘는 매도를 0으로 (음수 누적이 생긴 종목만 순차 재생)"""
+        running = trades.groupby('symbol')['signed_quantity'].cumsum()
+        oversold = trades.loc[running < -1e-9, 'symbol'].unique()
+        if len(oversold) == 0:
+            return trades
             
+        quantities = trades['signed_quantity'].to_numpy(copy=True)
+        symbols = trades['symbol'].to_numpy()
+        for symbol in oversold:
+            held = 0.0
+            for i in np.flatnonzero(symbols == symbol):
+                if held + quantities[i] < -1e-9:
+                    print(f"경고: {symbol} 보유량({held})보다 많은 매도 무시")
+                    quantities[i] = 0.0
+                else:
+                    held += quantities[i]
+                    
+        return trades.assign(signed_quantity=quantities)
+        
+    def calculate_transaction_performance(self, price_data, transactions=None):
+        """
+        거래 내역 기반 성과 - 날짜별 평가금액, 현금흐름, 시간가중(TWR)/금액가중(MWR) 수익률
+        
+        Args:
+            price_data (pd.DataFrame): 날짜 × 종목 종가 행렬
+            transactions (list): 거래 기록 (기본값: self.transactions)
+        
+        Returns:
+            dict: positions, nav, cash_flows, daily_returns, cumulative_return (시계열)
+                  twr, twr_annualized, mwr (%), total_invested, total_withdrawn, final_value
+        """
+        if price_data is None or price_data.empty:
+            return None
+        
+        try:
+            positions, trades = self.build_position_matrix(price_data, transactions)
+            if trades.empty:
+                return None
+            
+            prices = price_data.ffill().to_numpy(dtype=float)
+            nav = pd.Series(np.nansum(positions.to_numpy() * prices, axis=1), index=price_data.index)
+            
+            # 매수 = 투입(+), 매도 = 회수(-)
+            flows = np.zeros(len(nav))
+            np.add.at(flows, trades['row'].to_numpy(), trades['flow'].to_numpy())
+            cash_flows = pd.Series(flows, index=nav.index)
+            
+            # 시간가중: 당일 현금흐름은 종가 시점에 발생한 것으로 처리
+            previous = nav.shift(1).to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                daily = np.where(previous > 0, (nav.to_numpy() - flows) / previous - 1, 0.0)
+            daily_returns = pd.Series(daily, index=nav.index)
+            cumulative = (1 + daily_returns).cumprod() - 1
+            
+            start_row = int(trades['row'].min())
+            years = self._year_fraction(nav.index[start_row], nav.index[-1])
+            twr = cumulative.iloc[-1]
+            
+            return {
+                'positions': positions,
+                'nav': nav,
+                'cash_flows': cash_flows,
+                'daily_returns': daily_returns,
+                'cumulative_return': cumulative * 100,
+                'twr': twr * 100,
+                'twr_annualized': ((1 + twr) ** (1 / years) - 1) * 100 if years > 0 and twr > -1 else None,
+                'mwr': self._calculate_mwr(nav, flows),
+                'total_invested': flows[flows > 0].sum(),
+                'total_withdrawn': -flows[flows < 0].sum(),
+                'final_value': nav.iloc[-1]
+            }
+        
+        except Exception as e:
+            print(f"거래 기반 성과 계산 오류: {e}")
+            return None
+        
+    @staticmethod
+    def _year_fraction(start, end):
+        return (pd.Timestamp(end) - pd.Timestamp(start)).total_seconds() / (365.25 * 86400)
+        
+    def _calculate_mwr(self, nav, flows, tolerance=1e-10, max_iterations=100):
+        """금액가중 수익률 (XIRR, 연환산 %) - 투입은 음수, 최종 평가금액은 양수 현금흐름"""
+        rows = np.flatnonzero(flows)
+        if len(rows) == 0:
+            return None
+        
+        amounts = np.append(-flows[rows], nav.iloc[-1])
+        elapsed = nav.index[np.append(rows, len(nav) - 1)] - nav.index[rows[0]]
+        times = np.asarray(elapsed.total_seconds()) / (365.25 * 86400)
+        if times[-1] <= 0 or not (amounts > 0).any() or not (amounts < 0).any():
+            return None
+        
+        def npv(rate):
+            return np.sum(amounts / (1 + rate) ** times)
+        
+        # 뉴턴법, 실패하면 이분법
+        rate = 0.1
+        for _ in range(max_iterations):
+            discount = (1 + rate) ** times
+            value = np.sum(amounts / discount)
+            derivative = np.sum(-times * amounts / (discount * (1 + rate)))
+            if derivative == 0 or not np.isfinite(value):
+                break
+            next_rate = rate - value / derivative
+            if next_rate <= -1:
+                break
+            if abs(next_rate - rate) < tolerance:
+                return next_rate * 100
+            rate = next_rate
+        
+        low, high = -0.9999, 10.0
+        if npv(low) * npv(high) > 0:
+            return None
+        for _ in range(200):
+            mid = (low + high) / 2
+            if npv(low) * npv(mid) <= 0:
+                high = mid
+            else:
+                low = mid
+            if high - low < tolerance:
+                break
+        return (low + high) / 2 * 100
+        
     def get_sector_allocation(self):
         """섹터별 할당 (모의 데이터)"""
         # 실제로는 외부 API에서 섹터 정보를 가져와야 함
@@ -303,15 +717,9 @@ class PortfolioManager:
             self.holdings = {}
             self.transactions = []
             
-            # 거래 내역 복원
-            for _, row in transactions_df.iterrows():
-                self.add_transaction(
-                    symbol=row['symbol'],
-                    action=row['action'],
-                    quantity=row['quantity'],
-                    price=row['price'],
-                    date=row['date']
-                )
+            # 거래 내역 복원 (메모리에 모두 반영 후 스냅샷 1회 저장)
+            self.add_transactions(transactions_df.to_dict('records'), journal=False)
+            self.save_portfolio()
                 
             print(f"포트폴리오 데이터 가져오기 완료: {filename}")
             return True
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 포트폴리오 저장소
+거래 내역/보유 종목을 내장 DB에 저장하고 (종목, 날짜) 인덱스로 조회
+JSON 스냅샷은 가져오기/내보내기 용도로 유지
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+TRANSACTION_COLUMNS = ['symbol', 'action', 'quantity', 'price', 'date', 'total']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    action TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    date TEXT NOT NULL,
+    total REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_symbol_date ON transactions (symbol, date);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+
+CREATE TABLE IF NOT EXISTS holdings (
+    symbol TEXT PRIMARY KEY,
+    quantity REAL NOT NULL,
+    avg_price REAL NOT NULL,
+    total_cost REAL NOT NULL
+);
+"""
+
+
+class SQLitePortfolioStore:
+    def __init__(self, db_path="config/portfolio.db"):
+        """
+        SQLite 포트폴리오 저장소
+
+        Args:
+            db_path (str): DB 파일 경로 (':memory:' 가능)
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- 쓰기 ----------
+
+    def add_transactions(self, transactions, holdings=None):
+        """
+        거래 일괄 추가 (+ 변경된 보유 종목 갱신) - 하나의 DB 트랜잭션
+
+        Args:
+            transactions (list): 거래 딕셔너리 목록
+            holdings (dict): {종목: 보유 정보} 갱신할 보유 종목 (선택)
+        """
+        rows = [tuple(t[col] for col in TRANSACTION_COLUMNS) for t in transactions]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO transactions (symbol, action, quantity, price, date, total) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            if holdings:
+                self._upsert_holdings(holdings)
+
+    def _upsert_holdings(self, holdings):
+        self.conn.executemany(
+            "INSERT INTO holdings (symbol, quantity, avg_price, total_cost) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(symbol) DO UPDATE SET quantity = excluded.quantity, "
+            "avg_price = excluded.avg_price, total_cost = excluded.total_cost",
+            [(symbol, h['quantity'], h['avg_price'], h['total_cost']) for symbol, h in holdings.items()]
+        )
+
+    def replace_all(self, holdings, transactions):
+        """전체 교체 (가져오기/초기화)"""
+        rows = [tuple(t[col] for col in TRANSACTION_COLUMNS) for t in transactions]
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM transactions")
+            self.conn.execute("DELETE FROM holdings")
+            self.conn.executemany(
+                "INSERT INTO transactions (symbol, action, quantity, price, date, total) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._upsert_holdings(holdings)
+
+    # ---------- 읽기 ----------
+
+    def load_holdings(self):
+        """보유 종목 {종목: {'quantity', 'avg_price', 'total_cost'}}"""
+        with self.lock:
+            rows = self.conn.execute("SELECT symbol, quantity, avg_price, total_cost FROM holdings").fetchall()
+        return {row['symbol']: {'quantity': row['quantity'], 'avg_price': row['avg_price'],
+                                'total_cost': row['total_cost']} for row in rows}
+
+    def load_transactions(self):
+        """전체 거래 (입력 순서)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT symbol, action, quantity, price, date, total FROM transactions ORDER BY id"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_transactions(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def query_transactions(self, symbol=None, start=None, end=None, limit=None, newest_first=True):
+        """
+        조건별 거래 조회 (SQL에서 필터/정렬)
+
+        Args:
+            symbol (str): 종목 (None이면 전체)
+            start/end: 기간 (ISO 문자열 또는 datetime, end는 포함하지 않음)
+            limit (int): 최대 건수
+
+        Returns:
+            list: 거래 딕셔너리 목록
+        """
+        conditions, params = [], []
+        if symbol:
+            conditions.append("symbol = ?")
+            params.append(symbol.upper())
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            conditions.append("date < ?")
+            params.append(_iso(end))
+
+        sql = "SELECT symbol, action, quantity, price, date, total FROM transactions"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY date DESC, id DESC" if newest_first else " ORDER BY date, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def symbol_pnl(self, current_prices=None, start=None, end=None):
+        """
+        종목별 손익 (SQL 집계)
+
+        실현손익 = 매도금액 - 매도수량 × 평균 매수가 (기간 내 거래 기준)
+        평가손익 = 보유수량 × 현재가 - 보유원가 (현재가가 없으면 평균단가 사용)
+
+        Returns:
+            list: 종목별 딕셔너리 (매수/매도 수량·금액, 실현/평가 손익)
+        """
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            conditions.append("date < ?")
+            params.append(_iso(end))
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+
+        sql = f"""
+            SELECT t.symbol,
+                   t.bought, t.buy_amount, t.sold, t.sell_amount, t.trades,
+                   COALESCE(h.quantity, 0) AS quantity,
+                   COALESCE(h.avg_price, 0) AS avg_price,
+                   COALESCE(h.total_cost, 0) AS total_cost
+            FROM (
+                SELECT symbol,
+                       SUM(CASE WHEN action = 'BUY' THEN quantity ELSE 0 END) AS bought,
+                       SUM(CASE WHEN action = 'BUY' THEN total ELSE 0 END) AS buy_amount,
+                       SUM(CASE WHEN action = 'SELL' THEN quantity ELSE 0 END) AS sold,
+                       SUM(CASE WHEN action = 'SELL' THEN total ELSE 0 END) AS sell_amount,
+                       COUNT(*) AS trades
+                FROM transactions {where}
+                GROUP BY symbol
+            ) t
+            LEFT JOIN holdings h ON h.symbol = t.symbol
+            ORDER BY t.symbol
+        """
+        with self.lock:
+            rows = [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+        current_prices = current_prices or {}
+        for row in rows:
+            avg_buy = row['buy_amount'] / row['bought'] if row['bought'] > 0 else 0
+            row['realized_pnl'] = row['sell_amount'] - row['sold'] * avg_buy
+            price = current_prices.get(row['symbol'], row['avg_price'])
+            row['current_value'] = row['quantity'] * price
+            row['unrealized_pnl'] = row['current_value'] - row['total_cost']
+        return rows
+
+    def daily_flows(self, start=None, end=None):
+        """일자별 매수/매도 금액 합계 [(날짜, 매수금액, 매도금액, 건수)]"""
+        conditions, params = [], []
+        if start is not None:
+            conditions.append("date >= ?")
+            params.append(_iso(start))
+        if end is not None:
+            conditions.append("date < ?")
+            params.append(_iso(end))
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+
+        sql = f"""
+            SELECT substr(date, 1, 10) AS day,
+                   SUM(CASE WHEN action = 'BUY' THEN total ELSE 0 END) AS buy_amount,
+                   SUM(CASE WHEN action = 'SELL' THEN total ELSE 0 END) AS sell_amount,
+                   COUNT(*) AS trades
+            FROM transactions {where}
+            GROUP BY day ORDER BY day
+        """
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    # ---------- JSON 가져오기/내보내기 ----------
+
+    def import_json(self, json_path):
+        """JSON 스냅샷(portfolio.json) 가져오기 → 거래 수"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        transactions = data.get('transactions', [])
+        self.replace_all(data.get('holdings', {}), transactions)
+        return len(transactions)
+
+    def export_json(self, json_path):
+        """JSON 스냅샷으로 내보내기"""
+        data = {
+            'holdings': self.load_holdings(),
+            'transactions': self.load_transactions(),
+            'last_updated': datetime.now().isoformat()
+        }
+        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return len(data['transactions'])
+
+
+def _iso(value):
+    return value if isinstance(value, str) else value.isoformat()
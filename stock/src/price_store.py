@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+컬럼형 가격 저장소 모듈
+종목별 폴더에 컬럼마다 .npy 세그먼트를 추가 저장하고, 날짜 범위 인덱스와 메모리 맵으로 읽기
+
+구조:
+    store/
+      AAPL/
+        index.json          # 세그먼트 목록 (시작/끝 날짜, 행 수)
+        seg_000001/
+          Date.npy          # int64 (UTC 나노초)
+          Open.npy ...      # float64 / int64
+"""
+
+import json
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+
+class ColumnarPriceStore:
+    INDEX_FILE = "index.json"
+    DATE_COLUMN = "Date"
+    VERSION = 1
+
+    def __init__(self, root, max_segments=64):
+        """
+        가격 저장소 초기화
+
+        Args:
+            root (str): 저장소 루트 폴더 (없으면 첫 쓰기 때 생성)
+            max_segments (int): 세그먼트가 이보다 많아지면 자동 압축
+        """
+        self.root = Path(root)
+        self.max_segments = max_segments
+
+    # ---------- 인덱스 ----------
+
+    def symbol_dir(self, symbol):
+        return self.root / symbol.upper()
+
+    def read_index(self, symbol):
+        """종목 인덱스 로드 (없으면 None)"""
+        index_path = self.symbol_dir(symbol) / self.INDEX_FILE
+        if not index_path.exists():
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"❌ 저장소 인덱스 로드 실패 {symbol}: {e}")
+            return None
+
+    def _write_index(self, symbol, index):
+        """인덱스 저장 (임시 파일에 쓴 뒤 교체 - 세그먼트보다 항상 나중에 기록)"""
+        index['updated'] = time.time()
+        index_path = self.symbol_dir(symbol) / self.INDEX_FILE
+        tmp_path = index_path.with_name(index_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(index_path)
+
+    def has_symbol(self, symbol):
+        index = self.read_index(symbol)
+        return bool(index and index['segments'])
+
+    def get_symbols(self):
+        """저장된 종목 목록"""
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir()
+                      if (path / self.INDEX_FILE).exists())
+
+    def get_info(self, symbol):
+        """종목 저장 정보 (행 수, 날짜 범위, 세그먼트 수, 갱신 시각)"""
+        index = self.read_index(symbol)
+        if not index or not index['segments']:
+            return None
+
+        segments = index['segments']
+        return {
+            'symbol': index['symbol'],
+            'rows': sum(seg['rows'] for seg in segments),
+            'start_date': self._to_timestamp(segments[0]['start'], index.get('tz')),
+            'end_date': self._to_timestamp(segments[-1]['end'], index.get('tz')),
+            'segments': len(segments),
+            'columns': list(index['columns']),
+            'updated': index.get('updated', 0)
+        }
+
+    def last_date(self, symbol):
+        info = self.get_info(symbol)
+        return info['end_date'] if info else None
+
+    # ---------- 변환 ----------
+
+    @staticmethod
+    def _to_timestamp(value, tz):
+        stamp = pd.Timestamp(value, unit='ns', tz='UTC')
+        return stamp.tz_convert(tz) if tz else stamp.tz_localize(None)
+
+    def _prepare_frame(self, data):
+        """저장용 정규화 - DatetimeIndex 정렬, 중복 제거, 숫자 컬럼만"""
+        if not isinstance(data.index, pd.DatetimeIndex):
+            data = data.copy()
+            data.index = pd.to_datetime(data.index)
+
+        data = data[~data.index.isna()]
+        data = data[~data.index.duplicated(keep='last')].sort_index()
+        numeric = data.select_dtypes(include=[np.number, 'bool'])
+
+        tz = str(data.index.tz) if data.index.tz is not None else None
+        return numeric, tz
+
+    @staticmethod
+    def _date_values(index):
+        """DatetimeIndex → UTC 나노초 int64"""
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        return index.as_unit('ns').asi8.astype(np.int64)
+
+    @staticmethod
+    def _column_values(series):
+        """컬럼 타입 결정 - 정수형은 int64, 나머지는 float64"""
+        values = series.to_numpy()
+        if values.dtype.kind in 'iub':
+            return values.astype(np.int64)
+        values = values.astype(np.float64)
+        # 거래량처럼 결측 없는 정수값 컬럼은 int64로 보관
+        if series.name == 'Volume' and np.isfinite(values).all() and (values == np.round(values)).all():
+            return values.astype(np.int64)
+        return values
+
+    # ---------- 쓰기 ----------
+
+    def _write_segment(self, symbol, index, data):
+        """세그먼트 하나 기록 후 메타데이터 반환 (인덱스는 호출자가 갱신)"""
+        symbol_dir = self.symbol_dir(symbol)
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+
+        index['next_segment'] = index.get('next_segment', 0) + 1
+        name = f"seg_{index['next_segment']:06d}"
+        tmp_dir = symbol_dir / (name + ".tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        dates = self._date_values(data.index)
+        np.save(tmp_dir / f"{self.DATE_COLUMN}.npy", dates)
+        for col in index['columns']:
+            if col in data.columns:
+                values = self._column_values(data[col])
+            else:
+                values = np.full(len(data), np.nan)
+            np.save(tmp_dir / f"{col}.npy", values)
+
+        tmp_dir.rename(symbol_dir / name)
+
+        return {
+            'name': name,
+            'start': int(dates[0]),
+            'end': int(dates[-1]),
+            'rows': int(len(dates))
+        }
+
+    def _remove_segments(self, symbol, names):
+        for name in names:
+            shutil.rmtree(self.symbol_dir(symbol) / name, ignore_errors=True)
+
+    def write(self, symbol, data):
+        """전체 이력 저장 (기존 세그먼트 교체)"""
+        try:
+            data, tz = self._prepare_frame(data)
+            if data.empty:
+                return False
+
+            old_index = self.read_index(symbol)
+            index = {
+                'version': self.VERSION,
+                'symbol': symbol.upper(),
+                'tz': tz,
+                'columns': list(data.columns),
+                'segments': [],
+                'next_segment': old_index.get('next_segment', 0) if old_index else 0
+            }
+            index['segments'].append(self._write_segment(symbol, index, data))
+            self._write_index(symbol, index)
+
+            if old_index:
+                self._remove_segments(symbol, [seg['name'] for seg in old_index['segments']])
+            return True
+
+        except Exception as e:
+            print(f"❌ 저장소 쓰기 실패 {symbol}: {e}")
+            return False
+
+    def append(self, symbol, data):
+        """
+        새 행만 세그먼트로 추가
+
+        기존 마지막 날짜 이전 행이 섞여 있으면 겹치는 꼬리 세그먼트만 다시 써서 병합
+        (keep='last'), 과거 몇 년치 행은 건드리지 않음
+
+        Returns:
+            int: 추가(또는 교체)된 행 수, 실패시 -1
+        """
+        try:
+            index = self.read_index(symbol)
+            if not index or not index['segments']:
+                return len(data) if self.write(symbol, data) else -1
+
+            data, tz = self._prepare_frame(data)
+            if data.empty:
+                return 0
+
+            if tz != index.get('tz') and tz is not None and index.get('tz') is not None:
+                data.index = data.index.tz_convert(index['tz'])
+            elif (tz is None) != (index.get('tz') is None):
+                # 타임존 유무가 다르면 저장된 쪽에 맞춤 (거래소 현지 시각 기준 - 일봉 자정이 그대로 유지)
+                if index.get('tz'):
+                    data.index = data.index.tz_localize(index['tz'])
+                else:
+                    data.index = data.index.tz_localize(None)
+
+            # 새 컬럼은 인덱스에 추가 (이전 세그먼트에서는 NaN으로 읽힘)
+            for col in data.columns:
+                if col not in index['columns']:
+                    index['columns'].append(col)
+
+            first_new = int(self._date_values(data.index)[0])
+            overlapping = [seg for seg in index['segments'] if seg['end'] >= first_new]
+            removed = []
+
+            if overlapping:
+                # 겹치는 구간 이후 행만 새 세그먼트로 병합하고, 기존 세그먼트는 행 수만 줄임
+                old_tail = self._read_segments(symbol, index, overlapping, since=first_new)
+                data = pd.concat([old_tail, data])
+                data = data[~data.index.duplicated(keep='last')].sort_index()
+
+                for seg in overlapping:
+                    dates = self._load_array(symbol, seg, self.DATE_COLUMN)
+                    keep_rows = int(np.searchsorted(dates, first_new, 'left'))
+                    if keep_rows == 0:
+                        removed.append(seg['name'])
+                    else:
+                        seg['rows'] = keep_rows
+                        seg['end'] = int(dates[keep_rows - 1])
+                index['segments'] = [seg for seg in index['segments'] if seg['name'] not in removed]
+
+            index['segments'].append(self._write_segment(symbol, index, data))
+            self._write_index(symbol, index)
+            self._remove_segments(symbol, removed)
+
+            if len(index['segments']) > self.max_segments:
+                self.compact(symbol)
+
+            return len(data)
+
+        except Exception as e:
+            print(f"❌ 저장소 추가 실패 {symbol}: {e}")
+            return -1
+
+    def compact(self, symbol):
+        """모든 세그먼트를 하나로 병합"""
+        try:
+            index = self.read_index(symbol)
+            if not index or len(index['segments']) <= 1:
+                return True
+
+            data = self._read_segments(symbol, index, index['segments'])
+            old_segments = index['segments']
+            index['segments'] = [self._write_segment(symbol, index, data)]
+            self._write_index(symbol, index)
+            self._remove_segments(symbol, [seg['name'] for seg in old_segments])
+            return True
+
+        except Exception as e:
+            print(f"❌ 저장소 압축 실패 {symbol}: {e}")
+            return False
+
+    def delete(self, symbol):
+        shutil.rmtree(self.symbol_dir(symbol), ignore_errors=True)
+
+    # ---------- 읽기 ----------
+
+    def read_columns(self, symbol, columns=None, start=None, end=None):
+        """
+        컬럼별 배열 반환 (세그먼트가 하나면 복사 없는 읽기 전용 memmap)
+
+        Returns:
+            dict: {'Date': int64 UTC 나노초, 'Open': ..., ...} 또는 None
+        """
+        index = self.read_index(symbol)
+        if not index or not index['segments']:
+            return None
+
+        columns = list(columns) if columns else list(index['columns'])
+        segments = self._select_segments(index, start, end)
+        if not segments:
+            return {col: np.empty(0) for col in [self.DATE_COLUMN] + columns}
+
+        arrays = {}
+        for col in [self.DATE_COLUMN] + columns:
+            parts = [self._load_array(symbol, seg, col) for seg in segments]
+            arrays[col] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+        if start is not None or end is not None:
+            dates = arrays[self.DATE_COLUMN]
+            lo = 0 if start is None else np.searchsorted(dates, self._bound(start, index), 'left')
+            hi = len(dates) if end is None else np.searchsorted(dates, self._bound(end, index), 'right')
+            arrays = {col: values[lo:hi] for col, values in arrays.items()}
+
+        return arrays
+
+    def load(self, symbol, start=None, end=None, columns=None):
+        """종목 데이터를 DataFrame으로 로드 (파싱 없음)"""
+        try:
+            index = self.read_index(symbol)
+            arrays = self.read_columns(symbol, columns, start, end)
+            if arrays is None:
+                return None
+
+            dates = pd.DatetimeIndex(arrays.pop(self.DATE_COLUMN).astype('datetime64[ns]'), name='Date')
+            if index.get('tz'):
+                dates = dates.tz_localize('UTC').tz_convert(index['tz'])
+
+            return pd.DataFrame(arrays, index=dates)
+
+        except Exception as e:
+            print(f"❌ 저장소 로드 실패 {symbol}: {e}")
+            return None
+
+    def _read_segments(self, symbol, index, segments, since=None):
+        """세그먼트들을 DataFrame으로 읽기 (since 이후 행만 선택 가능)"""
+        frames = []
+        for seg in segments:
+            raw_dates = self._load_array(symbol, seg, self.DATE_COLUMN)
+            lo = 0 if since is None else int(np.searchsorted(raw_dates, since, 'left'))
+            dates = pd.DatetimeIndex(np.asarray(raw_dates[lo:]).astype('datetime64[ns]'))
+            if index.get('tz'):
+                dates = dates.tz_localize('UTC').tz_convert(index['tz'])
+            frames.append(pd.DataFrame(
+                {col: np.array(self._load_array(symbol, seg, col)[lo:]) for col in index['columns']},
+                index=dates
+            ))
+        data = pd.concat(frames)
+        data.index.name = 'Date'
+        return data
+
+    def _load_array(self, symbol, segment, column):
+        path = self.symbol_dir(symbol) / segment['name'] / f"{column}.npy"
+        if not path.exists():
+            return np.full(segment['rows'], np.nan)
+        # 추가 병합으로 잘린 세그먼트는 인덱스의 행 수까지만 유효
+        return np.load(path, mmap_mode='r')[:segment['rows']]
+
+    def _select_segments(self, index, start, end):
+        """날짜 범위 인덱스로 필요한 세그먼트만 선택"""
+        lo = None if start is None else self._bound(start, index)
+        hi = None if end is None else self._bound(end, index)
+        return [seg for seg in index['segments']
+                if (lo is None or seg['end'] >= lo) and (hi is None or seg['start'] <= hi)]
+
+    @staticmethod
+    def _bound(value, index):
+        stamp = pd.Timestamp(value)
+        if stamp.tzinfo is None and index.get('tz'):
+            stamp = stamp.tz_localize(index['tz'])
+        if stamp.tzinfo is not None:
+            stamp = stamp.tz_convert('UTC').tz_localize(None)
+        return stamp.as_unit('ns').value
+
+    # ---------- 이전 ----------
+
+    def import_dataframe(self, symbol, data, source_mtime=None):
+        """CSV 등에서 읽은 데이터를 저장소로 이전 (원본 수정 시각 기록)"""
+        if not self.write(symbol, data):
+            return False
+
+        if source_mtime is not None:
+            index = self.read_index(symbol)
+            index['source_mtime'] = source_mtime
+            self._write_index(symbol, index)
+        return True
+
+    def is_fresh(self, symbol, source_mtime):
+        """저장소가 원본 파일보다 최신인지"""
+        index = self.read_index(symbol)
+        if not index or not index['segments']:
+            return False
+        return max(index.get('updated', 0), index.get('source_mtime', 0)) >= source_mtime
+
+
+def default_store_path(data_folder):
+    """데이터 폴더 안의 기본 저장소 경로"""
+    return Path(data_folder) / "store"
@@ -12,6 +12,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import time
 
+try:
+    from .download_utils import bulk_download
+except ImportError:
+    from download_utils import bulk_download
+
 class PythonStockDownloader:
     def __init__(self, data_folder="data"):
         """파이썬 주식 데이터 다운로더"""
@@ -31,27 +36,42 @@ class PythonStockDownloader:
                 print(f"❌ {symbol}: 데이터 없음")
                 return None
                 
-            # 컬럼명 정리
-            data.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            data.index.name = 'Date'
-            
-            # 파일 저장
-            date_key = datetime.now().strftime("%y%m%d")
-            filename = self.data_folder / f"{symbol}_{date_key}.csv"
-            data.to_csv(filename)
-            
-            print(f"✅ {symbol}: {len(data)}일 데이터 저장 → {filename}")
-            return data
+            return self.save_stock_data(symbol, data)
             
         except Exception as e:
             print(f"❌ {symbol} 다운로드 실패: {e}")
             return None
             
-    def download_multiple_stocks(self, symbols, period="3y", delay=1):
-        """다중 종목 다운로드"""
+    def save_stock_data(self, symbol, data):
+        """받은 데이터 정리 후 CSV 저장"""
+        # 컬럼명 정리
+        data = data[['Open', 'High', 'Low', 'Close', 'Volume']]
+        data.index.name = 'Date'
+        
+        # 파일 저장
+        date_key = datetime.now().strftime("%y%m%d")
+        filename = self.data_folder / f"{symbol}_{date_key}.csv"
+        data.to_csv(filename)
+        
+        print(f"✅ {symbol}: {len(data)}일 데이터 저장 → {filename}")
+        return data
+            
+    def download_multiple_stocks(self, symbols, period="3y", delay=1, bulk=True):
+        """다중 종목 다운로드 (bulk=True면 다종목 요청 한 번 후 누락 종목만 개별 다운로드)"""
         results = {}
+        total = len(symbols)
+        
+        print(f"🚀 {total}개 종목 다운로드 시작...")
         
-        print(f"🚀 {len(symbols)}개 종목 다운로드 시작...")
+        if bulk:
+            frames = bulk_download(symbols, period=period)
+            for symbol, data in frames.items():
+                try:
+                    results[symbol] = self.save_stock_data(symbol, data)
+                except Exception as e:
+                    print(f"❌ {symbol} 저장 실패: {e}")
+            print(f"📦 일괄 요청: {len(results)}/{len(symbols)}개 종목 수신")
+            symbols = [symbol for symbol in symbols if symbol not in results]
         
         for i, symbol in enumerate(symbols, 1):
             print(f"[{i}/{len(symbols)}] ", end="")
@@ -64,7 +84,7 @@ class PythonStockDownloader:
             if delay > 0 and i < len(symbols):
                 time.sleep(delay)
                 
-        print(f"\n🎉 다운로드 완료! 성공: {len(results)}/{len(symbols)}")
+        print(f"\n🎉 다운로드 완료! 성공: {len(results)}/{total}")
         return results
         
     def download_with_info(self, symbol):
@@ -10,8 +10,9 @@ from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
+import matplotlib.dates as mdates
 import os
 import json
 from pathlib import Path
@@ -25,6 +26,11 @@ except ImportError:
     print("⚠️ R 데이터 로더를 찾을 수 없습니다. 기본 모드로 실행합니다.")
     RIntegratedDataLoader = None
 
+try:
+    from src.chart_lod import LODController, to_x
+except ImportError:
+    from chart_lod import LODController, to_x
+
 class VStockAdvancedR:
     def __init__(self):
         """R 연동 주식 분석기 초기화"""
@@ -404,19 +410,30 @@ class VStockAdvancedR:
         # Figure 생성
         fig = Figure(figsize=(12, 8), facecolor='white')
         
-        # 서브플롯 생성
+        # 서브플롯 생성 (x축 공유 - 툴바 확대/이동이 세 차트에 함께 적용)
         ax1 = fig.add_subplot(3, 1, 1)  # 가격 차트
-        ax2 = fig.add_subplot(3, 1, 2)  # 거래량
-        ax3 = fig.add_subplot(3, 1, 3)  # RSI
+        ax2 = fig.add_subplot(3, 1, 2, sharex=ax1)  # 거래량
+        ax3 = fig.add_subplot(3, 1, 3, sharex=ax1)  # RSI
+        
+        # 봉이 픽셀보다 많으면 보이는 구간만 축약 (확대하면 다시 세분화)
+        x = to_x(data.index)
+        self.chart_lod = LODController([ax1, ax2, ax3])
         
         # 가격 차트 (캔들스틱 스타일)
-        self.plot_candlestick_style(ax1, data, symbol)
+        self.plot_candlestick_style(ax1, x, data, symbol)
         
         # 거래량 차트
-        self.plot_volume_chart(ax2, data)
+        self.plot_volume_chart(ax2, x, data)
         
         # RSI 차트
-        self.plot_rsi_chart(ax3, data)
+        self.plot_rsi_chart(ax3, x, data)
+        
+        self.chart_lod.show_all()
+        for ax in (ax1, ax2, ax3):
+            if ax.get_legend_handles_labels()[0]:
+                ax.legend()
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator())
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
         
         # 레이아웃 조정
         fig.tight_layout()
@@ -425,45 +442,45 @@ class VStockAdvancedR:
         canvas = FigureCanvasTkAgg(fig, self.left_panel)
         canvas.draw()
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.chart_lod.connect_canvas(canvas)
         
         # 네비게이션 툴바
         toolbar_frame = ttk.Frame(self.left_panel)
         toolbar_frame.pack(fill=tk.X)
-        # NavigationToolbar2Tk는 여기서는 생략 (선택사항)
+        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
+        toolbar.update()
         
-    def plot_candlestick_style(self, ax, data, symbol):
+    def plot_candlestick_style(self, ax, x, data, symbol):
         """캔들스틱 스타일 가격 차트"""
         # 종가 라인
-        ax.plot(data.index, data['Close'], color='#2563eb', linewidth=2, label='종가')
+        self.chart_lod.add_line(ax, x, data['Close'], color='#2563eb', linewidth=2, label='종가')
         
         # 이동평균선들
         if len(data) > 20:
             ma20 = data['Close'].rolling(window=20).mean()
-            ax.plot(data.index, ma20, color='#f59e0b', linewidth=1.5, 
-                   label='MA20', alpha=0.8)
+            self.chart_lod.add_line(ax, x, ma20, color='#f59e0b', linewidth=1.5, 
+                                    label='MA20', alpha=0.8)
             
         if len(data) > 50:
             ma50 = data['Close'].rolling(window=50).mean()
-            ax.plot(data.index, ma50, color='#ef4444', linewidth=1.5, 
-                   label='MA50', alpha=0.8)
+            self.chart_lod.add_line(ax, x, ma50, color='#ef4444', linewidth=1.5, 
+                                    label='MA50', alpha=0.8)
             
         # 고가/저가 영역 표시
-        ax.fill_between(data.index, data['High'], data['Low'], 
-                       alpha=0.1, color='gray', label='고가-저가 범위')
+        self.chart_lod.add_fill(ax, x, data['High'], data['Low'], 
+                                alpha=0.1, color='gray', label='고가-저가 범위')
         
         ax.set_title(f'{symbol} - 가격 차트 (R quantmod 데이터)', 
                     fontsize=14, fontweight='bold')
         ax.set_ylabel('가격 ($)', fontsize=12)
         ax.grid(True, alpha=0.3)
-        ax.legend()
         
-    def plot_volume_chart(self, ax, data):
+    def plot_volume_chart(self, ax, x, data):
         """거래량 차트"""
         # 가격 변동에 따른 색상
-        colors = ['#16a34a' if close >= open_price else '#ef4444' 
-                 for close, open_price in zip(data['Close'], data['Open'])]
+        colors = np.where(data['Close'] >= data['Open'], '#16a34a', '#ef4444')
         
-        ax.bar(data.index, data['Volume'], color=colors, alpha=0.6, width=1)
+        self.chart_lod.add_bars(ax, x, data['Volume'], colors, alpha=0.6)
         ax.set_title('거래량', fontsize=12)
         ax.set_ylabel('거래량', fontsize=10)
         ax.grid(True, alpha=0.3)
@@ -471,11 +488,10 @@ class VStockAdvancedR:
         # 거래량 이동평균
         if len(data) > 20:
             vol_ma = data['Volume'].rolling(window=20).mean()
-            ax.plot(data.index, vol_ma, color='purple', linewidth=1, 
-                   label='거래량 MA20', alpha=0.8)
-            ax.legend()
+            self.chart_lod.add_line(ax, x, vol_ma, color='purple', linewidth=1, 
+                                    label='거래량 MA20', alpha=0.8)
             
-    def plot_rsi_chart(self, ax, data):
+    def plot_rsi_chart(self, ax, x, data):
         """RSI 차트"""
         try:
             # 간단한 RSI 계산
@@ -492,7 +508,7 @@ class VStockAdvancedR:
             rsi = 100 - (100 / (1 + rs))
             
             # RSI 플롯
-            ax.plot(data.index, rsi, color='#8b5cf6', linewidth=2, label='RSI(14)')
+            self.chart_lod.add_line(ax, x, rsi, color='#8b5cf6', linewidth=2, label='RSI(14)')
             
             # 과매수/과매도 라인
             ax.axhline(y=70, color='#ef4444', linestyle='--', alpha=0.7, label='과매수')
@@ -500,14 +516,13 @@ class VStockAdvancedR:
             ax.axhline(y=50, color='#64748b', linestyle='-', alpha=0.5)
             
             # 음영
-            ax.fill_between(data.index, 70, 100, alpha=0.1, color='red')
-            ax.fill_between(data.index, 0, 30, alpha=0.1, color='green')
+            ax.axhspan(70, 100, alpha=0.1, color='red')
+            ax.axhspan(0, 30, alpha=0.1, color='green')
             
             ax.set_title('RSI (Relative Strength Index)', fontsize=12)
             ax.set_ylabel('RSI', fontsize=10)
             ax.set_ylim(0, 100)
             ax.grid(True, alpha=0.3)
-            ax.legend()
             
         except Exception as e:
             ax.text(0.5, 0.5, f'RSI 계산 오류: {e}', 
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔁 시세 재생 서버
+기록된 CSV 또는 합성 OHLCV(create_sample_data)를 로컬 HTTP로 제공
+지연/오류율을 설정해 다운로더 처리량을 네트워크 없이 재현 가능하게 측정
+
+엔드포인트:
+    /history/<종목>?start=&end=&period=      (data_providers.ReplayProvider)
+    /bulk?symbols=A,B&start=&end=&period=
+    /query?function=TIME_SERIES_DAILY&symbol= (Alpha Vantage 형식)
+    /v2/aggs/ticker/<종목>/range/1/day/<시작>/<끝> (Polygon 형식)
+    /stable/stock/<종목>/chart/<기간>          (IEX Cloud 형식)
+    /health
+
+MultiSourceDownloader는 base_urls를 서버 주소로 바꾸면 그대로 사용 가능
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pandas as pd
+
+try:
+    from .create_sample_data import generate_sample_stock_data
+    from .download_utils import PRICE_COLUMNS
+except ImportError:
+    from create_sample_data import generate_sample_stock_data
+    from download_utils import PRICE_COLUMNS
+
+PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+PERIOD_UNITS = {'d': 'days', 'wk': 'weeks', 'mo': 'months', 'y': 'years'}
+
+
+def period_start(period, end):
+    """'3y', '6mo', '5d' 같은 기간 → 시작일 ('max'나 해석 불가면 None)"""
+    match = PERIOD_PATTERN.match(period or '')
+    if not match:
+        return None
+    amount, unit = int(match.group(1)), match.group(2)
+    return end - pd.DateOffset(**{PERIOD_UNITS[unit]: amount})
+
+
+class ReplayDataSource:
+    def __init__(self, data_folder=None, days=1095):
+        """
+        재생 데이터 소스
+
+        Args:
+            data_folder (str): 기록된 CSV 폴더 ({종목}.csv 또는 {종목}_*.csv), 없으면 합성 데이터만
+            days (int): 합성 데이터 기간 (일)
+        """
+        self.data_folder = Path(data_folder) if data_folder else None
+        self.days = days
+        self.frames = {}
+        self.lock = threading.Lock()
+
+    def _load_recorded(self, symbol):
+        if self.data_folder is None or not self.data_folder.exists():
+            return None
+
+        candidates = [self.data_folder / f"{symbol}.csv"]
+        candidates += sorted(self.data_folder.glob(f"{symbol}_*.csv"), reverse=True)
+        for path in candidates:
+            if path.exists():
+                data = pd.read_csv(path, index_col=0, parse_dates=True)
+                data.index = pd.to_datetime(data.index, utc=True).tz_localize(None)
+                return data[[col for col in PRICE_COLUMNS if col in data.columns]]
+        return None
+
+    def frame(self, symbol):
+        """종목 전체 데이터 (기록 우선, 없으면 종목별 고정 시드로 합성)"""
+        with self.lock:
+            if symbol not in self.frames:
+                data = self._load_recorded(symbol)
+                if data is None:
+                    seed = zlib.crc32(symbol.encode('utf-8'))
+                    data = generate_sample_stock_data(symbol, days=self.days, seed=seed)
+                data.index = pd.DatetimeIndex(data.index).normalize()
+                data.index.name = 'Date'
+                self.frames[symbol] = data.sort_index()
+            return self.frames[symbol]
+
+    def select(self, symbol, start=None, end=None, period=None):
+        """기간 선택 (end는 포함하지 않음 - yfinance와 동일)"""
+        data = self.frame(symbol)
+        if start is None and period:
+            start = period_start(period, data.index.max() + pd.Timedelta(days=1))
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        return data
+
+
+def frame_payload(symbol, data):
+    """데이터프레임 → {'symbol', 'columns', 'rows'}"""
+    rows = data.reset_index()
+    rows['Date'] = rows['Date'].dt.strftime('%Y-%m-%d')
+    return {
+        'symbol': symbol,
+        'columns': list(rows.columns),
+        'rows': rows.values.tolist()
+    }
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """재생 서버 요청 처리"""
+
+    def log_message(self, format, *args):
+        pass  # 측정 중 콘솔 출력 방지
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server.replay
+        parsed = urlparse(self.path)
+        path = unquote(parsed.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        status = server.inject_fault()
+        if status is not None:
+            self._send_json({'error': 'injected fault'}, status)
+            return
+
+        try:
+            payload = self.route(server.source, path, query)
+        except Exception as e:
+            server.record('errors')
+            self._send_json({'error': str(e)}, 500)
+            return
+
+        if payload is None:
+            self._send_json({'error': f'unknown path {path}'}, 404)
+        else:
+            self._send_json(payload)
+
+    def route(self, source, path, query):
+        parts = [part for part in path.split('/') if part]
+        start, end, period = query.get('start'), query.get('end'), query.get('period')
+
+        if path == '/health':
+            return {'status': 'ok'}
+
+        if len(parts) == 2 and parts[0] == 'history':
+            symbol = parts[1]
+            return frame_payload(symbol, source.select(symbol, start, end, period))
+
+        if parts == ['bulk']:
+            symbols = [s for s in query.get('symbols', '').split(',') if s]
+            return {'frames': {s: frame_payload(s, source.select(s, start, end, period)) for s in symbols}}
+
+        if parts == ['query']:
+            return self.alpha_vantage(source, query)
+
+        if len(parts) == 9 and parts[:3] == ['v2', 'aggs', 'ticker']:
+            symbol, start, end = parts[3], parts[7], parts[8]
+            data = source.select(symbol, start, pd.Timestamp(end) + pd.Timedelta(days=1))
+            results = [{
+                't': int(date.value // 10**6),
+                'o': row.Open, 'h': row.High, 'l': row.Low, 'c': row.Close, 'v': int(row.Volume)
+            } for date, row in zip(data.index, data.itertuples())]
+            return {'status': 'OK', 'ticker': symbol, 'resultsCount': len(results), 'results': results}
+
+        if len(parts) == 5 and parts[:2] == ['stable', 'stock'] and parts[3] == 'chart':
+            data = source.select(parts[2], period=parts[4])
+            return [{
+                'date': date.strftime('%Y-%m-%d'),
+                'open': row.Open, 'high': row.High, 'low': row.Low, 'close': row.Close,
+                'volume': int(row.Volume)
+            } for date, row in zip(data.index, data.itertuples())]
+
+        return None
+
+    def alpha_vantage(self, source, query):
+        symbol = query.get('symbol', '')
+        period = None if query.get('outputsize') == 'full' else '5mo'  # compact ≈ 100거래일
+        data = source.select(symbol, period=period)
+        series = {
+            date.strftime('%Y-%m-%d'): {
+                '1. open': str(row.Open), '2. high': str(row.High), '3. low': str(row.Low),
+                '4. close': str(row.Close), '5. volume': str(int(row.Volume))
+            } for date, row in zip(data.index, data.itertuples())
+        }
+        return {
+            'Meta Data': {'2. Symbol': symbol, '5. Output Size': query.get('outputsize', 'compact')},
+            'Time Series (Daily)': series
+        }
+
+
+class ReplayServer:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, seed=0, data_folder=None, days=1095):
+        """
+        시세 재생 서버
+
+        Args:
+            port (int): 0이면 빈 포트 자동 선택
+            latency (float): 응답마다 기본 지연 (초)
+            jitter (float): 추가 지연 최대값 (초, 균등 분포)
+            error_rate (float): 오류 응답 비율 (0~1)
+            error_status (int): 주입할 HTTP 상태 코드
+            seed (int): 지연/오류 난수 시드 (같은 시드 → 같은 순서의 지연/오류)
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.source = ReplayDataSource(data_folder, days)
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'injected_errors': 0}
+
+        self.httpd = None
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def record(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def inject_fault(self):
+        """요청마다 지연 적용, 오류를 주입할 차례면 상태 코드 반환"""
+        with self.lock:
+            self.stats['requests'] += 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self.random.random() < self.error_rate
+            if fail:
+                self.stats['injected_errors'] += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        return self.error_status if fail else None
+
+    def start(self):
+        """백그라운드 스레드로 서버 시작"""
+        if self.httpd is not None:
+            return self
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), ReplayRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.replay = self
+        self.port = self.httpd.server_address[1]
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        if self.httpd is None:
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+        self.httpd = None
+        self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+def main():
+    """명령줄 실행"""
+    parser = argparse.ArgumentParser(description="시세 재생 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='기본 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='추가 지연 최대값 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 비율 (0~1)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-folder', default=None, help='기록된 CSV 폴더')
+    args = parser.parse_args()
+
+    server = ReplayServer(args.host, args.port, args.latency, args.jitter,
+                          args.error_rate, seed=args.seed, data_folder=args.data_folder)
+    server.start()
+    print(f"🔁 재생 서버 실행: {server.base_url} (Ctrl+C 종료)")
+
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+        print("\n👋 재생 서버 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,12 +14,18 @@ from matplotlib.figure import Figure
 import os
 from pathlib import Path
 
+try:
+    from .technical_analysis import TechnicalAnalysis
+except ImportError:
+    from technical_analysis import TechnicalAnalysis
+
 class SimpleStockAnalyzer:
     def __init__(self):
         """간단한 주식 분석기 초기화"""
         self.root = tk.Tk()
         self.setup_window()
         self.current_data = None
+        self.technical_analysis = TechnicalAnalysis()
         self.create_widgets()
         
     def setup_window(self):
@@ -225,14 +231,14 @@ class SimpleStockAnalyzer:
         ax1.grid(True, alpha=0.3)
         ax1.legend()
         
-        # 이동평균선 추가
-        if len(data) > 20:
-            ma20 = data['Close'].rolling(window=20).mean()
-            ax1.plot(data.index, ma20, color='#f59e0b', linewidth=1, label='MA20', alpha=0.8)
+        # 이동평균선 추가 (같은 데이터면 공유 캐시에서 재사용)
+        indicators = self.technical_analysis.calculate_all_indicators(data, symbol) or {}
+        
+        if len(data) > 20 and 'SMA_20' in indicators:
+            ax1.plot(data.index, indicators['SMA_20'], color='#f59e0b', linewidth=1, label='MA20', alpha=0.8)
             
-        if len(data) > 50:
-            ma50 = data['Close'].rolling(window=50).mean()
-            ax1.plot(data.index, ma50, color='#ef4444', linewidth=1, label='MA50', alpha=0.8)
+        if len(data) > 50 and 'SMA_50' in indicators:
+            ax1.plot(data.index, indicators['SMA_50'], color='#ef4444', linewidth=1, label='MA50', alpha=0.8)
             
         ax1.legend()
         
@@ -12,11 +12,25 @@ from pathlib import Path
 from datetime import datetime
 import re
 
+# 컬럼형 가격 저장소 / 2단계 캐시 (stock/src/price_store.py, frame_cache.py)
+try:
+    from price_store import ColumnarPriceStore, default_store_path
+    from frame_cache import FrameCache, source_key
+    PRICE_STORE_AVAILABLE = True
+except ImportError:
+    PRICE_STORE_AVAILABLE = False
+
 class RIntegratedDataLoader:
     def __init__(self, data_folder=None):
         """R 스크립트 연동 데이터 로더"""
         self.data_folder = Path(data_folder) if data_folder else Path("data")
-        self.cache = {}
+        if PRICE_STORE_AVAILABLE:
+            # 메모리 LRU + 디스크 캐시 (원본 파일 변경시 무효화)
+            self.cache = FrameCache(self.data_folder / "cache")
+            self.price_store = ColumnarPriceStore(default_store_path(self.data_folder))
+        else:
+            self.cache = {}
+            self.price_store = None
         
         # R 스크립트 경로들 시도
         self.r_paths = [
@@ -171,22 +185,62 @@ class RIntegratedDataLoader:
         """통합 주식 데이터 로드 (R + 기본)"""
         symbol = symbol.upper()
         
+        r_files = self.find_r_stock_files(symbol)
+        source_mtime = max((f.stat().st_mtime for f in r_files), default=0)
+        
         # 캐시 확인
-        if symbol in self.cache:
-            cache_time, data = self.cache[symbol]
-            if (datetime.now() - cache_time).seconds < 300:  # 5분 캐시
+        data = self._cache_get(symbol, r_files)
+        if data is not None:
+            return data
+                
+        # 컬럼형 저장소가 R 파일보다 최신이면 파싱 없이 로드
+        if self.price_store is not None and self.price_store.is_fresh(symbol, source_mtime):
+            data = self.price_store.load(symbol)
+            if data is not None and not data.empty:
+                self._cache_put(symbol, r_files, data)
                 return data
                 
         # R 데이터 먼저 시도
         data = self.load_r_stock_data(symbol)
         
         if data is not None:
-            self.cache[symbol] = (datetime.now(), data)
+            if self.price_store is not None and isinstance(data.index, pd.DatetimeIndex):
+                self.price_store.import_dataframe(symbol, data, source_mtime)
+            self._cache_put(symbol, r_files, data)
             return data
             
         # R 데이터가 없으면 기본 데이터 로드
         return self._load_basic_data(symbol)
         
+    def _cache_key(self, symbol, source_files):
+        """캐시 키 - 원본 파일들 (경로, 수정시각, 크기) + 저장소 갱신 시각"""
+        index = self.price_store.read_index(symbol) if self.price_store is not None else None
+        store_version = index.get('updated') if index and index['segments'] else None
+        file_keys = tuple(source_key(f) for f in source_files)
+        
+        if not file_keys and store_version is None:
+            return None
+        return (file_keys, store_version)
+        
+    def _cache_get(self, symbol, source_files):
+        """캐시 조회"""
+        if not PRICE_STORE_AVAILABLE:
+            if symbol in self.cache:
+                cache_time, data = self.cache[symbol]
+                if (datetime.now() - cache_time).seconds < 300:  # 5분 캐시
+                    return data
+            return None
+            
+        return self.cache.get(symbol, self._cache_key(symbol, source_files))
+        
+    def _cache_put(self, symbol, source_files, data):
+        """캐시 저장"""
+        if not PRICE_STORE_AVAILABLE:
+            self.cache[symbol] = (datetime.now(), data)
+            return
+            
+        self.cache.put(symbol, self._cache_key(symbol, source_files), data)
+        
     def _load_basic_data(self, symbol):
         """기본 데이터 로드"""
         try:
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+증분(스트리밍) 기술적 지표 모듈
+새 봉이 들어올 때마다 O(1)로 지표를 갱신하고, 상태를 종목 CSV 옆에 저장
+"""
+
+import json
+import math
+from collections import deque
+from pathlib import Path
+
+import pandas as pd
+import numpy as np
+
+NAN = float('nan')
+
+
+class StreamingSMA:
+    """단순 이동평균 - 누적합 유지"""
+
+    # 부동소수점 오차 누적 방지를 위한 재계산 주기
+    RESYNC_INTERVAL = 10000
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.updates = 0
+
+    def update(self, value):
+        """새 값 추가 후 현재 이동평균 반환"""
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+
+        self.updates += 1
+        if self.updates % self.RESYNC_INTERVAL == 0:
+            self.total = math.fsum(self.values)
+
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window:
+            return NAN
+        return self.total / self.window
+
+    def to_dict(self):
+        return {'window': self.window, 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, state):
+        sma = cls(state['window'])
+        sma.values = deque(state['values'])
+        sma.total = math.fsum(sma.values)
+        return sma
+
+
+class StreamingEMA:
+    """지수 이동평균 - pandas ewm(span).mean() (adjust=True)과 같은 점화식"""
+
+    def __init__(self, span):
+        self.span = span
+        self.decay = 1.0 - 2.0 / (span + 1.0)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def update(self, value):
+        self.numerator = self.numerator * self.decay + value
+        self.denominator = self.denominator * self.decay + 1.0
+        return self.value
+
+    @property
+    def value(self):
+        if self.denominator == 0:
+            return NAN
+        return self.numerator / self.denominator
+
+    def to_dict(self):
+        return {'span': self.span, 'numerator': self.numerator, 'denominator': self.denominator}
+
+    @classmethod
+    def from_dict(cls, state):
+        ema = cls(state['span'])
+        ema.numerator = state['numerator']
+        ema.denominator = state['denominator']
+        return ema
+
+
+class StreamingRSI:
+    """
+    상대강도지수
+    기본값은 TechnicalAnalysis.calculate_rsi와 같은 단순 이동평균 방식,
+    wilder=True이면 Wilder 평활 점화식 사용
+    """
+
+    def __init__(self, window=14, wilder=False):
+        self.window = window
+        self.wilder = wilder
+        self.prev_close = None
+        self.gain = StreamingSMA(window)
+        self.loss = StreamingSMA(window)
+        self.avg_gain = NAN
+        self.avg_loss = NAN
+        self.count = 0
+
+    def update(self, close):
+        if self.prev_close is None:
+            delta = 0.0  # 첫 봉은 pandas where(...)처럼 0으로 취급
+        else:
+            delta = close - self.prev_close
+        self.prev_close = close
+
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.wilder:
+            self.count += 1
+            if self.count <= self.window:
+                self.gain.update(gain)
+                self.loss.update(loss)
+                self.avg_gain = self.gain.value
+                self.avg_loss = self.loss.value
+            else:
+                self.avg_gain = (self.avg_gain * (self.window - 1) + gain) / self.window
+                self.avg_loss = (self.avg_loss * (self.window - 1) + loss) / self.window
+        else:
+            self.avg_gain = self.gain.update(gain)
+            self.avg_loss = self.loss.update(loss)
+
+        return self.value
+
+    @property
+    def value(self):
+        if math.isnan(self.avg_gain) or math.isnan(self.avg_loss):
+            return NAN
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else NAN
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def to_dict(self):
+        return {
+            'window': self.window, 'wilder': self.wilder, 'prev_close': self.prev_close,
+            'gain': self.gain.to_dict(), 'loss': self.loss.to_dict(),
+            'avg_gain': self.avg_gain, 'avg_loss': self.avg_loss, 'count': self.count
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        rsi = cls(state['window'], state.get('wilder', False))
+        rsi.prev_close = state['prev_close']
+        rsi.gain = StreamingSMA.from_dict(state['gain'])
+        rsi.loss = StreamingSMA.from_dict(state['loss'])
+        rsi.avg_gain = state['avg_gain']
+        rsi.avg_loss = state['avg_loss']
+        rsi.count = state.get('count', 0)
+        return rsi
+
+
+class StreamingMACD:
+    """MACD - 빠른/느린 EMA와 시그널 EMA 점화식"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.macd = NAN
+
+    def update(self, close):
+        self.macd = self.fast.update(close) - self.slow.update(close)
+        self.signal.update(self.macd)
+        return self.value
+
+    @property
+    def value(self):
+        signal = self.signal.value
+        return {
+            'MACD': self.macd,
+            'MACD_Signal': signal,
+            'MACD_Histogram': self.macd - signal
+        }
+
+    def to_dict(self):
+        return {
+            'fast': self.fast.to_dict(), 'slow': self.slow.to_dict(),
+            'signal': self.signal.to_dict(), 'macd': self.macd
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        macd = cls()
+        macd.fast = StreamingEMA.from_dict(state['fast'])
+        macd.slow = StreamingEMA.from_dict(state['slow'])
+        macd.signal = StreamingEMA.from_dict(state['signal'])
+        macd.macd = state['macd']
+        return macd
+
+
+class StreamingATR:
+    """평균 참 범위 - 참 범위의 단순 이동평균"""
+
+    def __init__(self, window=14):
+        self.prev_close = None
+        self.true_range = StreamingSMA(window)
+
+    def update(self, high, low, close):
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        return self.true_range.update(tr)
+
+    @property
+    def value(self):
+        return self.true_range.value
+
+    def to_dict(self):
+        return {'prev_close': self.prev_close, 'true_range': self.true_range.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        atr = cls()
+        atr.prev_close = state['prev_close']
+        atr.true_range = StreamingSMA.from_dict(state['true_range'])
+        return atr
+
+
+class MonotonicWindow:
+    """이동 최솟값/최댓값 - 단조 덱 (갱신 분할상환 O(1))"""
+
+    def __init__(self, window, mode='min'):
+        self.window = window
+        self.mode = mode
+        self.items = deque()  # (봉 번호, 값)
+        self.position = 0
+
+    def update(self, value):
+        if self.mode == 'min':
+            while self.items and self.items[-1][1] >= value:
+                self.items.pop()
+        else:
+            while self.items and self.items[-1][1] <= value:
+                self.items.pop()
+        self.items.append((self.position, value))
+
+        # 윈도우 밖으로 나간 값 제거
+        while self.items[0][0] <= self.position - self.window:
+            self.items.popleft()
+
+        self.position += 1
+        return self.value
+
+    @property
+    def value(self):
+        if self.position < self.window:
+            return NAN
+        return self.items[0][1]
+
+    def to_dict(self):
+        return {
+            'window': self.window, 'mode': self.mode,
+            'items': [list(item) for item in self.items], 'position': self.position
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        window = cls(state['window'], state['mode'])
+        window.items = deque(tuple(item) for item in state['items'])
+        window.position = state['position']
+        return window
+
+
+class StreamingStochastic:
+    """스토캐스틱 오실레이터 - 최고/최저는 단조 덱, 스무딩은 누적합"""
+
+    def __init__(self, window=14, smooth_k=3, smooth_d=3):
+        self.lowest = MonotonicWindow(window, 'min')
+        self.highest = MonotonicWindow(window, 'max')
+        self.smooth_k = StreamingSMA(smooth_k)
+        self.smooth_d = StreamingSMA(smooth_d)
+
+    def update(self, high, low, close):
+        lowest_low = self.lowest.update(low)
+        highest_high = self.highest.update(high)
+
+        if math.isnan(lowest_low) or highest_high == lowest_low:
+            # pandas와 같이 NaN은 이후 스무딩 윈도우 전체를 NaN으로 만듦
+            self.smooth_k = StreamingSMA(self.smooth_k.window)
+            self.smooth_d = StreamingSMA(self.smooth_d.window)
+            return self.value
+
+        k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+        k_smooth = self.smooth_k.update(k_percent)
+        if not math.isnan(k_smooth):
+            self.smooth_d.update(k_smooth)
+        return self.value
+
+    @property
+    def value(self):
+        return {'Stoch_K': self.smooth_k.value, 'Stoch_D': self.smooth_d.value}
+
+    def to_dict(self):
+        return {
+            'lowest': self.lowest.to_dict(), 'highest': self.highest.to_dict(),
+            'smooth_k': self.smooth_k.to_dict(), 'smooth_d': self.smooth_d.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        stoch = cls()
+        stoch.lowest = MonotonicWindow.from_dict(state['lowest'])
+        stoch.highest = MonotonicWindow.from_dict(state['highest'])
+        stoch.smooth_k = StreamingSMA.from_dict(state['smooth_k'])
+        stoch.smooth_d = StreamingSMA.from_dict(state['smooth_d'])
+        return stoch
+
+
+class IndicatorState:
+    """종목 하나의 모든 증분 지표 상태"""
+
+    STATE_SUFFIX = ".indicator_state"
+    VERSION = 1
+
+    def __init__(self, symbol, sma_windows=(5, 10, 20, 50, 200), ema_windows=(5, 10, 20, 50)):
+        self.symbol = symbol
+        self.sma = {window: StreamingSMA(window) for window in sma_windows}
+        self.ema = {window: StreamingEMA(window) for window in ema_windows}
+        self.rsi = StreamingRSI(14)
+        self.macd = StreamingMACD()
+        self.atr = StreamingATR(14)
+        self.stochastic = StreamingStochastic()
+        self.last_timestamp = None
+        self.bar_count = 0
+
+    def update_bar(self, timestamp, high, low, close):
+        """봉 하나 반영"""
+        for sma in self.sma.values():
+            sma.update(close)
+        for ema in self.ema.values():
+            ema.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.atr.update(high, low, close)
+        self.stochastic.update(high, low, close)
+
+    def update_frame(self, data):
+        """
+        마지막으로 반영한 시점 이후의 봉만 반영 (O(새 봉 수))
+
+        Returns:
+            int: 새로 반영한 봉 개수
+        """
+        if data is None or data.empty:
+            return 0
+
+        if self.last_timestamp is not None:
+            data = data[data.index > self.last_timestamp]
+
+        highs = data['High'].to_numpy(dtype=float)
+        lows = data['Low'].to_numpy(dtype=float)
+        closes = data['Close'].to_numpy(dtype=float)
+
+        for timestamp, high, low, close in zip(data.index, highs, lows, closes):
+            if not np.isnan(close):
+                self.update_bar(timestamp, high, low, close)
+            self.last_timestamp = pd.Timestamp(timestamp)
+            self.bar_count += 1
+
+        return len(data)
+
+    def latest(self):
+        """최신 지표값 (TechnicalAnalysis 지표명과 동일한 키)"""
+        values = {}
+        for window, sma in self.sma.items():
+            values[f'SMA_{window}'] = sma.value
+        for window, ema in self.ema.items():
+            values[f'EMA_{window}'] = ema.value
+        values['RSI'] = self.rsi.value
+        values.update(self.macd.value)
+        values['ATR'] = self.atr.value
+        values.update(self.stochastic.value)
+        return values
+
+    def to_dict(self):
+        return {
+            'version': self.VERSION,
+            'symbol': self.symbol,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            'bar_count': self.bar_count,
+            'sma': {str(window): sma.to_dict() for window, sma in self.sma.items()},
+            'ema': {str(window): ema.to_dict() for window, ema in self.ema.items()},
+            'rsi': self.rsi.to_dict(),
+            'macd': self.macd.to_dict(),
+            'atr': self.atr.to_dict(),
+            'stochastic': self.stochastic.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        indicator_state = cls(state['symbol'])
+        indicator_state.sma = {int(w): StreamingSMA.from_dict(s) for w, s in state['sma'].items()}
+        indicator_state.ema = {int(w): StreamingEMA.from_dict(s) for w, s in state['ema'].items()}
+        indicator_state.rsi = StreamingRSI.from_dict(state['rsi'])
+        indicator_state.macd = StreamingMACD.from_dict(state['macd'])
+        indicator_state.atr = StreamingATR.from_dict(state['atr'])
+        indicator_state.stochastic = StreamingStochastic.from_dict(state['stochastic'])
+        if state.get('last_timestamp'):
+            indicator_state.last_timestamp = pd.Timestamp(state['last_timestamp'])
+        indicator_state.bar_count = state.get('bar_count', 0)
+        return indicator_state
+
+    @classmethod
+    def state_path(cls, data_folder, symbol):
+        """종목 CSV와 같은 폴더의 상태 파일 경로"""
+        return Path(data_folder) / f"{symbol}{cls.STATE_SUFFIX}"
+
+    def save(self, path):
+        """상태 저장 (임시 파일에 쓴 뒤 교체)"""
+        try:
+            path = Path(path)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f)
+            tmp_path.replace(path)
+            return True
+        except Exception as e:
+            print(f"지표 상태 저장 실패: {e}")
+            return False
+
+    @classmethod
+    def load(cls, path):
+        """상태 로드 (없거나 손상되면 None)"""
+        try:
+            path = Path(path)
+            if not path.exists():
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') != cls.VERSION:
+                return None
+            return cls.from_dict(state)
+        except Exception as e:
+            print(f"지표 상태 로드 실패: {e}")
+            return None
+
+
+def update_indicator_state(data_folder, symbol, data):
+    """
+    저장된 상태를 불러와 새 봉만 반영하고 다시 저장
+
+    상태가 없거나 봉 개수·마지막 날짜가 데이터 이력과 어긋나면 전체 이력으로 재구성
+
+    Returns:
+        tuple: (IndicatorState, 새로 반영한 봉 개수)
+    """
+    path = IndicatorState.state_path(data_folder, symbol)
+    state = IndicatorState.load(path)
+
+    if state is not None and state.last_timestamp is not None:
+        try:
+            known = data.index[data.index <= state.last_timestamp]
+            if len(known) != state.bar_count or known.empty or known[-1] != state.last_timestamp:
+                state = None
+        except TypeError:
+            state = None  # 타임존 혼용 등 비교 불가 → 재구성
+
+    if state is None:
+        state = IndicatorState(symbol)
+
+    new_bars = state.update_frame(data)
+    if new_bars:
+        state.save(path)
+
+    return state, new_bars
@@ -11,10 +11,21 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from .batch_indicators import BatchTechnicalAnalysis
+except ImportError:
+    from batch_indicators import BatchTechnicalAnalysis
+
+try:
+    from .indicator_cache import default_indicator_cache
+except ImportError:
+    from indicator_cache import default_indicator_cache
+
 class TechnicalAnalysis:
-    def __init__(self):
-        """기술적 분석 클래스 초기화"""
+    def __init__(self, cache=None):
+        """기술적 분석 클래스 초기화 (cache를 주지 않으면 공유 캐시 사용)"""
         self.indicators = {}
+        self.cache = cache if cache is not None else default_indicator_cache
         
     def calculate_sma(self, data, window=20):
         """단순 이동평균 (Simple Moving Average)"""
@@ -271,11 +282,20 @@ class TechnicalAnalysis:
                 'Support2': pd.Series([np.nan] * len(data), index=data.index)
             }
             
-    def calculate_all_indicators(self, data):
-        """모든 기술적 지표 계산"""
+    def calculate_all_indicators(self, data, symbol=None):
+        """모든 기술적 지표 계산 (같은 데이터는 캐시에서 반환)"""
         if data is None or data.empty:
             return None
             
+        indicators = self.cache.get_or_compute(data, self._calculate_all_indicators, symbol)
+        if indicators is None:
+            return None
+            
+        # 호출자가 딕셔너리를 수정해도 캐시가 오염되지 않도록 복사본 반환
+        return dict(indicators)
+        
+    def _calculate_all_indicators(self, data):
+        """모든 기술적 지표 실제 계산"""
         try:
             indicators = {}
             
@@ -325,6 +345,15 @@ class TechnicalAnalysis:
             print(f"기술적 지표 계산 오류: {e}")
             return None
             
+    def calculate_batch_indicators(self, data_dict):
+        """다종목 일괄 지표 계산 - {종목: 데이터프레임}을 한 번의 패널 연산으로 처리"""
+        batch = BatchTechnicalAnalysis()
+        result = batch.calculate_all_indicators(data_dict)
+        if result is None:
+            return None
+            
+        return {symbol: batch.extract_symbol(result, symbol) for symbol in result['symbols']}
+            
     def get_trading_signals(self, data, indicators=None):
         """매매 신호 생성"""
         if indicators is None:
@@ -474,13 +503,26 @@ class TechnicalAnalysis:
             print(f"리스크 지표 계산 오류: {e}")
             return None
             
-    def generate_analysis_summary(self, data):
+    def generate_analysis_summary(self, data, symbol=None):
         """종합 분석 요약"""
         try:
-            indicators = self.calculate_all_indicators(data)
-            signals = self.get_trading_signals(data, indicators)
-            trend_analysis = self.analyze_trend(data, indicators)
-            risk_metrics = self.calculate_risk_metrics(data)
+            indicators = self.calculate_all_indicators(data, symbol)
+            key = self.cache.fingerprint(data, symbol)
+            
+            signals = self.cache.get(key, 'signals')
+            if signals is None:
+                signals = self.get_trading_signals(data, indicators)
+                self.cache.put(key, signals, 'signals')
+                
+            trend_analysis = self.cache.get(key, 'trend')
+            if trend_analysis is None:
+                trend_analysis = self.analyze_trend(data, indicators)
+                self.cache.put(key, trend_analysis, 'trend')
+                
+            risk_metrics = self.cache.get(key, 'risk')
+            if risk_metrics is None:
+                risk_metrics = self.calculate_risk_metrics(data)
+                self.cache.put(key, risk_metrics, 'risk')
             
             # 최신 값들
             latest = data.iloc[-1]
@@ -492,7 +534,7 @@ class TechnicalAnalysis:
                         latest_indicators[key] = series.iloc[-1]
             
             summary = {
-                'symbol': 'UNKNOWN',
+                'symbol': symbol or 'UNKNOWN',
                 'analysis_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                 'current_price': latest['Close'],
                 'price_change': latest['Close'] - data.iloc[-2]['Close'] if len(data) > 1 else 0,
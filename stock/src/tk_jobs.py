@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tk 작업 실행기
+파일 로드/지표 계산 같은 무거운 작업을 스레드(또는 프로세스) 풀에서 실행하고
+결과는 root.after 폴링으로 Tk 스레드에서 전달
+같은 키로 새 요청이 오면 이전 요청은 취소 (빠르게 종목을 바꾸면 마지막 분석만 완료)
+"""
+
+import itertools
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """새 요청에 밀려 취소된 작업"""
+
+
+class JobToken:
+    def __init__(self, key, job_id):
+        """작업 취소 확인용 토큰 (스레드 풀 전용)"""
+        self.key = key
+        self.job_id = job_id
+        self.event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        self.event.set()
+
+    def check(self):
+        """취소됐으면 JobCancelled 발생 - 단계 사이에서 호출"""
+        if self.event.is_set():
+            raise JobCancelled(f"{self.key} 작업 #{self.job_id} 취소됨")
+
+
+class TkJobExecutor:
+    def __init__(self, root, max_workers=2, use_processes=False, poll_interval=50):
+        """
+        Tk 작업 실행기
+
+        Args:
+            root: Tk 루트 (after 폴링용)
+            max_workers (int): 작업자 수
+            use_processes (bool): 프로세스 풀 사용 (함수/인자/결과가 pickle 가능해야 함, 토큰 미지원)
+            poll_interval (int): 결과 확인 주기 (ms)
+        """
+        self.root = root
+        self.use_processes = use_processes
+        self.poll_interval = poll_interval
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = pool_class(max_workers=max_workers)
+
+        self.ids = itertools.count(1)
+        self.jobs = {}    # {작업 id: (key, future, token, on_success, on_error)}
+        self.latest = {}  # {key: 최신 작업 id}
+        self.polling = False
+        self.closed = False
+
+    def submit(self, key, func, *args, on_success=None, on_error=None, with_token=False, **kwargs):
+        """
+        작업 제출 - 같은 key의 이전 작업은 취소하고 결과도 버림
+
+        Args:
+            key (str): 작업 종류 (예: 'analyze')
+            func: 작업 함수 (with_token이면 첫 인자로 JobToken 전달)
+            on_success: Tk 스레드에서 호출할 콜백 (결과)
+            on_error: Tk 스레드에서 호출할 콜백 (예외)
+            with_token (bool): 협조적 취소용 토큰 전달 여부
+
+        Returns:
+            Future: 작업 future
+        """
+        if self.closed:
+            raise RuntimeError("작업 실행기가 종료되었습니다.")
+
+        self.cancel(key)
+
+        job_id = next(self.ids)
+        token = None
+        if with_token:
+            if self.use_processes:
+                raise ValueError("프로세스 풀에서는 취소 토큰을 사용할 수 없습니다.")
+            token = JobToken(key, job_id)
+            args = (token,) + args
+
+        future = self.executor.submit(func, *args, **kwargs)
+        self.jobs[job_id] = (key, future, token, on_success, on_error)
+        self.latest[key] = job_id
+
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_interval, self._poll)
+        return future
+
+    def cancel(self, key):
+        """key의 진행 중 작업 취소 (시작 전이면 실행 안 함, 실행 중이면 토큰으로 알림)"""
+        job_id = self.latest.pop(key, None)
+        if job_id is None or job_id not in self.jobs:
+            return False
+        _, future, token, _, _ = self.jobs[job_id]
+        if token is not None:
+            token.cancel()
+        future.cancel()
+        return True
+
+    def is_busy(self, key=None):
+        """진행 중인 작업이 있는지 (key 지정 시 해당 작업만)"""
+        if key is None:
+            return bool(self.latest)
+        return key in self.latest
+
+    def _poll(self):
+        """완료된 작업 결과를 Tk 스레드에서 전달"""
+        for job_id in [job_id for job_id, job in self.jobs.items() if job[1].done()]:
+            key, future, token, on_success, on_error = self.jobs.pop(job_id)
+            if self.latest.get(key) != job_id:
+                continue  # 새 요청에 밀린 작업 - 결과 무시
+            del self.latest[key]
+
+            try:
+                result = future.result()
+            except (CancelledError, JobCancelled):
+                continue
+            except Exception as e:
+                if on_error is not None:
+                    self._call(on_error, e)
+                else:
+                    print(f"작업 오류 ({key}): {e}")
+                continue
+
+            if on_success is not None:
+                self._call(on_success, result)
+
+        if self.jobs and not self.closed:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self.polling = False
+
+    def _call(self, callback, value):
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"작업 콜백 오류: {e}")
+
+    def shutdown(self):
+        """대기 중 작업 취소 후 종료 (실행 중 작업은 기다리지 않음)"""
+        self.closed = True
+        for key in list(self.latest):
+            self.cancel(key)
+        self.executor.shutdown(wait=False, cancel_futures=True)
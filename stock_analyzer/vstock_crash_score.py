@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VStock Crash Score - 폭락 위험 점수 계산 (GUI 없이 사용 가능)
+관심종목 전체는 crash_radar로 패널 한 번에 계산
+과거 전체 기간은 crash_score_series, 등급 검증은 crash_level_backtest
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# 레버리지 ETF (위험 점수 30% 가산)
+LEVERAGE_ETFS = ['SOXL', 'TQQQ', 'UPRO', 'TMF', 'SPXL', 'TECL', 'FNGU', 'WEBL', 'TSLL']
+LEVERAGE_MULTIPLIER = 1.3
+
+# (점수 상한, 등급, 이모지, 권장사항, 색상)
+SEVERITY_LEVELS = [
+    (20, "NORMAL", "📈", "정상 보유 - 주의 깊게 관찰", "green"),
+    (40, "MODERATE_DECLINE", "📊", "주의 필요 - 포지션 점검", "orange"),
+    (60, "SIGNIFICANT_DROP", "⚠️", "위험 - 손절 고려", "red"),
+    (80, "SEVERE_CRASH", "🚨", "심각 - 즉시 대응 필요", "red"),
+    (float('inf'), "EXTREME_CRASH", "💥", "극한 상황 - 긴급 대응", "red")
+]
+
+CUTLOSS_LABELS = ["보수적", "표준", "공격적"]
+
+# 위험 요소 (점수 합산 대상)
+RISK_FACTOR_NAMES = ['drop_severity', 'volatility_risk', 'volume_panic', 'trend_breakdown', 'consecutive_decline']
+
+
+def is_leverage_etf(symbol):
+    """레버리지 ETF 여부"""
+    symbol = (symbol or "").upper()
+    return any(etf in symbol for etf in LEVERAGE_ETFS)
+
+
+def cutloss_levels(symbol):
+    """
+    종목 유형별 권장 손절 비율
+
+    Returns:
+        tuple: (자산 유형, [(이름, 손절가/현재가 비율), ...])
+    """
+    if is_leverage_etf(symbol):
+        return "레버리지 ETF", list(zip(CUTLOSS_LABELS, [0.88, 0.85, 0.82]))  # 12%, 15%, 18%
+    return "일반 주식", list(zip(CUTLOSS_LABELS, [0.90, 0.85, 0.80]))  # 10%, 15%, 20%
+
+
+def classify_severity(score):
+    """위험 점수 → (등급, 이모지, 권장사항, 색상)"""
+    for upper, level, emoji, recommendation, color in SEVERITY_LEVELS:
+        if score < upper:
+            return level, emoji, recommendation, color
+    return SEVERITY_LEVELS[-1][1:]
+
+
+def _drop_from_high(latest_price, highs):
+    peak = highs.max()
+    return ((latest_price - peak) / peak) * 100
+
+
+def _annualized_volatility(closes):
+    returns = closes.pct_change().dropna()
+    return returns.std() * np.sqrt(252) * 100 if len(returns) > 1 else 0
+
+
+def calculate_crash_score(data, symbol=""):
+    """
+    종합 폭락 위험 점수 (0-100)
+
+    Args:
+        data (pd.DataFrame): OHLCV 데이터 (High, Close, Volume 필요)
+        symbol (str): 종목 코드 (레버리지 ETF 가산 판단)
+
+    Returns:
+        dict: 하락률/변동성/거래량 지표, 위험 요소 분해, 총점, 등급
+    """
+    recent_5 = data.tail(5)
+    recent_10 = data.tail(10)
+    recent_20 = data.tail(20)
+    recent_60 = data.tail(60)
+    recent_52w = data.tail(252)  # 52주 - 폭락 레이더/점수 시계열과 같은 기준
+
+    latest_price = data['Close'].iloc[-1]
+
+    # 다양한 최고점에서의 하락률
+    drop_5d = _drop_from_high(latest_price, recent_5['High'])
+    drop_10d = _drop_from_high(latest_price, recent_10['High'])
+    drop_20d = _drop_from_high(latest_price, recent_20['High'])
+    drop_60d = _drop_from_high(latest_price, recent_60['High'])
+    drop_52w = _drop_from_high(latest_price, recent_52w['High'])
+
+    # 변동성 계산 (연환산)
+    volatility_5d = _annualized_volatility(recent_5['Close'])
+    volatility_10d = _annualized_volatility(recent_10['Close'])
+    volatility_20d = _annualized_volatility(recent_20['Close'])
+
+    # 거래량 분석
+    volume_avg_20d = recent_20['Volume'].mean() if len(recent_20) > 0 else 0
+    volume_recent_5d = recent_5['Volume'].mean() if len(recent_5) > 0 else 0
+    volume_spike = (volume_recent_5d / volume_avg_20d - 1) * 100 if volume_avg_20d > 0 else 0
+
+    # 연속 하락일 계산
+    consecutive_down = 0
+    prices = data['Close'].tail(10).tolist()
+    for i in range(len(prices) - 1, 0, -1):
+        if prices[i] < prices[i - 1]:
+            consecutive_down += 1
+        else:
+            break
+
+    # 종합 위험 점수 계산 (0-100)
+    risk_factors = {
+        'drop_severity': min(35, abs(drop_10d) * 1.8),  # 최대 35점
+        'volatility_risk': min(25, volatility_5d * 0.4),   # 최대 25점
+        'volume_panic': min(15, max(0, volume_spike * 0.15)),  # 최대 15점
+        'trend_breakdown': min(15, max(0, abs(drop_20d) * 0.4)),   # 최대 15점
+        'consecutive_decline': min(10, consecutive_down * 2)  # 최대 10점
+    }
+
+    total_risk_score = sum(risk_factors.values())
+
+    # 레버리지 ETF 가산점
+    is_leverage = is_leverage_etf(symbol)
+    if is_leverage:
+        total_risk_score = min(100, total_risk_score * LEVERAGE_MULTIPLIER)  # 30% 가산
+
+    severity_level, severity_emoji, recommendation, action_color = classify_severity(total_risk_score)
+
+    return {
+        'latest_price': latest_price,
+        'drop_5d': drop_5d,
+        'drop_10d': drop_10d,
+        'drop_20d': drop_20d,
+        'drop_60d': drop_60d,
+        'drop_52w': drop_52w,
+        'volatility_5d': volatility_5d,
+        'volatility_10d': volatility_10d,
+        'volatility_20d': volatility_20d,
+        'volume_spike': volume_spike,
+        'consecutive_down': consecutive_down,
+        'risk_factors': risk_factors,
+        'total_risk_score': total_risk_score,
+        'is_leverage': is_leverage,
+        'severity_level': severity_level,
+        'severity_emoji': severity_emoji,
+        'recommendation': recommendation,
+        'action_color': action_color
+    }
+
+
+# ---------- 관심종목 일괄 스캔 (레이더) ----------
+
+DROP_WINDOWS = {'drop_5d': 5, 'drop_10d': 10, 'drop_20d': 20, 'drop_60d': 60, 'drop_52w': 252}
+VOLATILITY_WINDOWS = {'volatility_5d': 5, 'volatility_10d': 10, 'volatility_20d': 20}
+
+
+def build_panel(frames, lookback=252):
+    """
+    종목별 데이터프레임 → 최근 lookback일 패널 (종목 수, lookback) 배열
+
+    종목마다 자기 최신일을 마지막 열에 맞추고 기록이 짧으면 앞을 NaN으로 채움
+
+    Args:
+        frames (dict): {종목: OHLCV 데이터프레임}
+        lookback (int): 사용할 최근 거래일 수 (52주 = 252)
+
+    Returns:
+        tuple: (종목 리스트, {'High': 배열, 'Close': 배열, 'Volume': 배열})
+    """
+    columns = ['High', 'Close', 'Volume']
+    symbols = [symbol for symbol, data in frames.items() if data is not None and len(data) > 0]
+    values = np.full((len(columns), len(symbols), lookback), np.nan)
+
+    for row, symbol in enumerate(symbols):
+        data = frames[symbol]
+        for layer, column in enumerate(columns):
+            recent = data[column].to_numpy(dtype=float)[-lookback:]
+            values[layer, row, lookback - len(recent):] = recent
+
+    return symbols, dict(zip(columns, values))
+
+
+def _nan_reduce(func, values):
+    """전부 NaN인 행 경고 없이 NaN 반환"""
+    with np.errstate(all='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return func(values, axis=1)
+
+
+def _nan_std(values, axis):
+    return np.nanstd(values, axis=axis, ddof=1)
+
+
+def _score_windows(high, close, volume, leverage, consecutive_down=None):
+    """
+    (행, 최근 N일) 창 배열 → 지표/위험 요소/총점 (행: 종목 또는 날짜)
+
+    마지막 열이 기준일, 기록이 짧으면 앞쪽이 NaN (calculate_crash_score의 tail()과 같은 결과)
+
+    Args:
+        high, close, volume (np.ndarray): (행, N) 배열
+        leverage (bool 또는 np.ndarray): 레버리지 ETF 가산 여부
+        consecutive_down (np.ndarray): 미리 계산한 연속 하락일 (None이면 창에서 계산)
+
+    Returns:
+        dict: {컬럼: 행별 배열}
+    """
+    latest_price = close[:, -1]
+    table = {'latest_price': latest_price}
+
+    # 다양한 최고점에서의 하락률
+    for name, window in DROP_WINDOWS.items():
+        peak = _nan_reduce(np.nanmax, high[:, -window:])
+        table[name] = (latest_price - peak) / peak * 100
+
+    # 변동성 (연환산) - 최근 N일 종가의 N-1개 수익률
+    longest = max(VOLATILITY_WINDOWS.values())
+    with np.errstate(all='ignore'):
+        returns = close[:, -longest + 1:] / close[:, -longest:-1] - 1
+    for name, window in VOLATILITY_WINDOWS.items():
+        recent = returns[:, -(window - 1):]
+        counts = np.isfinite(recent).sum(axis=1)
+        std = _nan_reduce(_nan_std, recent)
+        table[name] = np.where(counts > 1, std * np.sqrt(252) * 100, 0)
+
+    # 거래량 급증률 (최근 5일 평균 / 20일 평균)
+    volume_avg_20d = np.nan_to_num(_nan_reduce(np.nanmean, volume[:, -20:]))
+    volume_recent_5d = np.nan_to_num(_nan_reduce(np.nanmean, volume[:, -5:]))
+    with np.errstate(all='ignore'):
+        table['volume_spike'] = np.where(volume_avg_20d > 0, (volume_recent_5d / volume_avg_20d - 1) * 100, 0)
+
+    # 연속 하락일 (최근 10일 안에서 마지막 날부터 거꾸로)
+    if consecutive_down is None:
+        with np.errstate(invalid='ignore'):
+            down = close[:, -9:] < close[:, -10:-1]
+        consecutive_down = np.cumprod(down[:, ::-1], axis=1).sum(axis=1)
+    table['consecutive_down'] = consecutive_down
+
+    # 종합 위험 점수 (0-100)
+    drop_10d = np.nan_to_num(table['drop_10d'])
+    drop_20d = np.nan_to_num(table['drop_20d'])
+    table['drop_severity'] = np.minimum(35, np.abs(drop_10d) * 1.8)
+    table['volatility_risk'] = np.minimum(25, np.nan_to_num(table['volatility_5d']) * 0.4)
+    table['volume_panic'] = np.minimum(15, np.maximum(0, table['volume_spike'] * 0.15))
+    table['trend_breakdown'] = np.minimum(15, np.maximum(0, np.abs(drop_20d) * 0.4))
+    table['consecutive_decline'] = np.minimum(10, consecutive_down * 2)
+
+    total = sum(table[name] for name in RISK_FACTOR_NAMES)
+    table['is_leverage'] = np.broadcast_to(leverage, total.shape)
+    table['total_risk_score'] = np.where(leverage, np.minimum(100, total * LEVERAGE_MULTIPLIER), total)
+    return table
+
+
+def _severity_index(scores, thresholds=None):
+    """점수 배열 → 등급 번호 (점수 상한 목록에서 위치)"""
+    uppers = thresholds if thresholds is not None else [upper for upper, *_ in SEVERITY_LEVELS[:-1]]
+    return np.searchsorted(uppers, scores, side='right')
+
+
+def _add_severity(table):
+    """등급/이모지/권장사항 컬럼 추가"""
+    levels = _severity_index(table['total_risk_score'])
+    for column, position in (('severity_level', 1), ('severity_emoji', 2), ('recommendation', 3)):
+        table[column] = np.array([level[position] for level in SEVERITY_LEVELS])[levels]
+    return table
+
+
+def crash_radar(frames, lookback=252):
+    """
+    관심종목 전체 폭락 위험 점수 (calculate_crash_score와 같은 공식을 패널 한 번에 계산)
+
+    Args:
+        frames (dict): {종목: OHLCV 데이터프레임 (High, Close, Volume 필요)}
+        lookback (int): 사용할 최근 거래일 수 (52주 최고점 기준)
+
+    Returns:
+        pd.DataFrame: 종목별 지표/위험 요소/총점/등급 (위험 점수 내림차순, 인덱스: 종목)
+    """
+    symbols, panel = build_panel(frames, lookback)
+    if not symbols:
+        return pd.DataFrame()
+
+    is_leverage = np.array([is_leverage_etf(symbol) for symbol in symbols])
+    table = _score_windows(panel['High'], panel['Close'], panel['Volume'], is_leverage)
+    _add_severity(table)
+
+    result = pd.DataFrame(table, index=pd.Index(symbols, name='symbol'))
+    result = result.sort_values('total_risk_score', ascending=False, kind='stable')
+    result.insert(0, 'rank', np.arange(1, len(result) + 1))
+    return result
+
+
+# ---------- 과거 전체 기간 점수 (시계열) + 등급별 이후 수익률 검증 ----------
+
+def trailing_windows(values, window):
+    """
+    길이 n 배열 → (n, window) 뒤쪽 창 뷰 (i행 = i일까지 최근 window개, 부족한 앞부분은 NaN)
+
+    복사 없이 sliding_window_view로 만든 읽기 전용 뷰
+    """
+    padded = np.concatenate([np.full(window - 1, np.nan), np.asarray(values, dtype=float)])
+    return np.lib.stride_tricks.sliding_window_view(padded, window)
+
+
+def consecutive_declines(close, cap=9):
+    """
+    날짜별 연속 하락일 수 (run-length, 최근 10일 기준이므로 최대 9일)
+
+    누적 하락 횟수에서 마지막으로 하락이 끊긴 시점의 누적 값을 빼서 계산
+    """
+    close = np.asarray(close, dtype=float)
+    down = np.zeros(len(close), dtype=bool)
+    with np.errstate(invalid='ignore'):
+        down[1:] = close[1:] < close[:-1]
+    count = np.cumsum(down)
+    reset = np.maximum.accumulate(np.where(down, 0, count))
+    return np.minimum(count - reset, cap)
+
+
+def crash_score_series(data, symbol="", leverage=None, lookback=252):
+    """
+    날짜별 폭락 위험 점수 (각 날짜까지의 데이터로 calculate_crash_score를 계산한 결과와 같음)
+
+    이동 최고가/이동 표준편차/연속 하락 run-length를 NumPy로 한 번에 계산
+
+    Args:
+        data (pd.DataFrame): OHLCV 데이터 (High, Close, Volume 필요)
+        symbol (str): 종목 코드 (레버리지 ETF 가산 판단)
+        leverage (bool): 레버리지 가산 강제 (None이면 symbol로 판단)
+        lookback (int): 가장 긴 최고점 창 (52주 = 252)
+
+    Returns:
+        pd.DataFrame: 날짜별 지표/위험 요소/총점/등급 (인덱스: data 인덱스)
+    """
+    if leverage is None:
+        leverage = is_leverage_etf(symbol)
+
+    close = data['Close'].to_numpy(dtype=float)
+    table = _score_windows(
+        trailing_windows(data['High'].to_numpy(dtype=float), lookback),
+        trailing_windows(close, lookback),
+        trailing_windows(data['Volume'].to_numpy(dtype=float), lookback),
+        bool(leverage),
+        consecutive_down=consecutive_declines(close)
+    )
+    _add_severity(table)
+    return pd.DataFrame(table, index=data.index)
+
+
+def forward_returns(close, horizon):
+    """horizon 거래일 뒤 수익률 (%) - 끝부분은 NaN"""
+    close = np.asarray(close, dtype=float)
+    result = np.full(len(close), np.nan)
+    if horizon < len(close):
+        result[:-horizon] = (close[horizon:] / close[:-horizon] - 1) * 100
+    return result
+
+
+def crash_level_backtest(frames, horizons=(5, 20, 60), leverage=None, thresholds=None):
+    """
+    심각도 등급별 이후 수익률 통계 (등급 임계값/레버리지 가산 검증용)
+
+    Args:
+        frames (dict): {종목: OHLCV 데이터프레임}
+        horizons (tuple): 이후 수익률을 볼 거래일 수
+        leverage (bool): None이면 종목별 자동 판단, True/False면 전체 강제 (1.3배 가산 효과 비교)
+        thresholds (list): 등급 경계 점수 (None이면 SEVERITY_LEVELS 기준 20/40/60/80)
+
+    Returns:
+        pd.DataFrame: 등급별 표본 수, 기간별 평균/중앙값/상승 확률/최저 수익률
+    """
+    if thresholds is None:
+        labels = [level for _, level, *_ in SEVERITY_LEVELS]
+    else:
+        edges = [0] + list(thresholds)
+        labels = [f"{low:g}-{high:g}" for low, high in zip(edges, edges[1:])] + [f"{edges[-1]:g}+"]
+
+    levels, returns = [], {horizon: [] for horizon in horizons}
+    for symbol, data in frames.items():
+        if data is None or len(data) == 0:
+            continue
+        scores = crash_score_series(data, symbol, leverage)['total_risk_score'].to_numpy()
+        levels.append(_severity_index(scores, thresholds))
+        close = data['Close'].to_numpy(dtype=float)
+        for horizon in horizons:
+            returns[horizon].append(forward_returns(close, horizon))
+
+    if not levels:
+        return pd.DataFrame()
+
+    levels = np.concatenate(levels)
+    rows = []
+    for position, label in enumerate(labels):
+        mask = levels == position
+        row = {'level': label, 'days': int(mask.sum())}
+        for horizon in horizons:
+            values = np.concatenate(returns[horizon])[mask]
+            values = values[np.isfinite(values)]
+            has_values = len(values) > 0
+            row[f'mean_{horizon}d'] = values.mean() if has_values else np.nan
+            row[f'median_{horizon}d'] = np.median(values) if has_values else np.nan
+            row[f'win_rate_{horizon}d'] = (values > 0).mean() * 100 if has_values else np.nan
+            row[f'worst_{horizon}d'] = values.min() if has_values else np.nan
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index('level')
+
+
+def main():
+    """CSV 파일들로 등급별 이후 수익률 검증 (예: python vstock_crash_score.py data/TQQQ_*.csv)"""
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description='폭락 위험 등급별 이후 수익률 백테스트')
+    parser.add_argument('files', nargs='+', help='OHLCV CSV 파일 (파일명 앞부분 = 종목)')
+    parser.add_argument('--horizons', nargs='+', type=int, default=[5, 20, 60], help='이후 수익률 기간 (거래일)')
+    parser.add_argument('--thresholds', nargs='+', type=float, help='등급 경계 점수 (기본: 20 40 60 80)')
+    parser.add_argument('--compare-leverage', action='store_true', help='레버리지 가산 적용/미적용 비교')
+    args = parser.parse_args()
+
+    frames = {}
+    for file in args.files:
+        path = Path(file)
+        try:
+            frames[path.stem.split('_')[0].upper()] = pd.read_csv(path, index_col=0)
+        except Exception as e:
+            print(f"파일 로드 실패 ({path.name}): {e}")
+
+    print(f"📊 {len(frames)}개 종목, {sum(len(data) for data in frames.values())}일")
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_columns', None)
+
+    runs = [('자동', None)]
+    if args.compare_leverage:
+        runs = [(f'레버리지 {LEVERAGE_MULTIPLIER}배 가산', True), ('가산 없음', False)]
+    for title, leverage in runs:
+        print(f"\n=== {title} ===")
+        print(crash_level_backtest(frames, tuple(args.horizons), leverage, args.thresholds).round(2))
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,26 @@ import warnings
 import math
 warnings.filterwarnings('ignore')
 
+# 차트 LOD/Tk 작업 실행기 모듈은 stock/src와 공유 (복사본 대신 경로 추가)
+SHARED_SRC = Path(__file__).resolve().parent.parent / "stock" / "src"
+if str(SHARED_SRC) not in sys.path:
+    sys.path.append(str(SHARED_SRC))
+
+from vstock_crash_score import calculate_crash_score, crash_radar, cutloss_levels, is_leverage_etf
+from vstock_monte_carlo import DEFAULT_PATHS, monte_carlo_analysis
+from vstock_strategy_sim import compare_strategies
+from chart_lod import LODController, PriceOverlays
+from tk_jobs import TkJobExecutor
+
+# 차트 기간: (봉 수, 제목)
+CHART_PERIODS = {
+    "30일": (30, "30 Days"),
+    "90일": (90, "90 Days"),
+    "1년": (252, "1 Year"),
+    "3년": (252 * 3, "3 Years"),
+    "10년": (252 * 10, "10 Years")
+}
+
 class VStockAdvancedPro:
     """VStock Advanced Pro 메인 애플리케이션 클래스 v3.3 - 완전 기능 버전"""
     
@@ -39,6 +59,8 @@ class VStockAdvancedPro:
         
         # 초기화
         self.current_data = None
+        self.chart_overlays = None  # current_data 기준 이동평균 캐시
+        self.jobs = TkJobExecutor(self.root)  # 파일 로드/분석 작업 (새 요청이 이전 요청 취소)
         self.current_symbol = ""
         self.korean_stocks = {}
         self.entry_price = None
@@ -498,34 +520,26 @@ Version: 3.3.0 - Complete Feature Version
             
             self.ax.clear()
             
+            # 이동평균/마스크는 전체 데이터로 한 번만 계산 (기간 변경·MA 토글은 슬라이스만)
+            if self.chart_overlays is None or not self.chart_overlays.is_for(self.current_data):
+                self.chart_overlays = PriceOverlays(self.current_data, (5, 20, 60, 200))
+            overlays = self.chart_overlays
+            
             # 기간별 데이터 선택
             period = self.chart_period.get()
-            if period == "30일":
-                chart_data = self.current_data.tail(30)
-                title_period = "30 Days"
-            elif period == "90일":
-                chart_data = self.current_data.tail(90)
-                title_period = "90 Days"
-            elif period == "1년":
-                chart_data = self.current_data.tail(252)
-                title_period = "1 Year"
-            elif period == "3년":
-                chart_data = self.current_data.tail(252*3)
-                title_period = "3 Years"
-            elif period == "10년":
-                chart_data = self.current_data.tail(252*10)
-                title_period = "10 Years"
-            else:
-                chart_data = self.current_data.tail(90)
-                title_period = "90 Days"
+            period_bars, title_period = CHART_PERIODS.get(period, CHART_PERIODS["90일"])
+            window = overlays.tail(period_bars)
+            chart_data = self.current_data.iloc[window]
             
             if chart_data.empty:
                 return
             
-            # 가격 차트
-            self.ax.plot(chart_data.index, chart_data['Close'], 'b-', linewidth=3, label='Close Price', alpha=0.8)
+            # 가격 차트 (10년처럼 봉이 픽셀보다 많으면 LOD가 보이는 구간만 축약, 확대 시 세분화)
+            x = overlays.x[window]
+            self.chart_lod = LODController([self.ax])
+            self.chart_lod.add_line(self.ax, x, overlays.close[window], color='b', linewidth=3, label='Close Price', alpha=0.8)
             
-            # 이동평균선들
+            # 이동평균선들 (기간 앞부분도 이전 데이터로 계산된 값 표시)
             colors = ['red', 'orange', 'green', 'purple']
             ma_settings = [
                 (self.show_ma5.get(), 5, 'MA5', colors[0]),
@@ -535,9 +549,11 @@ Version: 3.3.0 - Complete Feature Version
             ]
             
             for show, period_days, label, color in ma_settings:
-                if show and len(chart_data) >= period_days:
-                    ma = chart_data['Close'].rolling(period_days).mean()
-                    self.ax.plot(chart_data.index, ma, color=color, linewidth=2, alpha=0.7, label=label)
+                ma = overlays.ma[period_days][window]
+                if show and np.isfinite(ma).any():
+                    self.chart_lod.add_line(self.ax, x, ma, color=color, linewidth=2, alpha=0.7, label=label)
+            
+            self.chart_lod.show_all()
             
             # 진입가 라인 표시
             try:
@@ -807,6 +823,9 @@ Version: 3.3.0 - Complete Feature Version
             elif strategy == "pyramid":
                 result_text += self.calculate_pyramid_investment(budget, current_price, splits, drop_rate)
             
+            # 과거 전체 시작일 재생 비교
+            result_text += self.historical_strategy_replay(budget, splits, drop_rate, strategy)
+            
             # 추가 분석
             result_text += self.add_investment_analysis(budget, current_price, strategy)
             
@@ -1025,6 +1044,39 @@ Version: 3.3.0 - Complete Feature Version
         
         return result
     
+    def historical_strategy_replay(self, budget, splits, drop_rate, strategy):
+        """과거 가격으로 모든 시작일에서 일괄/DCA/피라미드 재생 비교"""
+        close = self.current_data['Close'].dropna()
+        horizon = min(252, len(close) // 2)
+        if horizon < splits:
+            return "\n📜 Historical Replay: 데이터가 부족합니다.\n"
+        interval = max(1, min(21, horizon // splits))
+        
+        try:
+            summary, _ = compare_strategies(close, budget, splits, drop_rate, interval, horizon)
+        except ValueError as e:
+            return f"\n📜 Historical Replay: {e}\n"
+        
+        result = f"""
+
+📜 Historical Replay (every start date, {horizon}-day hold):
+• DCA: {splits} buys every {interval} days / Pyramid: {splits} levels every {drop_rate*100:.1f}% drop
+• Start dates tested: {int(summary['starts'].iloc[0])}
+
+  Strategy   Median P&L   5%~95% P&L          Win Rate   Avg MAE   Worst MAE(5%)  Deployed
+"""
+        for name, row in summary.iterrows():
+            marker = "▶" if name == strategy else " "
+            result += (f"{marker} {name.upper():<9} {row['pnl_median']:>+8.1f}%  "
+                       f"{row['pnl_p5']:>+7.1f}% ~ {row['pnl_p95']:>+7.1f}%  {row['win_rate']:>7.1f}%  "
+                       f"{row['mae_mean']:>+7.1f}%  {row['mae_p5']:>+11.1f}%  {row['deployed_pct']:>7.1f}%\n")
+        
+        result += """
+• P&L: 보유 기간 종료 시점 평가손익 (예산 대비, 미집행 금액은 현금)
+• MAE: 보유 중 가장 컸던 평가손실 (Max Adverse Excursion)
+"""
+        return result
+    
     def add_investment_analysis(self, budget, current_price, strategy):
         """추가 투자 분석"""
         data = self.current_data
@@ -1275,7 +1327,7 @@ at lower levels for high-volatility stocks.
             self.handle_exception(e, True)
     
     def scenario_analysis(self):
-        """시나리오 분석"""
+        """시나리오 분석 - 과거 수익률 몬테카를로 시뮬레이션"""
         try:
             if self.current_data is None:
                 messagebox.showwarning("⚠️", "먼저 종목 데이터를 로드해주세요.")
@@ -1287,61 +1339,77 @@ at lower levels for high-volatility stocks.
                 messagebox.showerror("❌", "올바른 예산을 입력해주세요.")
                 return
             
-            current_price = self.current_data['Close'].iloc[-1]
-            symbol = self.current_symbol
-            shares = budget / current_price
-            
-            scenarios = [
-                ("Bull Market (+30%)", 1.30),
-                ("Moderate Growth (+15%)", 1.15),
-                ("Slight Growth (+5%)", 1.05),
-                ("Flat Market (0%)", 1.00),
-                ("Minor Decline (-5%)", 0.95),
-                ("Correction (-15%)", 0.85),
-                ("Bear Market (-30%)", 0.70),
-                ("Crash (-50%)", 0.50)
-            ]
+            symbol = self.current_symbol.upper()
+            _, cutloss_rates = cutloss_levels(symbol)
+            
+            self.investment_results.delete('1.0', tk.END)
+            self.investment_results.insert('1.0', f"🎲 {symbol} 몬테카를로 시뮬레이션 중 ({DEFAULT_PATHS:,}개 경로)...")
+            
+            # 경로 시뮬레이션은 작업 스레드 (다시 누르면 이전 요청 취소)
+            self.jobs.submit(
+                'scenario', monte_carlo_analysis,
+                self.current_data['Close'].to_numpy(), budget, cutloss_rates,
+                on_success=lambda result: self.show_scenario_analysis(symbol, budget, result),
+                on_error=lambda e: self.handle_exception(e, True)
+            )
+            
+        except Exception as e:
+            self.handle_exception(e, True)
+    
+    def show_scenario_analysis(self, symbol, budget, result):
+        """Tk 스레드: 몬테카를로 결과 표시"""
+        try:
+            current_price = result['current_price']
+            method_name = "Historical Bootstrap" if result['method'] == 'bootstrap' else "GBM"
             
             scenario_text = f"""💹 Investment Scenario Analysis for {symbol}
 
 Investment: ${budget:,.2f} @ ${current_price:.2f}
-Shares: {shares:.2f}
+Shares: {result['shares']:.2f}
+
+🎲 Monte Carlo Simulation:
+• Method: {method_name} ({result['history_days']} daily returns, vol {result['daily_volatility']:.2f}%/day)
+• Paths: {result['n_paths']:,}
+• Horizon: {result['horizon']} trading days
 
-📊 Scenario Analysis:
+📊 Scenario Analysis (P&L percentiles):
 """
             
-            for scenario_name, multiplier in scenarios:
-                new_price = current_price * multiplier
-                new_value = shares * new_price
-                profit_loss = new_value - budget
-                profit_loss_pct = (profit_loss / budget) * 100
-                
+            scenario_names = {5: "Bear Case (5%)", 25: "Weak Case (25%)", 50: "Median (50%)",
+                              75: "Strong Case (75%)", 95: "Bull Case (95%)"}
+            for percentile, name in scenario_names.items():
+                pnl_pct = result['percentiles'][percentile]
                 scenario_text += f"""
-{scenario_name}:
-  Price: ${new_price:.2f}
-  Value: ${new_value:,.2f}
-  P&L: ${profit_loss:+,.2f} ({profit_loss_pct:+.1f}%)
+{name}:
+  Price: ${result['price_percentiles'][percentile]:.2f}
+  Value: ${budget * (1 + pnl_pct / 100):,.2f}
+  P&L: ${budget * pnl_pct / 100:+,.2f} ({pnl_pct:+.1f}%)
 """
             
             scenario_text += f"""
 
-📊 Probability Analysis:
-Based on historical volatility, estimated probabilities:
-• +15% or more: 25%
-• +5% to +15%: 25%
-• -5% to +5%: 30%
-• -15% to -5%: 15%
-• -15% or less: 5%
-
+📊 Probability Analysis (simulated):
+"""
+            for label, probability in result['buckets']:
+                scenario_text += f"• {label}: {probability:.1f}%\n"
+            
+            scenario_text += f"""
 💡 Investment Insights:
-• Positive scenarios: 50% probability
-• Negative scenarios: 20% probability
-• Neutral scenarios: 30% probability
+• Expected P&L: ${result['expected_pnl']:+,.2f} ({result['expected_pnl_pct']:+.1f}%)
+• Probability of profit: {result['prob_profit']:.1f}%
+• VaR ({result['confidence']:.0%}): ${result['var']:,.2f}
+• CVaR ({result['confidence']:.0%}): ${result['cvar']:,.2f}
 
+✂️ Cut-loss Hit Probability (within {result['horizon']} days, closing prices):
+"""
+            for label, rate, price, probability in result['cutloss_hits']:
+                scenario_text += f"• {label} ${price:.2f} (-{(1 - rate) * 100:.0f}%): {probability:.1f}%\n"
+            
+            scenario_text += """
 ⚠️ Risk Management:
+• Simulation assumes future returns resemble the loaded history
 • Set stop-loss at acceptable loss level
-• Consider position sizing based on scenarios
-• Monitor for changing market conditions
+• Consider position sizing based on VaR/CVaR
 """
             
             self.investment_results.delete('1.0', tk.END)
@@ -1395,6 +1463,9 @@ Based on historical volatility, estimated probabilities:
             ttk.Button(left_panel, text="🚨 종합 폭락 분석", 
                       command=lambda: self.safe_execute(self.comprehensive_crash_analysis)).pack(fill=tk.X, pady=8, ipady=8)
             
+            ttk.Button(left_panel, text="📡 관심종목 폭락 레이더", 
+                      command=lambda: self.safe_execute(self.watchlist_crash_radar)).pack(fill=tk.X, pady=8, ipady=8)
+            
             ttk.Button(left_panel, text="✂️ 최적 손절 레벨 계산", 
                       command=lambda: self.safe_execute(self.calculate_optimal_cutloss)).pack(fill=tk.X, pady=8, ipady=8)
             
@@ -1536,96 +1607,23 @@ Based on historical volatility, estimated probabilities:
                 messagebox.showwarning("⚠️", "먼저 데이터를 로드해주세요.")
                 return
             
-            # 다양한 기간으로 분석
-            data = self.current_data
-            recent_5 = data.tail(5)
-            recent_10 = data.tail(10)
-            recent_20 = data.tail(20)
-            recent_60 = data.tail(60)
-            
-            latest_price = data['Close'].iloc[-1]
-            
-            # 다양한 최고점에서의 하락률
-            max_5d = recent_5['High'].max()
-            max_10d = recent_10['High'].max()
-            max_20d = recent_20['High'].max()
-            max_60d = recent_60['High'].max()
-            max_52w = data['High'].max()
-            
-            drop_5d = ((latest_price - max_5d) / max_5d) * 100
-            drop_10d = ((latest_price - max_10d) / max_10d) * 100
-            drop_20d = ((latest_price - max_20d) / max_20d) * 100
-            drop_60d = ((latest_price - max_60d) / max_60d) * 100
-            drop_52w = ((latest_price - max_52w) / max_52w) * 100
-            
-            # 변동성 계산 (연환산)
-            returns_5d = recent_5['Close'].pct_change().dropna()
-            returns_10d = recent_10['Close'].pct_change().dropna()
-            returns_20d = recent_20['Close'].pct_change().dropna()
-            
-            volatility_5d = returns_5d.std() * np.sqrt(252) * 100 if len(returns_5d) > 1 else 0
-            volatility_10d = returns_10d.std() * np.sqrt(252) * 100 if len(returns_10d) > 1 else 0
-            volatility_20d = returns_20d.std() * np.sqrt(252) * 100 if len(returns_20d) > 1 else 0
-            
-            # 거래량 분석
-            volume_avg_20d = recent_20['Volume'].mean() if len(recent_20) > 0 else 0
-            volume_recent_5d = recent_5['Volume'].mean() if len(recent_5) > 0 else 0
-            volume_spike = (volume_recent_5d / volume_avg_20d - 1) * 100 if volume_avg_20d > 0 else 0
-            
-            # 연속 하락일 계산
-            consecutive_down = 0
-            prices = data['Close'].tail(10).tolist()
-            for i in range(len(prices)-1, 0, -1):
-                if prices[i] < prices[i-1]:
-                    consecutive_down += 1
-                else:
-                    break
-            
-            # 종합 위험 점수 계산 (0-100)
-            risk_factors = {
-                'drop_severity': min(35, abs(drop_10d) * 1.8),  # 최대 35점
-                'volatility_risk': min(25, volatility_5d * 0.4),   # 최대 25점
-                'volume_panic': min(15, max(0, volume_spike * 0.15)),  # 최대 15점
-                'trend_breakdown': min(15, max(0, abs(drop_20d) * 0.4)),   # 최대 15점
-                'consecutive_decline': min(10, consecutive_down * 2)  # 최대 10점
-            }
-            
-            total_risk_score = sum(risk_factors.values())
-            
-            # 레버리지 ETF 가산점
+            # 폭락 위험 점수 계산 (vstock_crash_score 모듈)
             symbol = self.current_symbol.upper()
-            leverage_etfs = ['SOXL', 'TQQQ', 'UPRO', 'TMF', 'SPXL', 'TECL', 'FNGU', 'WEBL', 'TSLL']
-            is_leverage = any(etf in symbol for etf in leverage_etfs)
-            
-            if is_leverage:
-                total_risk_score = min(100, total_risk_score * 1.3)  # 30% 가산
-            
-            # 위험도 등급 결정
-            if total_risk_score < 20:
-                severity_level = "NORMAL"
-                severity_emoji = "📈"
-                recommendation = "정상 보유 - 주의 깊게 관찰"
-                action_color = "green"
-            elif total_risk_score < 40:
-                severity_level = "MODERATE_DECLINE"
-                severity_emoji = "📊"
-                recommendation = "주의 필요 - 포지션 점검"
-                action_color = "orange"
-            elif total_risk_score < 60:
-                severity_level = "SIGNIFICANT_DROP"
-                severity_emoji = "⚠️"
-                recommendation = "위험 - 손절 고려"
-                action_color = "red"
-            elif total_risk_score < 80:
-                severity_level = "SEVERE_CRASH"
-                severity_emoji = "🚨"
-                recommendation = "심각 - 즉시 대응 필요"
-                action_color = "red"
-            else:
-                severity_level = "EXTREME_CRASH"
-                severity_emoji = "💥"
-                recommendation = "극한 상황 - 긴급 대응"
-                action_color = "red"
+            score = calculate_crash_score(self.current_data, symbol)
+            
+            latest_price = score['latest_price']
+            drop_5d, drop_10d, drop_20d = score['drop_5d'], score['drop_10d'], score['drop_20d']
+            drop_60d, drop_52w = score['drop_60d'], score['drop_52w']
+            volatility_5d, volatility_10d = score['volatility_5d'], score['volatility_10d']
+            volatility_20d = score['volatility_20d']
+            volume_spike = score['volume_spike']
+            consecutive_down = score['consecutive_down']
+            risk_factors = score['risk_factors']
+            total_risk_score = score['total_risk_score']
+            is_leverage = score['is_leverage']
+            severity_level = score['severity_level']
+            severity_emoji = score['severity_emoji']
+            recommendation = score['recommendation']
             
             # 분석 결과 생성
             analysis_result = f"""🚨 VStock 종합 폭락 분석 결과
@@ -1731,6 +1729,154 @@ Based on historical volatility, estimated probabilities:
         except Exception as e:
             self.handle_exception(e, True)
     
+    def watchlist_crash_radar(self):
+        """관심종목 폭락 레이더 - 내 종목 + 인기 종목 전체 위험 점수 순위"""
+        try:
+            symbols = list(dict.fromkeys(self.my_stocks + self.popular_stocks))
+            self.log_info(f"폭락 레이더 시작: {len(symbols)}개 종목")
+            self.crash_status_label.config(text=f"📡 {len(symbols)}개 종목 스캔 중...")
+            
+            # 데이터 로드/다운로드는 작업 스레드 (다시 누르면 이전 스캔 취소)
+            self.jobs.submit(
+                'radar', self.prepare_crash_radar, symbols,
+                on_success=self.show_crash_radar,
+                on_error=lambda e: self.handle_exception(e, True),
+                with_token=True
+            )
+            
+        except Exception as e:
+            self.handle_exception(e, True)
+    
+    def prepare_crash_radar(self, token, symbols):
+        """작업 스레드: 오늘 받은 CSV는 재사용, 나머지는 한 번에 다운로드 후 일괄 점수 계산"""
+        data_dir = Path("data")
+        data_dir.mkdir(exist_ok=True)
+        today = datetime.now().strftime("%y%m%d")
+        
+        frames = {}
+        stale = []
+        for symbol in symbols:
+            filepath = data_dir / f"{symbol}_{today}.csv"
+            data = self.read_price_csv(filepath) if filepath.exists() else None
+            if data is not None:
+                frames[symbol] = data
+            else:
+                stale.append(symbol)
+        token.check()
+        
+        if stale:
+            frames.update(self.download_watchlist(stale, data_dir, today))
+            token.check()
+        
+        # 다운로드 실패 종목은 예전 파일이라도 사용 (읽을 수 없는 파일은 데이터 없음으로 표시)
+        for symbol in symbols:
+            if symbol not in frames:
+                old_files = list(data_dir.glob(f"{symbol}_*.csv"))
+                if old_files:
+                    data = self.read_price_csv(max(old_files, key=lambda x: x.stat().st_mtime))
+                    if data is not None:
+                        frames[symbol] = data
+        
+        missing = [symbol for symbol in symbols if symbol not in frames]
+        return crash_radar(frames), missing
+    
+    def read_price_csv(self, filepath):
+        """
+        가격 CSV 로드 (yfinance 다중 헤더의 Ticker/Date 행 같은 비날짜 행 제거, OHLCV 숫자 변환)
+        
+        Returns:
+            pd.DataFrame: 날짜 인덱스 OHLCV 데이터, 읽을 수 없으면 None
+        """
+        try:
+            data = pd.read_csv(filepath, index_col=0)
+            data.index = pd.to_datetime(data.index, errors='coerce')
+            data = data[data.index.notna()]
+            for column in ['Open', 'High', 'Low', 'Close', 'Volume']:
+                if column in data.columns:
+                    data[column] = pd.to_numeric(data[column], errors='coerce')
+            
+            if not {'High', 'Close', 'Volume'}.issubset(data.columns):
+                raise ValueError("High/Close/Volume 컬럼 없음")
+            data = data.dropna(subset=['Close'])
+            if data.empty:
+                raise ValueError("가격 데이터 없음")
+            return data
+        except Exception as e:
+            self.log_warning(f"CSV 읽기 실패 ({Path(filepath).name}): {e}")
+            return None
+    
+    def download_watchlist(self, symbols, data_dir, today):
+        """여러 종목 multi-ticker 요청 한 번으로 다운로드 후 종목별 CSV 저장"""
+        yahoo_symbols = {}
+        for symbol in symbols:
+            is_korean = symbol.isdigit() and len(symbol) == 6
+            yahoo_symbols[f"{symbol}.KS" if is_korean else symbol] = symbol
+        
+        try:
+            wide = yf.download(list(yahoo_symbols), period="2y", group_by='ticker',
+                               auto_adjust=True, progress=False, threads=True)
+        except Exception as e:
+            self.log_warning(f"레이더 다운로드 실패: {e}")
+            return {}
+        
+        frames = {}
+        for yahoo_symbol, symbol in yahoo_symbols.items():
+            try:
+                data = wide[yahoo_symbol] if isinstance(wide.columns, pd.MultiIndex) else wide
+            except KeyError:
+                continue
+            data = data.dropna(how='all')
+            if data.empty:
+                continue
+            
+            data.to_csv(data_dir / f"{symbol}_{today}.csv")
+            frames[symbol] = data
+        return frames
+    
+    def show_crash_radar(self, result):
+        """Tk 스레드: 레이더 결과 순위표 표시"""
+        try:
+            table, missing = result
+            if table.empty:
+                messagebox.showwarning("⚠️", "레이더에 사용할 데이터가 없습니다.")
+                return
+            
+            radar_result = f"""📡 VStock 관심종목 폭락 레이더
+
+{'=' * 60}
+⏰ 분석 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+📊 대상: {len(table)}개 종목 (위험 점수 순)
+
+{'순위':>4} {'종목':<8} {'점수':>6}  {'10일':>7} {'20일':>7} {'52주':>7} {'변동성':>7} {'거래량':>7}  등급
+"""
+            for symbol, row in table.iterrows():
+                radar_result += (f"{row['rank']:>4} {symbol:<8} {row['total_risk_score']:>6.1f}  "
+                                 f"{row['drop_10d']:>6.1f}% {row['drop_20d']:>6.1f}% {row['drop_52w']:>6.1f}% "
+                                 f"{row['volatility_5d']:>6.1f}% {row['volume_spike']:>+6.0f}%  "
+                                 f"{row['severity_emoji']} {row['severity_level']}\n")
+            
+            if missing:
+                radar_result += f"\n⚠️ 데이터 없음: {', '.join(missing)}\n"
+            
+            radar_result += """
+• 10일/20일/52주: 각 기간 최고점 대비 하락률
+• 변동성: 5일 연환산 변동성 / 거래량: 20일 평균 대비 최근 5일 거래량
+• 상위 종목은 '종합 폭락 분석'으로 개별 정밀 분석을 권장합니다.
+"""
+            
+            self.crash_results.delete('1.0', tk.END)
+            self.crash_results.insert('1.0', radar_result)
+            
+            top_symbol = table.index[0]
+            top = table.iloc[0]
+            self.crash_status_label.config(
+                text=f"최고 위험: {top_symbol} {top['total_risk_score']:.0f}/100\n{top['severity_emoji']} {top['severity_level']}")
+            self.crash_recommendation_label.config(text=top['recommendation'])
+            self.log_info(f"폭락 레이더 완료: {len(table)}개 종목")
+            
+        except Exception as e:
+            self.handle_exception(e, True)
+    
     def calculate_optimal_cutloss(self):
         """최적 손절 레벨 계산 - 완전 구현"""
         try:
@@ -1745,15 +1891,8 @@ Based on historical volatility, estimated probabilities:
             symbol = self.current_symbol.upper()
             
             # 레버리지 ETF 확인
-            leverage_etfs = ['SOXL', 'TQQQ', 'UPRO', 'TMF', 'SPXL', 'TECL', 'FNGU', 'WEBL', 'TSLL']
-            is_leverage = any(etf in symbol for etf in leverage_etfs)
-            
-            if is_leverage:
-                cutloss_rates = [0.88, 0.85, 0.82]  # 12%, 15%, 18%
-                asset_type = "레버리지 ETF"
-            else:
-                cutloss_rates = [0.90, 0.85, 0.80]  # 10%, 15%, 20%
-                asset_type = "일반 주식"
+            is_leverage = is_leverage_etf(symbol)
+            asset_type, cutloss_rates = cutloss_levels(symbol)
             
             cutloss_result = f"""✂️ VStock 최적 손절 레벨 계산
 
@@ -1766,8 +1905,7 @@ Based on historical volatility, estimated probabilities:
 📈 권장 손절가:
 """
             
-            labels = ["보수적", "표준", "공격적"]
-            for i, (rate, label) in enumerate(zip(cutloss_rates, labels)):
+            for label, rate in cutloss_rates:
                 cutloss_price = latest_price * rate
                 loss_pct = (1 - rate) * 100
                 cutloss_result += f"• {label}: ${cutloss_price:.2f} ({loss_pct:.0f}% 손절)\n"
@@ -2193,16 +2331,43 @@ Generated by VStock Advanced Pro v3.3 Crash Strategy Module
                 messagebox.showerror("❌", f"파일을 찾을 수 없습니다: {filepath}")
                 return
             
-            # CSV 파일 로드
-            data = pd.read_csv(filepath, index_col=0)
+            # CSV 로드/이동평균 계산은 작업 스레드 (빠르게 다른 파일을 고르면 이전 요청 취소)
+            self.log_info(f"파일 로드 중: {filepath.name}")
+            self.jobs.submit(
+                'analyze', self.prepare_file_analysis, filepath,
+                on_success=self.show_loaded_file,
+                on_error=lambda e: self.handle_exception(e, True),
+                with_token=True
+            )
             
-            # 인덱스를 datetime으로 변환
-            try:
-                data.index = pd.to_datetime(data.index)
-            except:
+        except Exception as e:
+            self.handle_exception(e, True)
+    
+    def prepare_file_analysis(self, token, filepath):
+        """작업 스레드: CSV 로드 + 차트 오버레이 계산 (Tk 위젯 접근 금지)"""
+        data = pd.read_csv(filepath, index_col=0)
+        
+        # 인덱스를 datetime으로 변환
+        try:
+            data.index = pd.to_datetime(data.index)
+            dates_parsed = True
+        except:
+            dates_parsed = False
+        token.check()
+        
+        overlays = PriceOverlays(data, (5, 20, 60, 200))
+        token.check()
+        return filepath, data, overlays, dates_parsed
+    
+    def show_loaded_file(self, result):
+        """Tk 스레드: 로드된 파일 분석/표시"""
+        try:
+            filepath, data, overlays, dates_parsed = result
+            if not dates_parsed:
                 self.log_warning(f"날짜 변환 실패: {filepath.name}")
             
             self.current_data = data
+            self.chart_overlays = overlays
             
             # 파일명에서 종목 코드 추출
             if '_' in filepath.name:
@@ -2573,6 +2738,8 @@ Generated by VStock Advanced Pro v3.3 Crash Strategy Module
             self.root.mainloop()
         except Exception as e:
             self.handle_exception(e, True)
+        finally:
+            self.jobs.shutdown()
 
 # 애플리케이션 실행
 if __name__ == "__main__":
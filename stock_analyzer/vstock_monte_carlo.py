@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VStock Monte Carlo - 과거 수익률 기반 가격 경로 시뮬레이션 (GUI 없이 사용 가능)
+- bootstrap: 과거 일간 로그수익률을 복원 추출
+- gbm: 과거 평균/표준편차의 정규분포 로그수익률
+경로 묶음을 (경로 수, 기간) 배열 하나로 계산하고, 경로가 아주 많으면 프로세스 풀로 나눠 실행
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_PATHS = 100_000
+DEFAULT_HORIZON = 60  # 거래일 (약 3개월)
+CHUNK_ELEMENTS = 4_000_000  # 묶음 하나의 (경로 수 x 기간) 최대 크기 (메모리 약 32MB)
+
+# P&L 구간 (%) - 기존 고정 확률 표와 같은 경계
+PNL_BUCKETS = [
+    ("+15% 이상", 15, np.inf),
+    ("+5% ~ +15%", 5, 15),
+    ("-5% ~ +5%", -5, 5),
+    ("-15% ~ -5%", -15, -5),
+    ("-15% 이하", -np.inf, -15)
+]
+
+
+def log_returns(close):
+    """종가 → 일간 로그수익률 (결측 제외)"""
+    close = np.asarray(close, dtype=float)
+    with np.errstate(all='ignore'):
+        returns = np.diff(np.log(close))
+    return returns[np.isfinite(returns)]
+
+
+def simulate_chunk(returns, n_paths, horizon, method='bootstrap', seed=None):
+    """
+    경로 묶음 하나 시뮬레이션 (프로세스 풀에서도 실행 - 모듈 함수)
+
+    Args:
+        returns (np.ndarray): 과거 일간 로그수익률
+        n_paths (int): 경로 수
+        horizon (int): 기간 (거래일)
+        method (str): 'bootstrap' 또는 'gbm'
+        seed: 난수 시드 (int 또는 SeedSequence)
+
+    Returns:
+        tuple: (만기 가격/현재가 배열, 경로 중 최저 가격/현재가 배열)
+    """
+    rng = np.random.default_rng(seed)
+    if method == 'bootstrap':
+        steps = returns[rng.integers(0, len(returns), size=(n_paths, horizon))]
+    elif method == 'gbm':
+        steps = rng.normal(returns.mean(), returns.std(ddof=1), size=(n_paths, horizon))
+    else:
+        raise ValueError(f"지원하지 않는 시뮬레이션 방식: {method}")
+
+    paths = np.cumsum(steps, axis=1, out=steps)
+    # 시작점(0)도 최저값 후보 - 바로 오르기만 한 경로는 최저 비율 1
+    return np.exp(paths[:, -1]), np.exp(np.minimum(paths.min(axis=1), 0))
+
+
+def simulate_paths(returns, n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON, method='bootstrap',
+                   seed=None, workers=None):
+    """
+    가격 경로 시뮬레이션 (메모리 제한을 위해 묶음 단위로 나눠 계산)
+
+    묶음마다 SeedSequence 자식 시드를 쓰므로 workers와 무관하게 같은 seed면 같은 결과
+
+    Args:
+        returns (np.ndarray): 과거 일간 로그수익률
+        n_paths (int): 경로 수
+        horizon (int): 기간 (거래일)
+        method (str): 'bootstrap' 또는 'gbm'
+        seed (int): 난수 시드 (None이면 매번 다름)
+        workers (int): 프로세스 수 (None/1이면 현재 프로세스에서 실행)
+
+    Returns:
+        tuple: (만기 가격/현재가 배열, 경로 중 최저 가격/현재가 배열)
+    """
+    returns = np.asarray(returns, dtype=float)
+    if len(returns) < 2:
+        raise ValueError("시뮬레이션에 필요한 수익률 데이터가 부족합니다.")
+
+    chunk_paths = max(CHUNK_ELEMENTS // horizon, 1)
+    sizes = [min(chunk_paths, n_paths - start) for start in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(returns, size, horizon, method, child) for size, child in zip(sizes, seeds)]
+
+    if workers and workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(simulate_chunk, *zip(*jobs)))
+    else:
+        results = [simulate_chunk(*job) for job in jobs]
+
+    terminal = np.concatenate([result[0] for result in results])
+    lowest = np.concatenate([result[1] for result in results])
+    return terminal, lowest
+
+
+def monte_carlo_analysis(close, budget, cutloss_rates=(), n_paths=DEFAULT_PATHS, horizon=DEFAULT_HORIZON,
+                         method='bootstrap', confidence=0.95, seed=None, workers=None):
+    """
+    몬테카를로 시나리오 분석
+
+    Args:
+        close (array-like): 과거 종가 (마지막 값 = 현재가)
+        budget (float): 투자 금액
+        cutloss_rates (list): [(이름, 손절가/현재가 비율), ...] - 기간 중 종가 기준 도달 확률 계산
+        n_paths (int): 경로 수
+        horizon (int): 기간 (거래일)
+        method (str): 'bootstrap' 또는 'gbm'
+        confidence (float): VaR/CVaR 신뢰수준
+        seed (int): 난수 시드
+        workers (int): 프로세스 수
+
+    Returns:
+        dict: P&L 분포(백분위/구간 확률), 기대값, 상승 확률, VaR/CVaR, 손절선 도달 확률
+    """
+    close = np.asarray(close, dtype=float)
+    current_price = close[np.isfinite(close)][-1]
+    returns = log_returns(close)
+
+    terminal, lowest = simulate_paths(returns, n_paths, horizon, method, seed, workers)
+    pnl_pct = (terminal - 1) * 100
+    pnl = budget * (terminal - 1)
+
+    # VaR: 신뢰수준 하위 분위 손실, CVaR: 그보다 나쁜 경로들의 평균 손실
+    cutoff = np.percentile(pnl, (1 - confidence) * 100)
+    tail = pnl[pnl <= cutoff]
+
+    percentiles = [5, 25, 50, 75, 95]
+    return {
+        'current_price': current_price,
+        'shares': budget / current_price,
+        'n_paths': len(terminal),
+        'horizon': horizon,
+        'method': method,
+        'history_days': len(returns),
+        'daily_volatility': returns.std(ddof=1) * 100,
+        'percentiles': dict(zip(percentiles, np.percentile(pnl_pct, percentiles))),
+        'price_percentiles': dict(zip(percentiles, current_price * np.percentile(terminal, percentiles))),
+        'expected_pnl': pnl.mean(),
+        'expected_pnl_pct': pnl_pct.mean(),
+        'prob_profit': (pnl > 0).mean() * 100,
+        'buckets': [(label, ((pnl_pct >= low) & (pnl_pct < high)).mean() * 100)
+                    for label, low, high in PNL_BUCKETS],
+        'confidence': confidence,
+        'var': -cutoff,
+        'cvar': -tail.mean() if len(tail) else -cutoff,
+        'cutloss_hits': [(label, rate, current_price * rate, (lowest <= rate).mean() * 100)
+                         for label, rate in cutloss_rates]
+    }
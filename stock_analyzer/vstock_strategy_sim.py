@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+VStock Strategy Simulator - 일괄/DCA/피라미드 매수 계획을 실제 과거 가격으로 재생 (GUI 없이 사용 가능)
+가능한 모든 시작일을 (시작일 수, 보유 기간) 배열 하나로 동시에 계산
+- single: 시작일 종가에 전액 매수
+- dca: interval 거래일마다 같은 금액 매수
+- pyramid: 시작가 대비 drop_rate씩 내려갈 때마다 더 큰 금액 매수 (가중치 1, 2, ..., 도달하지 못한 단계는 현금 보유)
+"""
+
+import numpy as np
+import pandas as pd
+
+COMMISSION = 0.001  # 0.1% 수수료
+STRATEGIES = ['single', 'dca', 'pyramid']
+
+
+def _buy_plan(windows, strategy, splits, drop_rate, interval):
+    """
+    시작일별 매수 시점/비중
+
+    Returns:
+        tuple: (매수 시점 (시작일 수, 단계 수) - 창 안 위치, 미체결 -1 / 단계별 예산 비중 (단계 수,))
+    """
+    n_starts = len(windows)
+    if strategy == 'single':
+        return np.zeros((n_starts, 1), dtype=int), np.ones(1)
+
+    if strategy == 'dca':
+        offsets = np.arange(splits) * interval
+        return np.broadcast_to(offsets, (n_starts, splits)), np.full(splits, 1 / splits)
+
+    if strategy == 'pyramid':
+        weights = np.arange(1, splits + 1, dtype=float)
+        times = np.full((n_starts, splits), -1)
+        times[:, 0] = 0
+        for level in range(1, splits):
+            # 시작가 대비 drop_rate * level 하락한 첫 날 (그날 종가로 매수)
+            trigger = windows[:, :1] * (1 - drop_rate * level)
+            hit = windows <= trigger
+            times[:, level] = np.where(hit.any(axis=1), hit.argmax(axis=1), -1)
+        return times, weights / weights.sum()
+
+    raise ValueError(f"지원하지 않는 전략: {strategy}")
+
+
+def simulate_strategy(close, strategy, budget=10000, splits=4, drop_rate=0.05, interval=21,
+                      horizon=252, commission=COMMISSION):
+    """
+    모든 시작일에서 매수 계획을 재생
+
+    Args:
+        close (pd.Series): 종가 (인덱스: 날짜)
+        strategy (str): 'single', 'dca', 'pyramid'
+        budget (float): 총 예산
+        splits (int): 분할 횟수 (dca/pyramid)
+        drop_rate (float): 피라미드 단계 간 하락률 (0.05 = 5%)
+        interval (int): DCA 매수 간격 (거래일)
+        horizon (int): 보유 기간 (거래일) - 시작일부터 이 기간 뒤 종가로 평가
+        commission (float): 매수 수수료율
+
+    Returns:
+        pd.DataFrame: 시작일별 평균 단가, 집행 비율, 최종 손익, 최대 평가손실 (MAE)
+    """
+    if not isinstance(close, pd.Series):
+        close = pd.Series(close)
+    close = close.dropna().astype(float)
+    if len(close) <= horizon:
+        raise ValueError(f"데이터가 보유 기간({horizon}일)보다 짧습니다: {len(close)}일")
+    if strategy == 'dca' and (splits - 1) * interval > horizon:
+        raise ValueError(f"DCA 매수 일정({splits}회 x {interval}일)이 보유 기간을 넘습니다.")
+
+    # (시작일 수, horizon + 1) 창 - i행은 i번째 시작일부터의 종가
+    windows = np.lib.stride_tricks.sliding_window_view(close.to_numpy(), horizon + 1)
+    n_starts, length = windows.shape
+
+    times, weights = _buy_plan(windows, strategy, splits, drop_rate, interval)
+    executed = times >= 0
+    positions = np.where(executed, times, 0)
+    spend = np.where(executed, budget * weights, 0.0)
+    prices = np.take_along_axis(windows, positions, axis=1)
+    shares = spend * (1 - commission) / prices
+
+    # 날짜별 누적 보유 주식/지출 → 평가금액 (미집행 예산은 현금)
+    rows = np.broadcast_to(np.arange(n_starts)[:, None], positions.shape)
+    share_flow = np.zeros((n_starts, length))
+    spend_flow = np.zeros((n_starts, length))
+    np.add.at(share_flow, (rows, positions), shares)
+    np.add.at(spend_flow, (rows, positions), spend)
+    value = np.cumsum(share_flow, axis=1) * windows + (budget - np.cumsum(spend_flow, axis=1))
+
+    total_shares = shares.sum(axis=1)
+    total_spend = spend.sum(axis=1)
+    final_pnl = value[:, -1] - budget
+    avg_cost = total_spend * (1 - commission) / total_shares
+
+    return pd.DataFrame({
+        'start_price': windows[:, 0],
+        'end_price': windows[:, -1],
+        'avg_cost': avg_cost,
+        'avg_cost_vs_start': (avg_cost / windows[:, 0] - 1) * 100,
+        'deployed_pct': total_spend / budget * 100,
+        'buys': executed.sum(axis=1),
+        'final_pnl': final_pnl,
+        'final_pnl_pct': final_pnl / budget * 100,
+        'mae_pct': np.minimum(value.min(axis=1) - budget, 0) / budget * 100
+    }, index=close.index[:n_starts])
+
+
+def summarize_replay(replay):
+    """시작일별 결과 → 분포 요약 (평균/백분위/승률)"""
+    pnl = replay['final_pnl_pct']
+    mae = replay['mae_pct']
+    return {
+        'starts': len(replay),
+        'pnl_mean': pnl.mean(),
+        'pnl_median': pnl.median(),
+        'pnl_p5': pnl.quantile(0.05),
+        'pnl_p95': pnl.quantile(0.95),
+        'win_rate': (pnl > 0).mean() * 100,
+        'mae_mean': mae.mean(),
+        'mae_p5': mae.quantile(0.05),
+        'avg_cost_vs_start': replay['avg_cost_vs_start'].mean(),
+        'deployed_pct': replay['deployed_pct'].mean()
+    }
+
+
+def compare_strategies(close, budget=10000, splits=4, drop_rate=0.05, interval=21,
+                       horizon=252, commission=COMMISSION, strategies=STRATEGIES):
+    """
+    전략별 재생 결과 비교
+
+    Returns:
+        tuple: (전략별 분포 요약 DataFrame, {전략: 시작일별 결과 DataFrame})
+    """
+    replays = {
+        strategy: simulate_strategy(close, strategy, budget, splits, drop_rate, interval, horizon, commission)
+        for strategy in strategies
+    }
+    summary = pd.DataFrame({strategy: summarize_replay(replay) for strategy, replay in replays.items()}).T
+    summary.index.name = 'strategy'
+    return summary, replays
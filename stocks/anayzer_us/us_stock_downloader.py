@@ -3,8 +3,11 @@ yfinance를 이용한 미국 주식 데이터 다운로드 스크립트
 Yahoo Finance에서 미국 주식 데이터를 수집하여 CSV 파일로 저장
 """
 
+import itertools
 import os
+import queue
 import sys
+import threading
 import time
 import warnings
 from datetime import datetime, timedelta
@@ -13,26 +16,149 @@ from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 import yfinance as yf
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, as_completed, wait)
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # 경고 메시지 숨기기
 warnings.filterwarnings('ignore')
 
+def calculate_rsi(prices: pd.Series, window: int = 14) -> pd.Series:
+    """
+    RSI (Relative Strength Index) 계산
+    
+    Args:
+        prices (pd.Series): 가격 데이터
+        window (int): 계산 윈도우
+        
+    Returns:
+        pd.Series: RSI 값
+    """
+    delta = prices.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+def add_indicators(data: pd.DataFrame, 
+                   symbol: str, 
+                   stock_name: str, 
+                   filename: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    가격 데이터에 지표를 계산하고 저장 (CPU 단계)
+    
+    프로세스 풀에서 실행되므로 인스턴스 상태 없이 인자만 사용하는 모듈 함수
+    
+    Args:
+        data (pd.DataFrame): 가격 데이터 (인덱스: Date)
+        symbol (str): 종목 심볼
+        stock_name (str): 회사명
+        filename (str): 저장 경로 (None이면 저장하지 않음)
+        
+    Returns:
+        pd.DataFrame: 지표가 추가된 주식 데이터
+    """
+    try:
+        if data is None or data.empty:
+            print(f"경고: {symbol}의 데이터가 없습니다.")
+            return None
+        
+        # 데이터 전처리
+        data = data.reset_index()
+        data['Symbol'] = symbol
+        data['Stock_Name'] = stock_name
+        
+        # 수익률 및 지표 계산
+        data['Return_Rate'] = data['Close'].pct_change() * 100
+        data['Volatility'] = data['Return_Rate'].abs()
+        data['Trading_Value'] = data['Close'] * data['Volume']
+        data['MA_5'] = data['Close'].rolling(window=5).mean()
+        data['MA_20'] = data['Close'].rolling(window=20).mean()
+        data['MA_50'] = data['Close'].rolling(window=50).mean()
+        data['MA_200'] = data['Close'].rolling(window=200).mean()
+        
+        # 볼린저 밴드 (20일, 2표준편차)
+        data['BB_Middle'] = data['Close'].rolling(window=20).mean()
+        bb_std = data['Close'].rolling(window=20).std()
+        data['BB_Upper'] = data['BB_Middle'] + (bb_std * 2)
+        data['BB_Lower'] = data['BB_Middle'] - (bb_std * 2)
+        data['BB_Width'] = (data['BB_Upper'] - data['BB_Lower']) / data['BB_Middle'] * 100
+        data['BB_Position'] = (data['Close'] - data['BB_Lower']) / (data['BB_Upper'] - data['BB_Lower'])
+        
+        # RSI 계산 (14일)
+        data['RSI'] = calculate_rsi(data['Close'])
+        
+        # MACD 계산
+        exp1 = data['Close'].ewm(span=12).mean()
+        exp2 = data['Close'].ewm(span=26).mean()
+        data['MACD'] = exp1 - exp2
+        data['MACD_Signal'] = data['MACD'].ewm(span=9).mean()
+        data['MACD_Histogram'] = data['MACD'] - data['MACD_Signal']
+        
+        # Stochastic Oscillator
+        low_14 = data['Low'].rolling(window=14).min()
+        high_14 = data['High'].rolling(window=14).max()
+        data['Stoch_K'] = ((data['Close'] - low_14) / (high_14 - low_14)) * 100
+        data['Stoch_D'] = data['Stoch_K'].rolling(window=3).mean()
+        
+        # ATR (Average True Range)
+        data['TR'] = np.maximum(
+            data['High'] - data['Low'],
+            np.maximum(
+                abs(data['High'] - data['Close'].shift(1)),
+                abs(data['Low'] - data['Close'].shift(1))
+            )
+        )
+        data['ATR'] = data['TR'].rolling(window=14).mean()
+        
+        # Williams %R
+        data['Williams_R'] = ((high_14 - data['Close']) / (high_14 - low_14)) * -100
+        
+        # 컬럼 순서 정리
+        columns_order = [
+            'Date', 'Symbol', 'Stock_Name', 'Open', 'High', 'Low', 'Close', 'Volume', 
+            'Trading_Value', 'Return_Rate', 'Volatility',
+            'MA_5', 'MA_20', 'MA_50', 'MA_200',
+            'BB_Upper', 'BB_Middle', 'BB_Lower', 'BB_Width', 'BB_Position',
+            'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+            'Stoch_K', 'Stoch_D', 'ATR', 'Williams_R'
+        ]
+        
+        data = data[columns_order]
+        
+        # 파일 저장
+        if filename:
+            data.to_csv(filename, index=False, encoding='utf-8-sig')
+            print(f"저장 완료: {filename} ({len(data)}행)")
+        
+        return data
+    
+    except Exception as e:
+        print(f"처리 오류 ({symbol}): {str(e)}")
+        return None
+
 class USStockDownloader:
     """미국 주식 데이터 다운로드 클래스"""
     
-    def __init__(self, data_dir: str = "us_data"):
+    def __init__(self, data_dir: str = "us_data", history_provider: Optional[object] = None):
         """
         초기화
         
         Args:
             data_dir (str): 데이터 저장 디렉토리
+            history_provider: history()/bulk_history()를 가진 시세 제공자
+                (예: stock/src/data_providers.ReplayProvider, None이면 yfinance 직접 사용)
         """
         self.data_dir = data_dir
+        self.history_provider = history_provider
         self.date_key = datetime.now().strftime("%y%m%d")
         
+        # 개별 요청 간격 제한 (다운로드 스레드 간 공유)
+        self._request_lock = threading.Lock()
+        self._next_request_time = 0.0
+        
         # 데이터 디렉토리 생성
         os.makedirs(self.data_dir, exist_ok=True)
         
@@ -158,94 +284,118 @@ class USStockDownloader:
         print(f"다운로드 중: {stock_name} ({symbol})")
         
         try:
-            # yfinance 티커 생성
-            ticker = yf.Ticker(symbol)
-            
-            # 데이터 다운로드
-            if start_date and end_date:
-                data = ticker.history(start=start_date, end=end_date)
-            else:
-                data = ticker.history(period=period)
-            
-            if data.empty:
-                print(f"경고: {symbol}의 데이터가 없습니다.")
-                return None
-            
-            # 데이터 전처리
-            data.reset_index(inplace=True)
-            data['Symbol'] = symbol
-            data['Stock_Name'] = stock_name
-            
-            # 수익률 및 지표 계산
-            data['Return_Rate'] = data['Close'].pct_change() * 100
-            data['Volatility'] = data['Return_Rate'].abs()
-            data['Trading_Value'] = data['Close'] * data['Volume']
-            data['MA_5'] = data['Close'].rolling(window=5).mean()
-            data['MA_20'] = data['Close'].rolling(window=20).mean()
-            data['MA_50'] = data['Close'].rolling(window=50).mean()
-            data['MA_200'] = data['Close'].rolling(window=200).mean()
-            
-            # 볼린저 밴드 (20일, 2표준편차)
-            data['BB_Middle'] = data['Close'].rolling(window=20).mean()
-            bb_std = data['Close'].rolling(window=20).std()
-            data['BB_Upper'] = data['BB_Middle'] + (bb_std * 2)
-            data['BB_Lower'] = data['BB_Middle'] - (bb_std * 2)
-            data['BB_Width'] = (data['BB_Upper'] - data['BB_Lower']) / data['BB_Middle'] * 100
-            data['BB_Position'] = (data['Close'] - data['BB_Lower']) / (data['BB_Upper'] - data['BB_Lower'])
-            
-            # RSI 계산 (14일)
-            data['RSI'] = self.calculate_rsi(data['Close'])
-            
-            # MACD 계산
-            exp1 = data['Close'].ewm(span=12).mean()
-            exp2 = data['Close'].ewm(span=26).mean()
-            data['MACD'] = exp1 - exp2
-            data['MACD_Signal'] = data['MACD'].ewm(span=9).mean()
-            data['MACD_Histogram'] = data['MACD'] - data['MACD_Signal']
-            
-            # Stochastic Oscillator
-            low_14 = data['Low'].rolling(window=14).min()
-            high_14 = data['High'].rolling(window=14).max()
-            data['Stoch_K'] = ((data['Close'] - low_14) / (high_14 - low_14)) * 100
-            data['Stoch_D'] = data['Stoch_K'].rolling(window=3).mean()
-            
-            # ATR (Average True Range)
-            data['TR'] = np.maximum(
-                data['High'] - data['Low'],
-                np.maximum(
-                    abs(data['High'] - data['Close'].shift(1)),
-                    abs(data['Low'] - data['Close'].shift(1))
-                )
-            )
-            data['ATR'] = data['TR'].rolling(window=14).mean()
-            
-            # Williams %R
-            data['Williams_R'] = ((high_14 - data['Close']) / (high_14 - low_14)) * -100
-            
-            # 컬럼 순서 정리
-            columns_order = [
-                'Date', 'Symbol', 'Stock_Name', 'Open', 'High', 'Low', 'Close', 'Volume', 
-                'Trading_Value', 'Return_Rate', 'Volatility',
-                'MA_5', 'MA_20', 'MA_50', 'MA_200',
-                'BB_Upper', 'BB_Middle', 'BB_Lower', 'BB_Width', 'BB_Position',
-                'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
-                'Stoch_K', 'Stoch_D', 'ATR', 'Williams_R'
-            ]
-            
-            data = data[columns_order]
-            
-            # 파일 저장
-            if save_file:
-                filename = os.path.join(self.data_dir, f"{symbol}_{self.date_key}.csv")
-                data.to_csv(filename, index=False, encoding='utf-8-sig')
-                print(f"저장 완료: {filename} ({len(data)}행)")
-            
-            return data
+            data = self.fetch_history(symbol, period, start_date, end_date)
+            return self.process_stock_data(symbol, data, save_file)
             
         except Exception as e:
             print(f"오류 발생 ({symbol}): {str(e)}")
             return None
     
+    def fetch_history(self, 
+                      symbol: str, 
+                      period: str = "3y", 
+                      start_date: Optional[str] = None,
+                      end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        yfinance 티커 하나의 가격 이력 다운로드
+        
+        Args:
+            symbol (str): Yahoo Finance 심볼
+            period (str): 기간
+            start_date (str): 시작일 (YYYY-MM-DD)
+            end_date (str): 종료일 (YYYY-MM-DD)
+            
+        Returns:
+            pd.DataFrame: 가격 데이터 (인덱스: Date)
+        """
+        if self.history_provider is not None:
+            if start_date and end_date:
+                return self.history_provider.history(symbol, start=start_date, end=end_date)
+            return self.history_provider.history(symbol, period=period)
+        
+        ticker = yf.Ticker(symbol)
+        if start_date and end_date:
+            return ticker.history(start=start_date, end=end_date)
+        return ticker.history(period=period)
+    
+    def fetch_bulk_history(self, 
+                           symbols: List[str], 
+                           period: str = "3y",
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           chunk_size: int = 50) -> Dict[str, pd.DataFrame]:
+        """
+        여러 티커를 multi-ticker 요청으로 한 번에 다운로드 후 종목별로 분리
+        
+        Args:
+            symbols (List[str]): Yahoo Finance 심볼 리스트
+            period (str): 기간
+            start_date (str): 시작일
+            end_date (str): 종료일
+            chunk_size (int): 요청 하나에 넣을 최대 종목 수
+            
+        Returns:
+            Dict[str, pd.DataFrame]: 심볼별 가격 데이터 (받지 못한 종목은 제외)
+        """
+        if self.history_provider is not None:
+            if start_date and end_date:
+                return self.history_provider.bulk_history(symbols, start=start_date, end=end_date)
+            return self.history_provider.bulk_history(symbols, period=period)
+        
+        options = {'group_by': 'ticker', 'auto_adjust': True, 'actions': False,
+                   'ignore_tz': False, 'threads': True, 'progress': False}
+        if start_date and end_date:
+            options.update(start=start_date, end=end_date)
+        else:
+            options['period'] = period
+        
+        frames = {}
+        for i in range(0, len(symbols), chunk_size):
+            chunk = symbols[i:i + chunk_size]
+            try:
+                wide = yf.download(chunk, **options)
+            except Exception as e:
+                print(f"일괄 다운로드 오류 ({len(chunk)}개 종목): {str(e)}")
+                continue
+            
+            if wide is None or wide.empty:
+                continue
+            
+            if not isinstance(wide.columns, pd.MultiIndex):
+                if len(chunk) == 1:
+                    frames[chunk[0]] = wide.dropna(how='all')
+                continue
+            
+            level = 0 if set(chunk) & set(wide.columns.get_level_values(0)) else 1
+            for symbol in chunk:
+                try:
+                    frame = wide.xs(symbol, axis=1, level=level).dropna(how='all')
+                except KeyError:
+                    continue
+                if not frame.empty:
+                    frame.index.name = 'Date'
+                    frames[symbol] = frame.copy()
+        
+        return frames
+    
+    def process_stock_data(self, 
+                           symbol: str, 
+                           data: pd.DataFrame, 
+                           save_file: bool = True) -> Optional[pd.DataFrame]:
+        """
+        받은 가격 데이터에 지표를 계산하고 저장
+        
+        Args:
+            symbol (str): 종목 심볼
+            data (pd.DataFrame): 가격 데이터 (인덱스: Date)
+            save_file (bool): 파일 저장 여부
+            
+        Returns:
+            pd.DataFrame: 지표가 추가된 주식 데이터
+        """
+        filename = os.path.join(self.data_dir, f"{symbol}_{self.date_key}.csv") if save_file else None
+        return add_indicators(data, symbol, self.get_stock_info(symbol), filename)
+    
     def calculate_rsi(self, prices: pd.Series, window: int = 14) -> pd.Series:
         """
         RSI (Relative Strength Index) 계산
@@ -257,28 +407,34 @@ class USStockDownloader:
         Returns:
             pd.Series: RSI 값
         """
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return calculate_rsi(prices, window)
     
     def download_multiple_stocks(self, 
                                 symbols: List[str], 
                                 period: str = "3y",
                                 start_date: Optional[str] = None,
                                 end_date: Optional[str] = None,
-                                max_workers: int = 5) -> Dict[str, pd.DataFrame]:
+                                max_workers: int = 5,
+                                bulk: bool = True,
+                                cpu_workers: Optional[int] = None,
+                                queue_size: int = 32,
+                                request_interval: float = 0.1) -> Dict[str, pd.DataFrame]:
         """
         여러 종목 데이터 일괄 다운로드
         
+        다운로드(I/O)는 스레드 풀, 지표 계산·저장(CPU)은 프로세스 풀에서 실행하고
+        두 단계는 크기 제한 큐로 연결 (계산이 밀리면 다운로드도 대기)
+        
         Args:
             symbols (List[str]): 종목 심볼 리스트
             period (str): 기간
             start_date (str): 시작일
             end_date (str): 종료일
-            max_workers (int): 최대 워커 수
+            max_workers (int): 다운로드 스레드 수
+            bulk (bool): multi-ticker 요청으로 한 번에 받고 누락 종목만 개별 다운로드
+            cpu_workers (int): 지표 계산 프로세스 수 (None이면 CPU 코어 수)
+            queue_size (int): 다운로드 → 계산 대기열 크기
+            request_interval (float): 개별 요청 사이 최소 간격 (초, API 제한 방지)
             
         Returns:
             Dict[str, pd.DataFrame]: 종목별 데이터 딕셔너리
@@ -287,32 +443,49 @@ class USStockDownloader:
         print(f"대상 종목: {len(symbols)}개")
         print(f"기간: {period if not start_date else f'{start_date} ~ {end_date}'}")
         
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        cpu_workers = cpu_workers or os.cpu_count() or 1
         all_data = {}
-        success_count = 0
         failed_symbols = []
         
-        # 순차 다운로드 (API 제한 고려)
-        for i, symbol in enumerate(symbols, 1):
-            print(f"\n[{i}/{len(symbols)}] ", end="")
-            
-            data = self.download_single_stock(
-                symbol, period=period, 
-                start_date=start_date, 
-                end_date=end_date
-            )
-            
-            if data is not None:
-                all_data[symbol.upper()] = data
-                success_count += 1
-            else:
-                failed_symbols.append(symbol)
+        # 일괄 다운로드 (HTTP 요청 N회 → 몇 회)
+        frames = {}
+        if bulk:
+            frames = self.fetch_bulk_history(symbols, period, start_date, end_date)
+            print(f"일괄 다운로드: {len(frames)}/{len(symbols)}개 종목 수신")
+        remaining = [symbol for symbol in symbols if symbol not in frames]
+        
+        fetched = queue.Queue(maxsize=queue_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as io_pool, \
+                ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool:
+            # I/O 단계: 누락 종목 개별 다운로드 → 큐
+            for symbol in remaining:
+                io_pool.submit(self._fetch_into_queue, fetched, symbol,
+                               period, start_date, end_date, request_interval)
+            
+            # CPU 단계: 일괄 수신분부터 처리하고 이어서 큐에서 꺼내 프로세스 풀로
+            pending = {}
+            sources = itertools.chain(frames.items(), (fetched.get() for _ in remaining))
+            for symbol, frame in sources:
+                if frame is None or frame.empty:
+                    print(f"경고: {symbol}의 데이터가 없습니다.")
+                    failed_symbols.append(symbol)
+                    continue
+                
+                # 프로세스 풀 대기 작업도 제한 (그래야 큐가 차서 다운로드가 속도를 맞춤)
+                while len(pending) >= cpu_workers * 2:
+                    self._collect_results(pending, all_data, failed_symbols, FIRST_COMPLETED)
+                
+                filename = os.path.join(self.data_dir, f"{symbol}_{self.date_key}.csv")
+                future = cpu_pool.submit(add_indicators, frame, symbol,
+                                         self.get_stock_info(symbol), filename)
+                pending[future] = symbol
             
-            # API 제한 방지를 위한 대기
-            time.sleep(0.5)
+            self._collect_results(pending, all_data, failed_symbols, ALL_COMPLETED)
         
         # 결과 요약
         print(f"\n=== 다운로드 완료 ===")
-        print(f"성공: {success_count}개 종목")
+        print(f"성공: {len(all_data)}개 종목")
         print(f"실패: {len(failed_symbols)}개 종목")
         
         if failed_symbols:
@@ -320,6 +493,61 @@ class USStockDownloader:
         
         return all_data
     
+    def _wait_request_slot(self, interval: float):
+        """개별 요청 시작 간격 유지 (여러 다운로드 스레드가 함께 사용)"""
+        with self._request_lock:
+            now = time.monotonic()
+            delay = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + interval
+        
+        if delay > 0:
+            time.sleep(delay)
+    
+    def _fetch_into_queue(self, 
+                          fetched: queue.Queue, 
+                          symbol: str, 
+                          period: str,
+                          start_date: Optional[str],
+                          end_date: Optional[str],
+                          request_interval: float):
+        """
+        I/O 단계: 한 종목 다운로드 후 큐에 넣음
+        
+        실패해도 (symbol, None)을 넣어 CPU 단계가 무한히 기다리지 않게 함
+        큐가 가득 차 있으면 계산이 따라올 때까지 대기
+        """
+        self._wait_request_slot(request_interval)
+        print(f"다운로드 중: {self.get_stock_info(symbol)} ({symbol})")
+        
+        try:
+            frame = self.fetch_history(symbol, period, start_date, end_date)
+        except Exception as e:
+            print(f"오류 발생 ({symbol}): {str(e)}")
+            frame = None
+        
+        fetched.put((symbol, frame))
+    
+    def _collect_results(self, 
+                         pending: Dict, 
+                         all_data: Dict[str, pd.DataFrame], 
+                         failed_symbols: List[str], 
+                         return_when: str):
+        """완료된 계산 작업 결과 수집 (pending에서 제거)"""
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            symbol = pending.pop(future)
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"처리 오류 ({symbol}): {str(e)}")
+                data = None
+            
+            if data is not None:
+                all_data[symbol] = data
+                print(f"[{len(all_data) + len(failed_symbols)}] {symbol} 처리 완료")
+            else:
+                failed_symbols.append(symbol)
+    
     def create_combined_dataset(self, all_data: Dict[str, pd.DataFrame]) -> Optional[pd.DataFrame]:
         """
         통합 데이터셋 생성
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+개선 무한매수봇 (InfinityUpgradeBot) 백테스터
+infinitive_trading.py와 같은 규칙을 저장된 일봉 OHLCV로 재생 (KIS 접속 없이 오프라인)
+- 첫 매수: Round 0이고 전일 종가 > 5일선 → MaxRound = 200일선 아래 40 / 위 30
+- 익절: 현재가 >= 평단 x (1 + 목표 수익률) → 전량 매도
+- 쿼터 손절: Round >= MaxRound → 보유 수량 1/4 매도, Round도 1/4 차감
+- 회차 매수: 전일 종가 < 100일선이면 3일선이 올라갈 때만, 아니면 매일 (RSI14 상한 옵션)
+- 200일선 하향 돌파: 전량 매도 후 Round 0
+매일 장 마감 무렵 한 번 판단하므로 당일 종가를 체결가로, 전일/전전일 지표를 판단 기준으로 사용
+상태 기계 루프는 numba가 있으면 컴파일해서 실행, 파라미터 스윕은 프로세스 풀로 병렬 실행
+
+사용 예:
+    python infinitive_backtest.py --data-dir ../stock_analyzer/data
+    python infinitive_backtest.py --sweep --workers 4
+"""
+
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba가 없으면 일반 파이썬 함수로 실행"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+TARGET_STOCKS = ['TQQQ', 'SOXL', 'YINN']
+
+DEFAULT_PARAMS = {
+    'max_round_below': 40,  # 200일선 아래에서 시작할 때 분할 수
+    'max_round_above': 30,  # 200일선 위에서 시작할 때 분할 수
+    'target_rate': 0.10,    # 익절 목표 수익률
+    'quarter': 4,           # 쿼터 손절 비율 (1/4)
+    'rsi_limit': np.inf,    # RSI14가 이 값 이상이면 회차 매수 안 함 (GMA 개선본은 80)
+    'commission': 0.001     # 매수/매도 수수료율
+}
+
+# 기본 스윕 범위
+DEFAULT_GRID = {
+    'max_round_below': [30, 40, 50],
+    'max_round_above': [20, 30, 40],
+    'target_rate': [0.05, 0.10, 0.15],
+    'rsi_limit': [np.inf, 80]
+}
+
+TRADING_DAYS = 252
+
+
+# ---------- 지표 ----------
+
+def calculate_rsi(close, window=14):
+    """RSI (단순 이동평균 방식)"""
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window=window).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+def prepare_arrays(data):
+    """
+    OHLCV → 백테스트용 배열 (종가, 이동평균, RSI14)
+
+    Returns:
+        dict: {'close', 'ma3', 'ma5', 'ma100', 'ma200', 'rsi'} float 배열
+    """
+    close = data['Close'].astype(float)
+    arrays = {'close': close.to_numpy()}
+    for period in (3, 5, 100, 200):
+        arrays[f'ma{period}'] = close.rolling(window=period).mean().to_numpy()
+    arrays['rsi'] = calculate_rsi(close).to_numpy()
+    return arrays
+
+
+# ---------- 상태 기계 ----------
+
+@njit(cache=True)
+def _buy(cash, shares, avg_price, max_round, price, commission):
+    """한 회차 매수 (분할 금액 = 현재 평가금액 / MaxRound, 최소 1주, 현금 한도 내)"""
+    st_money = (cash + shares * price) / max_round
+    amount = np.floor(st_money / price)
+    if amount < 1:
+        amount = 1.0
+    affordable = np.floor(cash / (price * (1 + commission)))
+    if amount > affordable:
+        amount = affordable
+    if amount < 1:
+        return cash, shares, avg_price
+
+    avg_price = (avg_price * shares + price * amount) / (shares + amount)
+    return cash - amount * price * (1 + commission), shares + amount, avg_price
+
+
+@njit(cache=True)
+def run_state_machine(close, ma3, ma5, ma100, ma200, rsi, capital,
+                      max_round_below, max_round_above, target_rate, quarter, rsi_limit, commission,
+                      start=2):
+    """
+    일별 상태 기계 (infinitive_trading.py의 판단 순서 그대로)
+
+    start 이전 봉은 매매하지 않음 (평가금액 = capital) - 판단에 쓰는 전일/전전일 지표가 모두 있는 봉부터
+
+    Returns:
+        tuple: (일별 평가금액, 익절 횟수, 200일선 이탈 청산 횟수, 쿼터 손절 횟수, 체결된 매수 횟수)
+    """
+    n = len(close)
+    equity = np.full(n, capital)
+    cash = capital
+    shares = 0.0
+    avg_price = 0.0
+    round_ = 0
+    max_round = max_round_above
+    take_profits = 0
+    ma200_exits = 0
+    quarter_cuts = 0
+    buys = 0
+
+    for i in range(max(start, 2), n):
+        price = close[i]
+        prev_close = close[i - 1]
+
+        if round_ > 0:
+            revenue_price = avg_price * (1.0 + target_rate)
+
+            if price >= revenue_price or round_ >= max_round:
+                if price >= revenue_price:
+                    # 익절 - 전량 매도
+                    cash += shares * price * (1 - commission)
+                    shares = 0.0
+                    avg_price = 0.0
+                    round_ = 0
+                    take_profits += 1
+                elif round_ >= max_round:
+                    # 쿼터 손절
+                    round_ -= int(round_ / quarter)
+                    cut = np.floor(shares / quarter)
+                    cash += cut * price * (1 - commission)
+                    shares -= cut
+                    quarter_cuts += 1
+
+            elif round_ < max_round:
+                # 100일선 아래 하락장은 3일선이 올라갈 때만, 나머지는 매일 매수
+                if ma100[i - 1] > prev_close:
+                    is_buy = ma3[i - 2] < ma3[i - 1]
+                else:
+                    is_buy = True
+
+                if rsi[i - 1] >= rsi_limit:
+                    is_buy = False
+
+                # 200일선 위에 있다가 아래로 떨어지면 전량 매도
+                if ma200[i - 2] < close[i - 2] and ma200[i - 1] > prev_close:
+                    cash += shares * price * (1 - commission)
+                    shares = 0.0
+                    avg_price = 0.0
+                    round_ = 0
+                    ma200_exits += 1
+                    is_buy = False
+
+                if is_buy:
+                    # 회차는 체결과 무관하게 진행 (실거래 봇과 동일), 매수 횟수는 실제 체결만
+                    round_ += 1
+                    held = shares
+                    cash, shares, avg_price = _buy(cash, shares, avg_price, max_round, price, commission)
+                    if shares > held:
+                        buys += 1
+
+        # 첫 매수 (전일 종가가 5일선 위일 때만)
+        if round_ == 0 and ma5[i - 1] < prev_close:
+            if ma200[i - 1] > prev_close:
+                max_round = max_round_below
+            else:
+                max_round = max_round_above
+
+            round_ += 1
+            held = shares
+            cash, shares, avg_price = _buy(cash, shares, avg_price, max_round, price, commission)
+            if shares > held:
+                buys += 1
+
+        equity[i] = cash + shares * price
+
+    return equity, take_profits, ma200_exits, quarter_cuts, buys
+
+
+# ---------- 실행/지표 ----------
+
+def performance(equity, index=None):
+    """평가금액 곡선 → CAGR/MDD (%)"""
+    equity = np.asarray(equity, dtype=float)
+    if index is not None and len(index) > 1:
+        years = (pd.Timestamp(index[-1]) - pd.Timestamp(index[0])).days / 365.25
+    else:
+        years = len(equity) / TRADING_DAYS
+    cagr = ((equity[-1] / equity[0]) ** (1 / years) - 1) * 100 if years > 0 else 0.0
+    mdd = (equity / np.maximum.accumulate(equity) - 1).min() * 100
+    return cagr, mdd
+
+
+def warmup_end(arrays, rsi_limit=np.inf):
+    """
+    첫 매매 봉 위치 - 판단에 쓰는 전일/전전일의 MA3/MA5/MA100/MA200 (RSI 조건 사용 시 RSI)이 모두 있는 첫 봉
+
+    실거래 봇은 항상 지표 이력이 충분하므로 지표가 NaN인 구간은 매매하지 않음
+    """
+    required = ['close', 'ma3', 'ma5', 'ma100', 'ma200']
+    if np.isfinite(rsi_limit):
+        required.append('rsi')
+    ready = np.logical_and.reduce([np.isfinite(arrays[name]) for name in required])
+    valid = np.flatnonzero(ready[:-1] & ready[1:])  # i-2, i-1 모두 유효
+    return int(valid[0]) + 2 if len(valid) else len(arrays['close'])
+
+
+def backtest(arrays, params=None, capital=10000.0, index=None):
+    """
+    한 종목 백테스트
+
+    Args:
+        arrays (dict): prepare_arrays 결과
+        params (dict): DEFAULT_PARAMS 중 바꿀 값
+        capital (float): 종목 할당 금액 (StockMoney)
+        index: 날짜 인덱스 (CAGR 기간 계산, 없으면 252거래일 = 1년)
+
+    Returns:
+        dict: 파라미터 + CAGR/MDD/최종 금액/매매 횟수, 'equity' (일별 평가금액)
+    """
+    settings = dict(DEFAULT_PARAMS, **(params or {}))
+    start = warmup_end(arrays, settings['rsi_limit'])
+    equity, take_profits, ma200_exits, quarter_cuts, buys = run_state_machine(
+        arrays['close'], arrays['ma3'], arrays['ma5'], arrays['ma100'], arrays['ma200'], arrays['rsi'],
+        float(capital), int(settings['max_round_below']), int(settings['max_round_above']),
+        float(settings['target_rate']), float(settings['quarter']), float(settings['rsi_limit']),
+        float(settings['commission']), start
+    )
+
+    # 첫 매매 전날(평가금액 = capital)부터 평가 - CAGR/MDD와 최종 금액의 기준이 같음
+    first = min(start - 1, len(equity) - 1)
+    cagr, mdd = performance(equity[first:], None if index is None else index[first:])
+
+    return dict(settings, cagr=cagr, mdd=mdd, final_equity=equity[-1],
+                take_profits=take_profits, ma200_exits=ma200_exits,
+                quarter_cuts=quarter_cuts, buys=buys, equity=equity)
+
+
+def _sweep_job(symbol, arrays, index, params, capital):
+    """프로세스 풀 작업: 한 종목 x 한 파라미터 조합 (평가금액 곡선은 버리고 요약만 반환)"""
+    result = backtest(arrays, params, capital, index)
+    result.pop('equity')
+    return dict(result, symbol=symbol)
+
+
+def parameter_sweep(frames, grid=None, capital=10000.0, workers=None):
+    """
+    파라미터 조합 x 종목 백테스트 (프로세스 풀)
+
+    Args:
+        frames (dict): {종목: OHLCV 데이터프레임}
+        grid (dict): {파라미터: 후보 리스트} (None이면 DEFAULT_GRID)
+        capital (float): 종목별 할당 금액
+        workers (int): 프로세스 수 (None이면 CPU 코어 수, 1이면 현재 프로세스)
+
+    Returns:
+        pd.DataFrame: 종목/파라미터별 CAGR, MDD, 매매 횟수
+    """
+    grid = grid or DEFAULT_GRID
+    names = list(grid)
+    combos = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    prepared = {symbol: (prepare_arrays(data), data.index) for symbol, data in frames.items()}
+
+    jobs = [(symbol, arrays, index, params, capital)
+            for symbol, (arrays, index) in prepared.items() for params in combos]
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            rows = list(executor.map(_sweep_job, *zip(*jobs), chunksize=chunksize))
+    else:
+        rows = [_sweep_job(*job) for job in jobs]
+
+    columns = ['symbol'] + names + ['cagr', 'mdd', 'final_equity', 'take_profits',
+                                    'ma200_exits', 'quarter_cuts', 'buys']
+    return pd.DataFrame(rows)[columns]
+
+
+# ---------- 데이터 로드 ----------
+
+def load_ohlcv(data_dir, symbol):
+    """data_dir에서 {종목}_*.csv 중 가장 최근 파일 로드 (날짜 인덱스, Close 컬럼)"""
+    files = sorted(Path(data_dir).glob(f"{symbol}_*.csv"), key=lambda path: path.stat().st_mtime)
+    if not files:
+        return None
+
+    data = pd.read_csv(files[-1])
+    date_column = 'Date' if 'Date' in data.columns else data.columns[0]
+    data.index = pd.to_datetime(data.pop(date_column), utc=True).dt.tz_localize(None)
+    data = data.rename(columns=str.capitalize).sort_index()
+    return data.dropna(subset=['Close'])
+
+
+def main():
+    """명령행 실행"""
+    parser = argparse.ArgumentParser(description='개선 무한매수봇 백테스트')
+    parser.add_argument('--data-dir', default='data', help='OHLCV CSV 폴더 ({종목}_날짜.csv)')
+    parser.add_argument('--symbols', nargs='+', default=TARGET_STOCKS, help='대상 종목')
+    parser.add_argument('--capital', type=float, default=10000.0, help='종목별 할당 금액')
+    parser.add_argument('--sweep', action='store_true', help='DEFAULT_GRID 파라미터 스윕')
+    parser.add_argument('--workers', type=int, help='스윕 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--top', type=int, default=10, help='스윕 결과 상위 표시 개수')
+    parser.add_argument('--output', help='스윕 결과 CSV 저장 경로')
+    args = parser.parse_args()
+
+    frames = {}
+    for symbol in args.symbols:
+        data = load_ohlcv(args.data_dir, symbol)
+        if data is None:
+            print(f"경고: {symbol} 데이터 파일이 없습니다 ({args.data_dir})")
+            continue
+        frames[symbol] = data
+
+    if not frames:
+        print("백테스트할 데이터가 없습니다.")
+        return
+
+    print(f"=== 개선 무한매수봇 백테스트 (numba {'사용' if NUMBA_AVAILABLE else '미설치 - 파이썬 루프'}) ===")
+    pd.set_option('display.width', 200)
+    pd.set_option('display.max_columns', None)
+
+    if not args.sweep:
+        for symbol, data in frames.items():
+            arrays = prepare_arrays(data)
+            result = backtest(arrays, capital=args.capital, index=data.index)
+            first = min(warmup_end(arrays) - 1, len(data) - 1)  # 지표 준비 후 평가 시작일
+            print(f"{symbol}: {data.index[first]:%Y-%m-%d} ~ {data.index[-1]:%Y-%m-%d} | "
+                  f"CAGR {result['cagr']:.2f}% | MDD {result['mdd']:.2f}% | "
+                  f"최종 {result['final_equity']:,.0f} | 익절 {result['take_profits']}회, "
+                  f"쿼터 손절 {result['quarter_cuts']}회, 200일선 청산 {result['ma200_exits']}회")
+        return
+
+    results = parameter_sweep(frames, capital=args.capital, workers=args.workers)
+    for symbol, table in results.groupby('symbol', sort=False):
+        print(f"\n[{symbol}] CAGR 상위 {args.top}개 (총 {len(table)}개 조합)")
+        print(table.sort_values('cagr', ascending=False).head(args.top).round(2).to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n저장 완료: {args.output}")
+
+
+if __name__ == "__main__":
+    main()